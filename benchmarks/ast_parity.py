@@ -0,0 +1,124 @@
+# ast_parity.py
+# Check: dead-branch pruning (ForestDisambiguator) on the scannerless (dynamic) lexer's forests, where every
+# declaration has dead branches, per top-level declaration:
+#   - against TokenLexer's, which has none: both Earley parses give the same ast.pretty();
+#   - against the two-pass pipeline it replaced (TwoPass: expanded trees, then CSTtoAST): same ast.pretty().
+# Check: the two parser tiers agree. Every declaration the LALR tier accepts gives the same ast.pretty() as TokenLexer's
+# Earley parse (both settle decl_specifier_seq by [dcl.spec]/3: int a; is one declaration either way).
+#     python -m benchmarks.ast_parity [file.cpp ...]   (default: tests/*.cpp + SNIPPETS; exit status 1 on any mismatch)
+
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from lark import Token, Transformer_NonRecursive, Tree
+
+from compiler.front_end.abstract_nodes.ast_node import ASTNode
+from compiler.front_end.declaration_splitter import split_declarations
+from compiler.front_end.disambiguator import ForestDisambiguator, count_ambiguities
+from compiler.front_end.grammar_cache import load_parser
+from compiler.front_end.lexer import IDENTIFIER, RESERVED_WORDS, TokenLexer
+from compiler.front_end.preprocessor import Preprocessor
+from compiler.front_end.tiered_parser import TieredParser
+from compiler.front_end.transformer import CSTtoAST
+
+GRAMMAR_PATH = ROOT / "compiler" / "front_end" / "grammar.lark"
+LALR_PATH    = ROOT / "compiler" / "front_end" / "lalr_overrides.lark"
+CACHE_PATH   = ROOT / ".cache"
+
+# Where TokenLexer has to undo a lexing decision the dynamic lexer never makes
+SNIPPETS = {
+    "split '>>'"       : "A<B<int>> x;\nA<B<C<int>>> y;\nint f() { return a >> 2 > b; }\nint g() { x >>= 1; }\n",
+    "contextual words" : "int final = 1;\nint override = 2;\nint h() { return final >> override; }\n"
+                         "struct D final : B { int f() override; int g() final override { return 1; } };\n",
+    # Where the LALR tier's grammar settles a decl_specifier_seq the base grammar leaves ambiguous
+    "specifiers"       : "int a;\nstatic const A b, *c;\nunsigned long long d;\nint f(int a, const A b);\n"
+                         "A g(A a) { return a; }\nint h() { int a; T(x); return a; }\n",
+}
+
+########################################################################################################################
+class TwoPass(Transformer_NonRecursive):
+    """ Reference: the Disambiguator pass ForestDisambiguator replaced, over an ambiguity="explicit" tree. One change:
+        an _ambig left with no live branch is dead itself (it used to stay, empty: test_2's `goto label1;`), as a
+        forest symbol with no live derivation is.
+    """
+
+    def __default_token__(self, token: Token):
+        if token.type == IDENTIFIER and token.value in RESERVED_WORDS:
+            return ASTNode("DeadBranch")
+        return token
+
+    def __default__(self, data, children, meta):
+        # Dead Node Travels Up Branch
+        for child in children:
+            if isinstance(child, ASTNode):
+                return child
+        return Tree(data, children)
+
+    def _ambig(self, children):
+        healthy = [branch for branch in children if not isinstance(branch, ASTNode)]
+        return Tree("_ambig", healthy) if healthy else children[0]
+
+########################################################################################################################
+def main(paths: list[Path], snippets: dict[str, str]) -> int:
+    tokens,   _ = load_parser(GRAMMAR_PATH, CACHE_PATH, start="start", parser="earley", ambiguity="forest",
+                              lexer=TokenLexer)
+    dynamic,  _ = load_parser(GRAMMAR_PATH, None, start="start", parser="earley", ambiguity="forest")
+    explicit, _ = load_parser(GRAMMAR_PATH, None, start="start", parser="earley", ambiguity="explicit")
+    lalr,     _ = load_parser(GRAMMAR_PATH, CACHE_PATH, LALR_PATH, start=["declaration", "probe_declaration"],
+                              parser="lalr", lexer=TokenLexer)
+    pruners     = {parser: ForestDisambiguator(parser) for parser in (tokens, dynamic)}
+    unpruned    = ForestDisambiguator(dynamic, prune=False)
+    reserved    = ForestDisambiguator(dynamic, specifiers=False) # The cut TwoPass makes
+    tiers       = TieredParser(lalr, tokens)
+
+    print(f"{'file':<24} {'decls':>6} {'dead':>5} {'tokens ms':>10} {'dynamic ms':>11}  {'vs tokens':<14} "
+          f"{'vs two-pass':<14} {'lalr':>5}  lalr vs earley")
+    units = [(path.name, Preprocessor([ROOT / "include"]).preprocess(path.read_text(encoding="utf-8"), path))
+             for path in paths]
+    units += list(snippets.items())
+
+    failed = 0
+    for name, code in units:
+        chunks     = split_declarations(code)
+        mismatches = two_pass = tier_mismatches = lalr_count = dead = 0
+        seconds    = {tokens: 0.0, dynamic: 0.0}
+        for chunk in chunks:
+            asts = []
+            for parser, pruner in pruners.items():
+                forest = parser.parse(chunk.text)
+                start  = time.perf_counter()
+                asts.append(CSTtoAST().transform(pruner.transform(forest)).pretty(color=False)) # Keyword colors vary
+                seconds[parser] += time.perf_counter() - start
+            mismatches += asts[0] != asts[1]
+            forest      = dynamic.parse(chunk.text)
+            reference   = CSTtoAST().transform(TwoPass().transform(explicit.parse(chunk.text)))
+            pruned      = CSTtoAST().transform(reserved.transform(forest))
+            two_pass   += reference.pretty(color=False) != pruned.pretty(color=False)
+
+            # One declaration, both tiers (asts[0]: TokenLexer's Earley parse)
+            trees, tier = tiers.parse_text(chunk.text)
+            if tier == "lalr":
+                lalr_count      += 1
+                tier_mismatches += CSTtoAST().transform(TieredParser.stitch(trees)).pretty(color=False) != asts[0]
+
+            # Declarations with something to cut: the unpruned expansion is more ambiguous than the pruned one
+            before = count_ambiguities(unpruned.transform(forest))
+            dead  += before != count_ambiguities(pruners[dynamic].transform(forest))
+
+        failed += mismatches + two_pass + tier_mismatches
+        print(f"{name:<24} {len(chunks):>6} {dead:>5} {seconds[tokens] * 1000:>10.1f} "
+              f"{seconds[dynamic] * 1000:>11.1f}  {_outcome(mismatches):<14} {_outcome(two_pass):<14} "
+              f"{lalr_count:>5}  {_outcome(tier_mismatches)}")
+
+    return 1 if failed else 0
+
+def _outcome(mismatches: int) -> str:
+    return f"{mismatches} MISMATCH(ES)" if mismatches else "identical"
+
+if __name__ == "__main__":
+    paths = [Path(arg) for arg in sys.argv[1:]]
+    sys.exit(main(paths or sorted((ROOT / "tests").glob("*.cpp")), {} if paths else SNIPPETS))
@@ -0,0 +1,89 @@
+# bench_ast_memory.py
+# Memory benchmark: bytes per AST node over a large generated translation unit, and the peak while transforming
+# with the CST held by the caller vs handed over (CSTtoAST.transform(..., consume=True)). Then a check: consuming
+# Earley trees that share subtrees (the 'ambiguous' corpus shape) gives the AST a held transform does.
+#     python -m benchmarks.bench_ast_memory [functions]   (exit status 1 if the consumed AST differs)
+
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.corpus import generate
+from compiler.front_end.abstract_nodes.traversal import iter_preorder
+from compiler.front_end.disambiguator import shared_subtrees
+from compiler.front_end.grammar_cache import load_parser
+from compiler.front_end.lexer import TokenLexer
+from compiler.front_end.tiered_parser import TieredParser
+from compiler.front_end.transformer import CSTtoAST
+
+GRAMMAR_PATH = ROOT / "compiler" / "front_end" / "grammar.lark"
+LALR_PATH    = ROOT / "compiler" / "front_end" / "lalr_overrides.lark"
+CACHE_PATH   = ROOT / ".cache"
+
+########################################################################################################################
+def generate_unit(functions: int) -> str:
+    """ Many small functions: locals, arithmetic, calls, control flow. """
+    lines = []
+    for i in range(functions):
+        lines.append(f"int f{i}(int a, int b) {{\n"
+                     f"    int x = a * {i} + b - a % 3;\n"
+                     f"    while (x > b) {{ x = x - 1; if (x == {i}) break; }}\n"
+                     f"    printf(\"f{i}\");\n"
+                     f"    return x;\n"
+                     f"}}\n")
+    return "".join(lines)
+
+def main(functions: int = 2000):
+    earley, _ = load_parser(GRAMMAR_PATH, CACHE_PATH, start="start", parser="earley", ambiguity="forest",
+                            lexer=TokenLexer)
+    lalr,   _ = load_parser(GRAMMAR_PATH, CACHE_PATH, override_path=LALR_PATH,
+                            start=["declaration", "probe_declaration"], parser="lalr", lexer=TokenLexer)
+
+    parser = TieredParser(lalr, earley)
+    source = generate_unit(functions)
+    cst    = parser.parse(source)
+
+    # Measure only what the AST retains (the CST stays alive outside the window)
+    transformer = CSTtoAST()
+    gc.collect()
+    tracemalloc.start()
+    ast = transformer.transform(cst)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = sum(1 for _ in iter_preorder(ast))
+    print(f"{functions} functions -> {nodes} AST nodes")
+    print(f"retained: {retained / 2**20:8.2f} MiB  ({retained / nodes:.0f} B/node)")
+    print(f"peak    : {peak / 2**20:8.2f} MiB")
+
+    # Transform peak, CST + AST: held (both trees live until the end) vs consumed (freed as the AST grows)
+    del cst, ast
+    for consume in (False, True):
+        gc.collect()
+        tracemalloc.start()
+        cst = parser.parse(source)
+        cst_size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        ast = CSTtoAST().transform(cst, consume=consume)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del cst, ast
+        print(f"transform peak, CST {'consumed' if consume else 'held    '}: {peak / 2**20:8.2f} MiB  "
+              f"(CST {cst_size / 2**20:.2f} MiB)")
+
+    # Shared subtrees: left intact while the rest of the CST is consumed
+    source = generate("ambiguous", 30)
+    held   = CSTtoAST().transform(parser.parse(source)).pretty(color=False)
+    cst    = parser.parse(source)
+    shared = len(shared_subtrees(cst))
+    same   = CSTtoAST().transform(cst, consume=True).pretty(color=False) == held
+    print(f"ambiguous corpus, {shared} shared subtrees: consumed AST {'identical' if same else 'DIFFERS'}")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main(*(int(arg) for arg in sys.argv[1:])))
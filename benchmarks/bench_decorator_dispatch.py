@@ -0,0 +1,86 @@
+# bench_decorator_dispatch.py
+# Micro-benchmark: Decorator._dfs dispatch (precomputed table) vs the previous regex + getattr lookup.
+#     python -m benchmarks.bench_decorator_dispatch
+
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compiler.context import CompilerContext
+from compiler.front_end.abstract_nodes import ASTNode
+from compiler.front_end.decorator import Decorator
+from compiler.utils.colors import colors
+
+NODE_NAMES = ["function_definition", "identifier: x", "keyword: int", "int_literal: 42", "statement_seq",
+              "postfix_expression", colors.pink("declaration_statement"), "decl_specifier_seq", "jump_statement"]
+
+########################################################################################################################
+def build_tree(depth: int, fanout: int) -> ASTNode:
+    """ Complete tree cycling through realistic node names. """
+    counter = iter(range(10**9))
+
+    def build(level):
+        name = NODE_NAMES[next(counter) % len(NODE_NAMES)]
+        if level == depth:
+            return ASTNode(name)
+        return ASTNode(name, [build(level + 1) for _ in range(fanout)])
+
+    return ASTNode("translation_unit", [build(1) for _ in range(fanout)])
+
+########################################################################################################################
+class CountingPass(Decorator):
+    """ Typical pass shape: a handful of visitors, everything else falls through. """
+    def __init__(self, root, context):
+        super().__init__(root_node=root, context=context, traversal_order="both")
+        self.hits = 0
+
+    def translation_unit_pre(self, node, children):   self.hits += 1
+    def function_definition_pre(self, node, children): self.hits += 1
+    def function_definition_post(self, node, children): self.hits += 1
+    def jump_statement_pre(self, node, children):     self.hits += 1
+    def postfix_expression_pre(self, node, children): self.hits += 1
+    def declaration_statement_pre(self, node, children): self.hits += 1 # Colored in NODE_NAMES: never dispatched
+
+class LegacyCountingPass(CountingPass):
+    """ Pre-dispatch-table traversal, kept verbatim for comparison. """
+    def _dfs(self, node):
+        call_sign   = re.split(r'[\s:]', node.name, 1)[0]
+        method      = getattr(self, call_sign, None)
+        pre_method  = getattr(self, f"{call_sign}_pre", None)
+        post_method = getattr(self, f"{call_sign}_post", None)
+        if method is None and pre_method is None and post_method is None:
+            method = getattr(self, "__default__", None)
+        if self.order in ("pre", "both"):
+            if callable(pre_method):
+                pre_method(node, node.children)
+            if callable(method):
+                method(node, node.children)
+        for child in node.children:
+            self._dfs(child)
+        if self.order in ("post", "both"):
+            if callable(method):
+                method(node, node.children)
+            if callable(post_method):
+                post_method(node, node.children)
+
+########################################################################################################################
+def main(depth: int = 7, fanout: int = 4, repeat: int = 5):
+    root    = build_tree(depth, fanout)
+    context = CompilerContext()
+    nodes   = sum(fanout ** level for level in range(depth + 1))
+
+    results = {}
+    for label, cls in (("legacy", LegacyCountingPass), ("table", CountingPass)):
+        walker = cls(root, context)
+        best   = min(timeit.repeat(walker.walk, number=1, repeat=repeat))
+        results[label] = (best, walker.hits)
+        print(f"{label:>6}: {best * 1000:8.2f} ms  ({nodes / best / 1e6:.2f} M nodes/s)")
+
+    assert results["legacy"][1] == results["table"][1], "dispatch mismatch"
+    print(f"speed-up: {results['legacy'][0] / results['table'][0]:.2f}x over {nodes} nodes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# bench_lexer.py
+# Benchmark: TokenLexer throughput (tokens/s) over the synthetic corpus, and Earley parse time (SPPF + disambiguated
+# tree) & ambiguities over its tokens vs the dynamic (scannerless) lexer: _ambig nodes / alternatives in the unpruned
+# tree, every derivation of the forest expanded, so dead branches count.
+#     python -m benchmarks.bench_lexer [size] [repeat]
+
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.corpus import SHAPES, generate
+from compiler.front_end.declaration_splitter import split_declarations
+from compiler.front_end.disambiguator import ForestDisambiguator, count_ambiguities
+from compiler.front_end.grammar_cache import load_parser
+from compiler.front_end.lexer import TokenLexer
+
+GRAMMAR_PATH = ROOT / "compiler" / "front_end" / "grammar.lark"
+CACHE_PATH   = ROOT / ".cache"
+
+########################################################################################################################
+def main(size: int = 100, repeat: int = 5):
+    token_parser, _ = load_parser(GRAMMAR_PATH, CACHE_PATH, start="start", parser="earley", ambiguity="forest",
+                                  lexer=TokenLexer)
+    lexer = token_parser.parser.lexer
+
+    # Lexer Only
+    print(f"{'shape':<12} {'bytes':>8} {'tokens':>8} {'ms':>8} {'Mtok/s':>8} {'MB/s':>8}")
+    for shape in SHAPES:
+        text    = generate(shape, size)
+        tokens  = sum(1 for _ in lexer.tokenize(text))
+        seconds = min(timeit.repeat(lambda: sum(1 for _ in lexer.tokenize(text)), number=1, repeat=repeat))
+        print(f"{shape:<12} {len(text):>8} {tokens:>8} {seconds * 1000:>8.2f} {tokens / seconds / 1e6:>8.2f} "
+              f"{len(text) / seconds / 2**20:>8.2f}")
+
+    # Earley: token stream vs scannerless (built uncached: the grammar cache keeps one Earley variant)
+    dynamic_parser, _ = load_parser(GRAMMAR_PATH, None, start="start", parser="earley", ambiguity="forest")
+    print(f"\nearley parse, every top-level declaration of each shape (size {max(size // 10, 1)}):")
+    print(f"{'shape':<12} {'dynamic ms':>11} {'tokens ms':>10} {'speed-up':>9} "
+          f"{'dynamic ambig':>14} {'tokens ambig':>13}")
+    for shape in SHAPES:
+        chunks  = [chunk.text for chunk in split_declarations(generate(shape, max(size // 10, 1)))]
+        timings, ambiguities = [], []
+        for parser in (dynamic_parser, token_parser):
+            forest = ForestDisambiguator(parser)
+            timings.append(min(timeit.repeat(lambda: [forest.transform(parser.parse(chunk)) for chunk in chunks],
+                                             number=1, repeat=max(repeat // 2, 1))))
+            unpruned = ForestDisambiguator(parser, prune=False)
+            counts   = [count_ambiguities(unpruned.transform(parser.parse(chunk))) for chunk in chunks]
+            ambiguities.append(f"{sum(n for n, _ in counts)} / {sum(a for _, a in counts)}") # Nodes / alternatives
+        print(f"{shape:<12} {timings[0] * 1000:>11.1f} {timings[1] * 1000:>10.1f} {timings[0] / timings[1]:>8.2f}x "
+              f"{ambiguities[0]:>14} {ambiguities[1]:>13}")
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
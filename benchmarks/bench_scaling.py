@@ -0,0 +1,214 @@
+# bench_scaling.py
+# Benchmark: per-phase compile time across synthetic input sizes (benchmarks/corpus.py), scaling exponents, and a
+# comparison against a stored baseline.
+#     python -m benchmarks.bench_scaling                       (compare against benchmarks/baseline.json)
+#     python -m benchmarks.bench_scaling --save-baseline       (record a new baseline)
+#     python -m benchmarks.bench_scaling --shapes nesting,ambiguous --sizes 10,20,40 --repeat 5
+
+import argparse
+import json
+import math
+import platform
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.corpus import SHAPES, SIZES, generate
+from compiler.context import CompilerContext
+from compiler.front_end.decorator import ASTtoDAST
+from compiler.front_end.grammar_cache import load_parser
+from compiler.front_end.lexer import TokenLexer
+from compiler.front_end.abstract_nodes.misc_nodes import Error
+from compiler.front_end.abstract_nodes.traversal import iter_preorder
+from compiler.front_end.header_cache import HeaderCache
+from compiler.front_end.llvm_generator import LLVMGenerator
+from compiler.front_end.preprocessor import Preprocessor
+from compiler.front_end.tiered_parser import TieredParser
+from compiler.front_end.transformer import CSTtoAST
+from compiler.middle_end.optimizer import Optimizer
+from compiler.back_end.native import NativeEmitter
+from compiler.utils.instrumentation import Instrumentation, collecting
+
+GRAMMAR_PATH  = ROOT / "compiler" / "front_end" / "grammar.lark"
+LALR_PATH     = ROOT / "compiler" / "front_end" / "lalr_overrides.lark"
+CACHE_PATH    = ROOT / ".cache"
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Reported phases, in pipeline order (the instrumentation phase names)
+PHASES = ("preprocess", "parse", "transform", "decorate", "lower", "verify", "optimize", "codegen")
+
+NOISE_FLOOR = 0.002 # Seconds: baseline phases faster than this are not compared
+
+########################################################################################################################
+class Pipeline:
+    """ Every stage of a compile, loaded once; no compile / header cache, so each run does all the work. """
+
+    def __init__(self, output_dir: Path):
+        earley, _ = load_parser(GRAMMAR_PATH, CACHE_PATH, start="start", parser="earley", ambiguity="forest",
+                                lexer=TokenLexer)
+        lalr,   _ = load_parser(GRAMMAR_PATH, CACHE_PATH, override_path=LALR_PATH,
+                                start=["declaration", "probe_declaration"], parser="lalr", lexer=TokenLexer)
+        self.preprocessor = Preprocessor([ROOT / "include"])
+        self.front_end    = HeaderCache(TieredParser(lalr, earley), CSTtoAST())
+        self.optimizer    = Optimizer(2)
+        self.emitter      = NativeEmitter(output_dir)
+
+    def run(self, source: str) -> tuple[Instrumentation, str | None, list[str]]:
+        """ -> (phase records, '<phase>: <error>' for the stage that failed, if one did, the AST's ERROR node names).
+            Later stages are skipped.
+        """
+        instrumentation = Instrumentation()
+        stage = "preprocess"
+        with collecting(instrumentation):
+            try:
+                code = self.preprocessor.preprocess(source, Path("<corpus>"))
+                stage = "front end"
+                ast = self.front_end.build_ast(code, self.preprocessor.segments)
+                errors = sorted({node.name for node, _ in iter_preorder(ast) if isinstance(node, Error)})
+                if errors:
+                    return instrumentation, f"front end: {', '.join(errors)}", errors
+
+                context = CompilerContext()
+                stage = "decorate"
+                ASTtoDAST(ast, context).decorate()
+                stage = "lower" # Lowering covers a subset of the language: most shapes stop here
+                generator = LLVMGenerator(ast, context)
+                generator.generate()
+                stage = "optimize"
+                module_ref = self.optimizer.optimize(generator.module)
+                stage = "codegen"
+                self.emitter.object_code(module_ref)
+            except Exception as error:
+                return instrumentation, f"{stage}: {type(error).__name__}", []
+        return instrumentation, None, []
+
+def measure(pipeline: Pipeline, shape: str, size: int, repeat: int) -> dict:
+    """ Best-of-'repeat' seconds per phase, plus the unit's AST node & parse-forest ambiguity counts, and failure. """
+    source = generate(shape, size)
+    best: dict[str, float] = {}
+    instrumentation, error, ast_errors = None, None, []
+    for _ in range(repeat):
+        instrumentation, error, ast_errors = pipeline.run(source)
+        for name, seconds in instrumentation.top_level().items():
+            best[name] = min(best.get(name, math.inf), seconds)
+
+    def count(counter: str) -> int:
+        return sum(record.counters.get(counter, 0) for record in instrumentation.records)
+    return {"phases": best, "ast_nodes": count("ast_nodes"), "ambiguities": count("ambiguities"), "error": error,
+            "ast_errors": ast_errors}
+
+########################################################################################################################
+# REPORTING
+
+def exponent(sizes: list[int], times: list[float]) -> float | None:
+    """ Least-squares slope of log(time) over log(size): 1.0 linear, 2.0 quadratic. """
+    points = [(math.log(size), math.log(seconds)) for size, seconds in zip(sizes, times) if seconds > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else None
+
+def shape_table(shape: str, rows: dict[int, dict]) -> str:
+    phases = [phase for phase in PHASES if any(phase in row["phases"] for row in rows.values())]
+    header = ["size", "nodes", "ambig", *phases, "total"]
+    lines  = []
+    for size, row in rows.items():
+        total = sum(row["phases"].get(phase, 0.0) for phase in phases)
+        lines.append([str(size), str(row["ast_nodes"]), str(row.get("ambiguities", "-")),
+                      *(f"{row['phases'][phase] * 1000:.2f}" if phase in row["phases"] else "-" for phase in phases),
+                      f"{total * 1000:.2f}"])
+
+    # Scaling curve: exponent per phase over the measured sizes
+    sizes = list(rows)
+    def fit(times):
+        k = exponent(sizes, times) if len(times) == len(sizes) else None
+        return "-" if k is None else f"n^{k:.2f}"
+    lines.append(["k", "", "", *(fit([row["phases"][phase] for row in rows.values() if phase in row["phases"]])
+                                 for phase in phases),
+                  fit([sum(row["phases"].get(phase, 0.0) for phase in phases) for row in rows.values()])])
+
+    widths = [max(len(line[i]) for line in [header, *lines]) for i in range(len(header))]
+    def format_line(line):
+        return "  ".join(cell.rjust(width) for cell, width in zip(line, widths))
+
+    errors = sorted({row["error"] for row in rows.values() if row["error"]})
+    title  = f"{shape} (ms)" + (f"  [stops at {', '.join(errors)}]" if errors else "")
+    return "\n".join([title, format_line(header), "  ".join("-" * width for width in widths),
+                      *map(format_line, lines)])
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """ One line per (shape, size, phase) slower than the baseline by more than 'tolerance'. """
+    regressions = []
+    for shape, rows in results.items():
+        for size, row in rows.items():
+            base = baseline.get(shape, {}).get(str(size))
+            if base is None:
+                continue
+            for phase, seconds in row["phases"].items():
+                before = base["phases"].get(phase)
+                if before is None or before < NOISE_FLOOR:
+                    continue
+                if seconds > before * (1 + tolerance):
+                    regressions.append(f"{shape}[{size}] {phase}: {before * 1000:.2f} -> {seconds * 1000:.2f} ms "
+                                       f"({seconds / before:.2f}x)")
+    return regressions
+
+########################################################################################################################
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="per-phase scaling benchmark over a synthetic corpus")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help=f"comma-separated: {', '.join(SHAPES)}")
+    parser.add_argument("--sizes", default=None, help="comma-separated sizes for every shape (default: per shape)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per unit; the fastest counts")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slow-down before a phase is flagged")
+    parser.add_argument("--json", type=Path, default=None, help="also write the results here")
+    args = parser.parse_args(argv)
+
+    shapes = [shape.strip() for shape in args.shapes.split(",") if shape.strip()]
+    sizes  = tuple(int(size) for size in args.sizes.split(",")) if args.sizes else None
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        pipeline = Pipeline(Path(output_dir))
+        results: dict[str, dict[int, dict]] = {}
+        for shape in shapes:
+            results[shape] = {size: measure(pipeline, shape, size, args.repeat) for size in sizes or SIZES[shape]}
+            print(shape_table(shape, results[shape]), end="\n\n", flush=True)
+
+    # A unit the front end cannot represent measures nothing past it: the corpus is broken, not slow
+    malformed = [f"{shape}[{size}]: {', '.join(row['ast_errors'])}"
+                 for shape, rows in results.items() for size, row in rows.items() if row["ast_errors"]]
+    if malformed:
+        print(f"{len(malformed)} unit(s) with ERROR nodes in the AST:")
+        for unit in malformed:
+            print(f"  {unit}")
+        return 1
+
+    document = {"python": platform.python_version(), "machine": platform.machine(), "repeat": args.repeat,
+                "results": results}
+    if args.json:
+        args.json.write_text(json.dumps(document, indent=1), encoding="utf-8")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(document, indent=1), encoding="utf-8")
+        print(f"baseline written: {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline} (record one with --save-baseline)")
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = compare(results, baseline["results"], args.tolerance)
+    print(f"vs. baseline ({baseline['python']}, {baseline['machine']}): "
+          f"{len(regressions) or 'no'} regression(s) beyond {args.tolerance:.0%}")
+    for regression in regressions:
+        print(f"  {regression}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# bench_scope_lookup.py
+# Benchmark: innermost-visible name lookup via ScopeStack shadow stacks vs walking Scope.parent chains, unfiltered and
+# restricted to kinds (per-(name, kind) shadow stacks vs scanning every binding of the name). Both are checked against
+# their reference first.
+#     python -m benchmarks.bench_scope_lookup
+
+import contextlib
+import io
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from compiler.scope_stack import Scope, ScopeStack
+from compiler.utils.enum_types import ScopeKind, SymbolKind
+
+########################################################################################################################
+def build_scopes(depth: int, locals_per_scope: int, globals_count: int) -> tuple[ScopeStack, list[tuple]]:
+    """ Global scope with many names, then 'depth' nested blocks each declaring locals (some shadowing globals, one
+        shadowing a function at every level). -> (stack, every binding as (name, symbol_id, kind), in order)
+    """
+    stack    = ScopeStack()
+    bindings = []
+    def declare(name: str, kind: SymbolKind):
+        stack.declare(name, len(bindings), kind)
+        bindings.append((name, len(bindings), kind))
+
+    with contextlib.redirect_stdout(io.StringIO()): # enter_scope() prints
+        stack.enter_scope(ScopeKind.GLOBAL)
+        for i in range(globals_count):
+            declare(f"g{i}", SymbolKind.Var if i % 4 else SymbolKind.Func)
+        declare("shadowed", SymbolKind.Func)
+
+        stack.enter_scope(ScopeKind.FUNCTION)
+        for level in range(depth):
+            stack.enter_scope(ScopeKind.BLOCK)
+            for i in range(locals_per_scope):
+                declare(f"l{level}_{i}", SymbolKind.Var)
+            declare(f"g{level}", SymbolKind.Var)  # Shadow a global
+            declare("shadowed", SymbolKind.Var)   # Hide the function once more
+    return stack, bindings
+
+def chain_lookup(scope: Scope, name: str) -> int | None:
+    """ The alternative: walk outward through parent scopes. """
+    while scope is not None:
+        symbol_id = scope.symbols.get(name)
+        if symbol_id is not None:
+            return symbol_id
+        scope = scope.parent
+    return None
+
+def scan_lookup(bindings: dict[str, list[tuple]], name: str, kinds: tuple) -> int | None:
+    """ The alternative for kind-filtered lookups: scan the name's bindings, innermost first. """
+    for symbol_id, kind in reversed(bindings.get(name, ())):
+        if kind in kinds:
+            return symbol_id
+    return None
+
+########################################################################################################################
+def main(depth: int = 200, locals_per_scope: int = 25, globals_count: int = 5000,
+         lookups: int = 20000, repeat: int = 5):
+    stack, declared = build_scopes(depth, locals_per_scope, globals_count)
+    by_name = {}
+    for name, symbol_id, kind in declared:
+        by_name.setdefault(name, []).append((symbol_id, kind))
+
+    # Identifier uses: globals, locals at every depth, shadowed names, misses
+    rng   = random.Random(0)
+    names = [rng.choice((f"g{rng.randrange(globals_count)}",
+                         f"l{rng.randrange(depth)}_{rng.randrange(locals_per_scope)}",
+                         f"g{rng.randrange(depth)}",
+                         "shadowed",
+                         f"missing{rng.randrange(100)}")) for _ in range(lookups)]
+    func, any_kind = (SymbolKind.Func,), (SymbolKind.Func, SymbolKind.Var)
+
+    scope = stack.curr_scope
+    assert [chain_lookup(scope, n) for n in names] == [stack.lookup(n) for n in names], "lookup mismatch"
+    for kinds in (func, any_kind):
+        assert [scan_lookup(by_name, n, kinds) for n in names] == [stack.lookup(n, kinds) for n in names], \
+               f"lookup mismatch, kinds={kinds}"
+
+    def best(lookup) -> float:
+        return min(timeit.repeat(lambda: [lookup(n) for n in names], number=1, repeat=repeat))
+    chain  = best(lambda n: chain_lookup(scope, n))
+    shadow = best(stack.lookup)
+    scan   = best(lambda n: scan_lookup(by_name, n, func))
+    kinds  = best(lambda n: stack.lookup(n, SymbolKind.Func))
+    many   = best(lambda n: stack.lookup(n, any_kind))
+
+    print(f"{depth} nested scopes, {len(declared)} names, {lookups} lookups ('shadowed': {depth} levels)")
+    print(f"parent chain : {chain  * 1000:8.2f} ms")
+    print(f"shadow stack : {shadow * 1000:8.2f} ms  ({chain / shadow:.1f}x)")
+    print("kinds=Func")
+    print(f"  scan       : {scan   * 1000:8.2f} ms")
+    print(f"  per kind   : {kinds  * 1000:8.2f} ms  ({scan / kinds:.1f}x)")
+    print(f"  Func | Var : {many   * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
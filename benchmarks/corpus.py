@@ -0,0 +1,94 @@
+# corpus.py
+# Synthetic translation units for the scaling benchmarks: one generator per input shape, each scaled by a single size.
+#     python -m benchmarks.corpus <shape> <size>   (prints the unit)
+
+import sys
+from typing import Callable
+
+########################################################################################################################
+# SHAPES (size -> C++ source; every shape parses with grammar.lark into an AST without ERROR nodes)
+
+def functions(size: int) -> str:
+    """ 'size' small functions: locals, arithmetic, calls, control flow. Breadth: many top-level declarations. """
+    return "".join(f"int f{i}(int a, int b) {{\n"
+                   f"    int x = a * {i} + b - a % 3;\n"
+                   f"    while (x > b) {{ x = x - 1; if (x == {i}) break; }}\n"
+                   f"    printf(\"f{i}\");\n"
+                   f"    return x;\n"
+                   f"}}\n" for i in range(size))
+
+def nesting(size: int) -> str:
+    """ One expression nested 'size' levels deep: calls & subscripts around binary operators. Depth: recursion in every
+        stage. (The grammar folds '(expr)' into cast_expression, so parentheses alone do not nest.)
+    """
+    operators  = ("+", "*", "-", "/")
+    expression = "x"
+    for i in range(size):
+        operator   = operators[i % len(operators)]
+        expression = f"g({expression} {operator} {i + 1})" if i % 2 else f"a[{expression} {operator} {i + 1}]"
+    return (f"int main() {{\n"
+            f"    int x = 1;\n"
+            f"    x = {expression};\n"
+            f"    return x;\n"
+            f"}}\n")
+
+def declarators(size: int) -> str:
+    """ One declaration with 'size' init-declarators, pointers & arrays mixed in. """
+    forms = ("v{i} = {i}", "*p{i}", "a{i}[{i}]", "w{i} = {{{i}}}")
+    items = ", ".join(forms[i % len(forms)].format(i=i) for i in range(size))
+    return (f"int main() {{\n"
+            f"    int {items};\n"
+            f"    return 0;\n"
+            f"}}\n")
+
+def statements(size: int) -> str:
+    """ One function body with 'size' statements: a long statement_seq. """
+    forms = ("    x = x + {i};\n",
+             "    if (x > {i}) x = x - 1; else x++;\n",
+             "    y = x * {i} % 7;\n",
+             "    while (y > {i}) y--;\n")
+    body = "".join(forms[i % len(forms)].format(i=i) for i in range(size))
+    return (f"int main() {{\n"
+            f"    int x = 0, y = 1;\n"
+            f"{body}"
+            f"    return x;\n"
+            f"}}\n")
+
+def ambiguous(size: int) -> str:
+    """ 'size' statements the grammar cannot settle without names: 'T < N > m;', 'T(x);', '(T)x;', 'T * p;'.
+        (Qualified type names, 'A::B::T', are outside what CSTtoAST builds: they transform to ERROR nodes.)
+    """
+    forms = ("    T{i} < N{i} > m{i};\n",
+             "    char(v{i});\n",
+             "    (T{i})c{i};\n",
+             "    T{i} * p{i};\n")
+    body = "".join(forms[i % len(forms)].format(i=i) for i in range(size))
+    return (f"int main() {{\n"
+            f"{body}"
+            f"    return 0;\n"
+            f"}}\n")
+
+SHAPES: dict[str, Callable[[int], str]] = {
+    "functions"  : functions,
+    "nesting"    : nesting,
+    "declarators": declarators,
+    "statements" : statements,
+    "ambiguous"  : ambiguous,
+}
+
+# Default sizes per shape: each doubles, so a phase's scaling exponent reads off neighbouring rows
+SIZES: dict[str, tuple[int, ...]] = {
+    "functions"  : (25, 50, 100, 200),
+    "nesting"    : (16, 32, 64, 128),
+    "declarators": (25, 50, 100, 200),
+    "statements" : (25, 50, 100, 200),
+    "ambiguous"  : (5, 10, 20, 40),
+}
+
+def generate(shape: str, size: int) -> str:
+    if shape not in SHAPES:
+        raise KeyError(f"unknown corpus shape '{shape}', expected one of {', '.join(SHAPES)}")
+    return SHAPES[shape](size)
+
+if __name__ == "__main__":
+    sys.stdout.write(generate(sys.argv[1], int(sys.argv[2])))
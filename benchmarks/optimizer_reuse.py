@@ -0,0 +1,69 @@
+# optimizer_reuse.py
+# Check: one Optimizer per level runs every module of a batch (as a UnitCompiler's does), each result verifies and
+# matches a fresh Optimizer's. A pass manager reused across modules crashes inside LLVM on the second one.
+#     python -m benchmarks.optimizer_reuse [file.cpp ...]   (default: tests/*.cpp & the corpus; exit status 1 on failure)
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.corpus import SHAPES, generate
+from compiler.context import CompilerContext
+from compiler.front_end.grammar_cache import load_parser
+from compiler.front_end.lexer import TokenLexer
+from compiler.front_end.llvm_generator import LLVMGenerator
+from compiler.front_end.preprocessor import Preprocessor
+from compiler.front_end.tiered_parser import TieredParser
+from compiler.front_end.transformer import CSTtoAST
+from compiler.middle_end.optimizer import Optimizer, OPT_LEVELS
+from llvmlite import binding as llvm
+
+GRAMMAR_PATH = ROOT / "compiler" / "front_end" / "grammar.lark"
+LALR_PATH    = ROOT / "compiler" / "front_end" / "lalr_overrides.lark"
+CACHE_PATH   = ROOT / ".cache"
+
+########################################################################################################################
+def lower(parser: TieredParser, code: str) -> str | None:
+    """ Source -> LLVM IR text, None if the front end rejects it. """
+    try:
+        generator = LLVMGenerator(CSTtoAST().transform(parser.parse(code)), CompilerContext())
+        generator.generate()
+    except Exception:
+        return None
+    return str(generator.module)
+
+def main(paths: list[Path], corpus: bool) -> int:
+    earley, _ = load_parser(GRAMMAR_PATH, CACHE_PATH, start="start", parser="earley", ambiguity="forest",
+                            lexer=TokenLexer)
+    lalr,   _ = load_parser(GRAMMAR_PATH, CACHE_PATH, override_path=LALR_PATH,
+                            start=["declaration", "probe_declaration"], parser="lalr", lexer=TokenLexer)
+    parser = TieredParser(lalr, earley)
+
+    units = [(path.name, Preprocessor([ROOT / "include"]).preprocess(path.read_text(encoding="utf-8"), path))
+             for path in paths]
+    if corpus:
+        units += [(f"{shape}/20", generate(shape, 20)) for shape in SHAPES]
+    modules = [(name, ir) for name, code in units if (ir := lower(parser, code)) is not None]
+    if len(modules) < 2:
+        print(f"need at least 2 modules that lower, got {len(modules)}")
+        return 1
+
+    print(f"{'level':<6} {'modules':>8}  result")
+    failed = 0
+    for level in OPT_LEVELS:
+        shared     = Optimizer(level)
+        mismatches = []
+        for name, ir in modules:
+            result = str(shared.optimize(llvm.parse_assembly(ir)))
+            if result != str(Optimizer(level).optimize(llvm.parse_assembly(ir))):
+                mismatches.append(name)
+        failed += len(mismatches)
+        print(f"-O{level:<4} {len(modules):>8}  " + (f"MISMATCH: {', '.join(mismatches)}" if mismatches else "identical"))
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    paths = [Path(arg) for arg in sys.argv[1:]]
+    sys.exit(main(paths or sorted((ROOT / "tests").glob("*.cpp")), corpus=not paths))
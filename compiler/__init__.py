@@ -0,0 +1,20 @@
+import functools
+import hashlib
+from pathlib import Path
+
+# Bumped whenever a change to any stage alters generated code: invalidates every cached compile.
+__version__ = "0.1.0"
+
+@functools.cache
+def source_digest() -> str:
+    """ Hash of the compiler package's sources & grammars, part of every cache key: any edit invalidates, bumped
+        __version__ or not.
+    """
+    root   = Path(__file__).resolve().parent
+    digest = hashlib.sha256(__version__.encode("utf-8"))
+    for path in sorted([*root.rglob("*.py"), *root.rglob("*.lark")]):
+        digest.update(str(path.relative_to(root)).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()
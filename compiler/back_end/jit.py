@@ -0,0 +1,112 @@
+# jit.py
+
+from __future__ import annotations
+
+import ctypes
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator
+
+from llvmlite import ir, binding as llvm
+
+from compiler.front_end.llvm_generator import TARGET_MACHINE # Also performs the one-time llvm.initialize*()
+from compiler.utils.instrumentation import phase
+
+########################################################################################################################
+@dataclass
+class JitStats:
+    modules_added  : int = 0 # Modules compiled into the engine
+    modules_removed: int = 0 # Modules unloaded again
+
+    def __str__(self):
+        return f"jit: {self.modules_added} module(s) added, {self.modules_removed} removed"
+
+########################################################################################################################
+class JitSession:
+    """ One MCJIT engine + target machine, shared by every unit it executes.
+        Modules are added / removed individually, so a test runner pays engine construction once, not per program.
+    """
+
+    def __init__(self, target_machine: llvm.TargetMachine | None = None):
+        self.target_machine = target_machine or TARGET_MACHINE
+
+        # Engine: owns an empty backing module, units are added on top of it
+        self.engine = llvm.create_mcjit_compiler(llvm.parse_assembly(""), self.target_machine)
+
+        self.modules: list[llvm.ModuleRef] = [] # Currently loaded, in load order
+        self.stats = JitStats()
+
+    ####################################################################################################################
+    #  MODULES  #
+    #############
+
+    def add(self, module: ir.Module | llvm.ModuleRef) -> llvm.ModuleRef:
+        """ Verifies, compiles & loads a module; its symbols are resolvable until remove(). """
+        module_ref = self.to_module_ref(module)
+        module_ref.verify()
+
+        with phase("jit_finalize"):
+            self.engine.add_module(module_ref)
+            self.engine.finalize_object()
+        self.modules.append(module_ref)
+        self.stats.modules_added += 1
+        return module_ref
+
+    def remove(self, module_ref: llvm.ModuleRef):
+        """ Unloads a module previously returned by add(). """
+        self.engine.remove_module(module_ref)
+        self.modules.remove(module_ref)
+        self.stats.modules_removed += 1
+
+    @contextmanager
+    def loaded(self, module: ir.Module | llvm.ModuleRef) -> Iterator[llvm.ModuleRef]:
+        """ with session.loaded(module): ... -> the module is removed again on exit. """
+        module_ref = self.add(module)
+        try:
+            yield module_ref
+        finally:
+            self.remove(module_ref)
+
+    @staticmethod
+    def to_module_ref(module: ir.Module | llvm.ModuleRef) -> llvm.ModuleRef:
+        # llvmlite builds ir.Module in Python: textual IR is its only way into LLVM
+        if isinstance(module, llvm.ModuleRef):
+            return module
+        return llvm.parse_assembly(str(module))
+
+    ####################################################################################################################
+    #  SYMBOLS  #
+    #############
+
+    def function_address(self, name: str) -> int:
+        address = self.engine.get_function_address(name)
+        if not address:
+            raise KeyError(f"no function '{name}' in the loaded modules")
+        return address
+
+    def global_address(self, name: str) -> int:
+        address = self.engine.get_global_value_address(name)
+        if not address:
+            raise KeyError(f"no global '{name}' in the loaded modules")
+        return address
+
+    def function(self, name: str, restype=ctypes.c_int, *argtypes):
+        """ ctypes callable for a loaded function. """
+        return ctypes.CFUNCTYPE(restype, *argtypes)(self.function_address(name))
+
+    def run_main(self, module: ir.Module | llvm.ModuleRef) -> int:
+        """ Loads a unit, calls its int main(), unloads it. Returns main's result. """
+        with self.loaded(module):
+            return self.function("main")()
+
+    ####################################################################################################################
+    def close(self):
+        for module_ref in list(self.modules):
+            self.remove(module_ref)
+        self.engine.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
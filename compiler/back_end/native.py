@@ -0,0 +1,90 @@
+# native.py
+
+from __future__ import annotations
+
+import shutil
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from llvmlite import ir, binding as llvm
+
+from compiler.front_end.llvm_generator import TARGET_MACHINE # Also performs the one-time llvm.initialize*()
+from compiler.utils.instrumentation import phase
+
+########################################################################################################################
+@dataclass
+class NativeArtifacts:
+    object_path    : Path
+    executable_path: Path | None = None # None: object only (link=False)
+
+LINKER_DRIVERS = ("clang", "cc", "gcc") # Searched in order when no linker is given
+
+def find_linker() -> str:
+    for driver in LINKER_DRIVERS:
+        path = shutil.which(driver)
+        if path is not None:
+            return path
+    raise FileNotFoundError(f"no C compiler driver to link with (tried {', '.join(LINKER_DRIVERS)})")
+
+########################################################################################################################
+class NativeEmitter:
+    """ Ahead-of-time back end: module -> native object file -> executable (linked by the system's C compiler driver).
+        Artifacts are written to output_dir; compile once, run many times.
+    """
+
+    def __init__(self, output_dir: Path, target_machine: llvm.TargetMachine | None = None,
+                 linker: str | None = None, link_flags: tuple[str, ...] = ()):
+        self.output_dir     = Path(output_dir)
+        self.target_machine = target_machine or TARGET_MACHINE
+        self.linker         = linker     # Driver invoked for linking: brings in crt*.o & libc (printf); None: search
+        self.link_flags     = link_flags # Extra arguments, e.g. ("-lm",)
+
+    ####################################################################################################################
+    def build(self, module: ir.Module | llvm.ModuleRef, name: str, link: bool = True) -> NativeArtifacts:
+        """ Emits <output_dir>/<name>.o and, if link, the executable <output_dir>/<name>. """
+        object_path = self.emit_object(module, name)
+        if not link:
+            return NativeArtifacts(object_path)
+        return NativeArtifacts(object_path, self.link([object_path], name))
+
+    def emit_object(self, module: ir.Module | llvm.ModuleRef, name: str) -> Path:
+        return self.write_object(self.object_code(module), name)
+
+    def object_code(self, module: ir.Module | llvm.ModuleRef) -> bytes:
+        """ Native object file contents, without writing anything. """
+        module_ref = self._module_ref(module)
+        with phase("codegen") as record:
+            object_code = self.target_machine.emit_object(module_ref)
+            record.counters["object_bytes"] = len(object_code)
+        return object_code
+
+    def write_object(self, object_code: bytes, name: str) -> Path:
+        object_path = self.output_dir / f"{name}.o"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        object_path.write_bytes(object_code)
+        return object_path
+
+    def emit_assembly(self, module: ir.Module | llvm.ModuleRef, name: str) -> Path:
+        """ Human-readable counterpart of emit_object(): <output_dir>/<name>.s """
+        module_ref = self._module_ref(module)
+
+        assembly_path = self.output_dir / f"{name}.s"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        assembly_path.write_text(self.target_machine.emit_assembly(module_ref))
+        return assembly_path
+
+    def link(self, object_paths: list[Path], name: str) -> Path:
+        """ Links object files into <output_dir>/<name>. Raises CalledProcessError (with the linker's output). """
+        executable_path = self.output_dir / name
+        subprocess.run([self.linker or find_linker(), *map(str, object_paths), "-o", str(executable_path), *self.link_flags],
+                       text=True, capture_output=True, check=True)
+        return executable_path
+
+    @staticmethod
+    def _module_ref(module: ir.Module | llvm.ModuleRef) -> llvm.ModuleRef:
+        if isinstance(module, llvm.ModuleRef):
+            return module
+        module_ref = llvm.parse_assembly(str(module))
+        module_ref.verify()
+        return module_ref
@@ -0,0 +1,128 @@
+# compile_cache.py
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import llvmlite
+from llvmlite import binding as llvm
+
+from compiler import source_digest
+
+########################################################################################################################
+# ENTRIES
+
+@dataclass
+class CompiledUnit:
+    ir         : str          # Optimized LLVM IR (textual)
+    object_code: bytes | None # Native object file, if the unit was emitted
+
+@dataclass
+class CompileCacheStats:
+    hits     : int = 0
+    misses   : int = 0
+    evictions: int = 0 # Entries dropped to stay under max_bytes
+
+    def __str__(self):
+        return f"compile cache: {self.hits} hit(s), {self.misses} miss(es), {self.evictions} evicted"
+
+########################################################################################################################
+class CompileCache:
+    """ Content-addressed store of finished translation units: key -> <key>.ll (+ <key>.o) in cache_dir.
+        Keyed by the preprocessed source, the grammar files, the compiler's sources, the llvmlite version, the target
+        and the -O level, so an identical compile is answered without running any stage. Least recently used entries
+        are evicted first.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.stats     = CompileCacheStats()
+
+    ####################################################################################################################
+    @staticmethod
+    def key(source: str, opt_level: int, grammar_paths: list[Path] = ()) -> str:
+        digest = hashlib.sha256()
+        for part in (source_digest(), llvmlite.__version__, llvm.get_default_triple(), f"O{opt_level}"):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        for path in grammar_paths:
+            digest.update(Path(path).read_bytes())
+            digest.update(b"\0")
+        digest.update(source.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> CompiledUnit | None:
+        ir_path, object_path = self._paths(key)
+        try:
+            ir          = ir_path.read_text(encoding="utf-8")
+            object_code = object_path.read_bytes() if object_path.exists() else None
+        except OSError:
+            self.stats.misses += 1
+            return None
+
+        # LRU: mtime records the last use
+        for path in (ir_path, object_path):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+        self.stats.hits += 1
+        return CompiledUnit(ir, object_code)
+
+    def put(self, key: str, unit: CompiledUnit):
+        ir_path, object_path = self._paths(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            if unit.object_code is not None:
+                self._write(object_path, unit.object_code)
+            self._write(ir_path, unit.ir.encode("utf-8")) # Written last: its presence marks a complete entry
+        except OSError:
+            return # Cache is an optimisation only
+        self._evict()
+
+    ####################################################################################################################
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.ll", self.cache_dir / f"{key}.o"
+
+    def _write(self, path: Path, data: bytes):
+        # Atomic: concurrent compiles never read a half-written entry
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except OSError:
+            os.unlink(tmp_name)
+            raise
+
+    def _evict(self):
+        entries: dict[str, list] = {} # key -> [last use, size, paths]
+        for path in self.cache_dir.iterdir():
+            if path.suffix not in (".ll", ".o"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entry = entries.setdefault(path.stem, [0.0, 0, []])
+            entry[0]  = max(entry[0], stat.st_mtime)
+            entry[1] += stat.st_size
+            entry[2].append(path)
+
+        total = sum(size for _, size, _ in entries.values())
+        for _, size, paths in sorted(entries.values(), key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            for path in paths:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            self.stats.evictions += 1
@@ -1,12 +1,13 @@
 # context
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from compiler.symbol_table import SymbolTable
 from compiler.scope_stack  import ScopeStack
 from compiler.error_table  import DiagnosticEngine
 
 @dataclass
 class CompilerContext:
-    symbol_table = SymbolTable()
-    error_table  = DiagnosticEngine()
-    scope_stack   = ScopeStack()
\ No newline at end of file
+    # Per instance: one context per translation unit, nothing leaks between units
+    symbol_table: SymbolTable      = field(default_factory=SymbolTable)
+    error_table : DiagnosticEngine = field(default_factory=DiagnosticEngine)
+    scope_stack : ScopeStack       = field(default_factory=ScopeStack)
@@ -0,0 +1,333 @@
+# driver.py
+
+from __future__ import annotations
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable
+
+from llvmlite import binding as llvm
+
+from compiler.context import CompilerContext
+from compiler.compile_cache import CompileCache, CompiledUnit
+from compiler.front_end.parallel_parser import ParserSpec
+from compiler.front_end.tiered_parser import TieredParser
+from compiler.front_end.preprocessor import Preprocessor
+from compiler.front_end.header_cache import HeaderCache
+from compiler.front_end.incremental import IncrementalFrontEnd
+from compiler.front_end.transformer import CSTtoAST
+from compiler.front_end.llvm_generator import LLVMGenerator
+from compiler.middle_end.optimizer import Optimizer
+from compiler.back_end.native import NativeEmitter
+from compiler.utils import log
+from compiler.utils.colors import colors
+from compiler.utils.instrumentation import Instrumentation, collecting, phase
+
+SOURCE_SUFFIXES = (".cpp", ".cc", ".cxx", ".c++") # Picked up from directories given as inputs
+EMIT_KINDS      = ("ir", "obj", "exe")
+
+########################################################################################################################
+# OPTIONS & RESULTS
+
+@dataclass
+class DriverOptions:
+    """ Picklable: sent once to every worker, which builds its own UnitCompiler from it. """
+    lalr_spec    : ParserSpec
+    earley_spec  : ParserSpec
+    output_dir   : Path
+    include_paths: list[Path]      = field(default_factory=list)
+    cache_dir    : Path | None     = None # None: no compile / header cache
+    grammar_paths: list[Path]      = field(default_factory=list) # Cache keys: a grammar edit invalidates
+    opt_level    : int             = 2
+    emit         : tuple[str, ...] = ("ir", "obj")
+    trace_memory : bool            = False # tracemalloc every phase (slow)
+    incremental  : bool            = False # Keep each file's parsed declarations between its compiles (watch mode)
+    log_settings : dict            = field(default_factory=dict) # log.configure() arguments, for worker processes
+
+@dataclass
+class CompileResult:
+    source : Path
+    error  : str | None = None              # "<ExceptionType>: message", None on success
+    elapsed: float      = 0.0               # Seconds, whole file
+    phases : dict[str, float] = field(default_factory=dict) # Phase -> seconds
+    outputs: list[Path]       = field(default_factory=list)
+    cached : bool = False                   # Served by the compile cache
+    instrumentation: Instrumentation | None = None # Every phase of this file
+    setup          : Instrumentation | None = None # Grammar loads etc., on the first file a compiler handles
+    log            : list[tuple[str, str]] = field(default_factory=list) # Worker output, replayed by the parent
+    unit           : CompiledUnit | None   = None # In-process compiles only (e.g. to JIT it): workers drop it
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+########################################################################################################################
+class UnitCompiler:
+    """ One file at a time, everything expensive loaded once: parsers, preprocessor (header file cache), header &
+        compile caches, optimizer pipeline, emitter. Each file gets a fresh CompilerContext.
+    """
+
+    def __init__(self, options: DriverOptions):
+        self.options = options
+
+        self.setup = Instrumentation(options.trace_memory, label="setup")
+        with collecting(self.setup):
+            lalr_parser,   _ = options.lalr_spec.load()
+            earley_parser, _ = options.earley_spec.load()
+        self.parser       = TieredParser(lalr_parser, earley_parser)
+        self.preprocessor = Preprocessor(options.include_paths)
+        self.optimizer    = Optimizer(options.opt_level)
+        self.emitter      = NativeEmitter(options.output_dir)
+
+        cache_dir = options.cache_dir
+        self.header_cache  = HeaderCache(self.parser, CSTtoAST(),
+                                         cache_dir / "headers" if cache_dir else None, options.grammar_paths)
+        self.compile_cache = CompileCache(cache_dir / "units") if cache_dir else None
+
+        # Source path -> its front end: an edit re-parses only the declarations it touched (header cache unused)
+        self.incremental: dict[Path, IncrementalFrontEnd] | None = {} if options.incremental else None
+
+    ####################################################################################################################
+    def compile(self, source: Path, name: str) -> CompileResult:
+        """ Compiles source into <output_dir>/<name>.{ll,o} (+ executable). Failures are returned, never raised. """
+        result = CompileResult(Path(source))
+        result.instrumentation = Instrumentation(self.options.trace_memory, label=str(source))
+        result.setup, self.setup = self.setup, None
+
+        start = time.perf_counter()
+        with collecting(result.instrumentation):
+            try:
+                self._compile(result, name)
+            except Exception as error:
+                result.error = f"{type(error).__name__}: {error}"
+        result.elapsed = time.perf_counter() - start
+        result.phases  = result.instrumentation.top_level()
+        return result
+
+    def _compile(self, result: CompileResult, name: str):
+        emit = self.options.emit
+        log.banner(colors.cyan, f"Path: {result.source}")
+
+        # Preprocess
+        with open(result.source, "r", encoding="utf-8", errors="replace") as f:
+            code = self.preprocessor.preprocess(f.read(), result.source)
+        log.dump("source", lambda stream: stream.write(f"// {result.source}\n{code}"))
+
+        # Compile Cache
+        key  = None
+        unit = None
+        if self.compile_cache is not None:
+            key  = self.compile_cache.key(code, self.options.opt_level, self.options.grammar_paths)
+            unit = self.compile_cache.get(key)
+            result.cached = unit is not None
+            log.info(str(self.compile_cache.stats), color=colors.grey)
+
+        if unit is None:
+            context = CompilerContext()
+
+            # Parse & Transform
+            with phase("front_end") as record:
+                ast = self._front_end(result.source, code, record.counters)
+            def write_ast(stream):
+                stream.write(f"// {result.source}\n")
+                ast.write_pretty(stream, color=log.color_enabled())
+            log.dump("ast", write_ast)
+
+            # Lower & Optimize
+            generator = LLVMGenerator(ast, context)
+            generator.generate()
+            log.info(str(generator.stats), color=colors.grey)
+            log.dump("ir", lambda stream: stream.write(f"; {result.source}\n{generator.module}\n"))
+            module_ref = self.optimizer.optimize(generator.module)
+            log.info(str(self.optimizer.stats), color=colors.grey)
+
+            # Object Code (also cached when not requested: a later run may ask for it)
+            unit = CompiledUnit(str(module_ref), self.emitter.object_code(module_ref))
+
+            if self.compile_cache is not None:
+                self.compile_cache.put(key, unit)
+
+        result.unit = unit
+
+        # Outputs
+        with phase("emit"):
+            self._write_outputs(result, name, unit, emit)
+
+    def _front_end(self, source: Path, code: str, counters: dict):
+        if self.incremental is None:
+            ast = self.header_cache.build_ast(code, self.preprocessor.segments)
+            log.info(str(self.header_cache.stats), color=colors.grey)
+            return ast
+
+        front_end = self.incremental.get(source)
+        if front_end is None:
+            front_end = self.incremental[source] = IncrementalFrontEnd(self.parser)
+        _, ast = front_end.build(code)
+        counters.update(reused=front_end.stats.reused, reparsed=front_end.stats.reparsed)
+        log.info(str(front_end.stats), color=colors.grey)
+        return ast
+
+    def _write_outputs(self, result: CompileResult, name: str, unit: CompiledUnit, emit: tuple[str, ...]):
+        if "ir" in emit:
+            ir_path = self.options.output_dir / f"{name}.ll"
+            ir_path.parent.mkdir(parents=True, exist_ok=True)
+            ir_path.write_text(unit.ir, encoding="utf-8")
+            result.outputs.append(ir_path)
+        if "obj" in emit or "exe" in emit:
+            object_code = unit.object_code
+            if object_code is None:
+                object_code = self.emitter.object_code(llvm.parse_assembly(unit.ir))
+            object_path = self.emitter.write_object(object_code, name)
+            result.outputs.append(object_path)
+            if "exe" in emit:
+                result.outputs.append(self.emitter.link([object_path], name))
+
+########################################################################################################################
+# WORKER PROCESS
+
+_worker_compiler: UnitCompiler | None = None # One per worker, built by _init_worker()
+
+def _init_worker(options: DriverOptions):
+    global _worker_compiler
+    log.configure(**options.log_settings)
+    _worker_compiler = UnitCompiler(options)
+
+def _compile_in_worker(source: Path, name: str) -> CompileResult:
+    with log.capturing() as records:
+        result = _worker_compiler.compile(source, name)
+    result.log  = records
+    result.unit = None # Not pickled back: the parent only reports
+    return result
+
+########################################################################################################################
+class Driver:
+    """ Batch compilation: files are spread over a process pool, one UnitCompiler (one loaded grammar) per worker.
+        A single worker (or a single file) compiles in-process.
+    """
+
+    def __init__(self, options: DriverOptions, workers: int | None = None):
+        self.options = options
+        self.workers = workers or os.cpu_count() or 1
+
+    def compile(self, sources: list[Path]) -> list[CompileResult]:
+        """ Results in input order. """
+        names = output_names(sources)
+
+        if self.workers < 2 or len(sources) < 2:
+            compiler = UnitCompiler(self.options)
+            return [compiler.compile(source, name) for source, name in zip(sources, names)]
+
+        workers = min(self.workers, len(sources))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.options,)) as pool:
+            futures = [pool.submit(_compile_in_worker, source, name) for source, name in zip(sources, names)]
+
+            results = []
+            for source, future in zip(sources, futures):
+                try:
+                    results.append(future.result())
+                    log.replay(results[-1].log) # In input order, as a single worker would print it
+                except BrokenProcessPool as error:
+                    # Worker died (e.g. a crash inside LLVM): the file is reported, the batch goes on
+                    results.append(CompileResult(Path(source), error=f"{type(error).__name__}: {error}"))
+            return results
+
+########################################################################################################################
+def watch(options: DriverOptions, sources: list[Path], report: Callable[[list[CompileResult]], None],
+          interval: float = 0.5):
+    """ Watch mode, until interrupted: compiles every source, then again each one that changes (all of them when a
+        header they read changes). In-process & incremental: an edit re-parses only the declarations it touched.
+    """
+    compiler = UnitCompiler(replace(options, incremental=True))
+    names    = dict(zip(sources, output_names(sources)))
+    stamps: dict[Path, int | None] = {} # Modification time of every source & header read, as of the latest check
+
+    while True:
+        headers = list(compiler.preprocessor.files)
+        current = {path: _modified(path) for path in [*sources, *headers]}
+        edited  = {path for path, stamp in current.items() if stamp is not None and stamp != stamps.get(path)}
+        stamps.update(current)
+
+        stale = sources if edited.difference(sources) else [source for source in sources if source in edited]
+        if stale:
+            report([compiler.compile(source, names[source]) for source in stale])
+            # Headers first read in this round: only later edits count
+            stamps.update((path, _modified(path)) for path in compiler.preprocessor.files if path not in stamps)
+        time.sleep(interval)
+
+def _modified(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None # Deleted, or mid-save: compiled again once it is back
+
+########################################################################################################################
+# INPUTS & REPORTING
+
+def expand_inputs(patterns: list[str]) -> list[Path]:
+    """ Files, directories (searched recursively for SOURCE_SUFFIXES) and glob patterns -> unique files, in order. """
+    sources: list[Path] = []
+    seen   : set[Path]  = set()
+
+    def add(path: Path):
+        resolved = path.resolve()
+        if resolved not in seen:
+            seen.add(resolved)
+            sources.append(path)
+
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise FileNotFoundError(f"no input matches '{pattern}'")
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                for child in sorted(path.rglob("*")):
+                    if child.suffix in SOURCE_SUFFIXES and child.is_file():
+                        add(child)
+            elif path.is_file():
+                add(path)
+            else:
+                raise FileNotFoundError(f"no such input file '{match}'")
+    return sources
+
+def output_names(sources: list[Path]) -> list[str]:
+    """ Output basename per source: its stem, suffixed with a counter when two sources share one. """
+    counts: dict[str, int] = {}
+    names = []
+    for source in sources:
+        stem  = Path(source).stem
+        count = counts.get(stem, 0)
+        counts[stem] = count + 1
+        names.append(stem if count == 0 else f"{stem}.{count}")
+    return names
+
+SUMMARY_PHASES = ("preprocess", "front_end", "lower", "optimize", "codegen", "emit")
+
+def summary_table(results: list[CompileResult]) -> str:
+    """ Plain-text table: one row per file (times in ms), then totals & failure details. """
+    header = ["file", "status", "total", *SUMMARY_PHASES]
+    rows   = []
+    for result in results:
+        status = "cached" if result.cached else "ok"
+        rows.append([str(result.source), status if result.ok else "FAILED", f"{result.elapsed * 1000:.1f}",
+                     *(f"{result.phases[phase] * 1000:.1f}" if phase in result.phases else "-"
+                       for phase in SUMMARY_PHASES)])
+
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    def line(row):
+        return "  ".join(cell.ljust(width) if i < 2 else cell.rjust(width)
+                         for i, (cell, width) in enumerate(zip(row, widths)))
+
+    failures = [result for result in results if not result.ok]
+    lines = [line(header), "  ".join("-" * width for width in widths), *map(line, rows), ""]
+    lines.append(f"{len(results)} file(s), {len(results) - len(failures)} ok, {len(failures)} failed, "
+                 f"{sum(result.elapsed for result in results):.2f} s compile time")
+    for result in failures:
+        lines.append(f"  {result.source}: {result.error.splitlines()[0]}") # Lark errors list every expected token
+    return "\n".join(lines)
@@ -1,12 +1,36 @@
 from __future__ import annotations
 
+import io
+import re
+import sys
+from functools import lru_cache
+from typing import TextIO
+
 from compiler.utils.colors import colors
 from compiler.utils.data_classes import SourceLocation
+from compiler.front_end.abstract_nodes.traversal import SKIP, traverse, iter_preorder
+
+_KIND_SPLIT = re.compile(r"[\s:]")
+
+@lru_cache(maxsize=4096)
+def node_kind(name: str | None) -> str:
+    """ Dispatch key of a display name: the raw name cut at the first whitespace / ':' (interned).
+            "identifier: x" -> "identifier"
+        Colored names keep their ANSI codes, so no visitor matches them (as with the getattr lookup it replaces).
+    """
+    if not name:
+        return ""
+    return sys.intern(_KIND_SPLIT.split(name, 1)[0])
 
 
 class ASTNode:
     """ Represents a node in the Abstract Syntax Tree (AST)."""
 
+    # Compact Layout: no per-node __dict__; every subclass declares its own (possibly empty) __slots__
+    __slots__ = ("_name", "kind", "children", "loc", "_ansi_color")
+
+    default_color = colors.white # Per-class pretty-printing color; _ansi_color only holds per-node overrides
+
     def __init__(self, node_name=None, children:list[ASTNode] | None=None, init_color: colors=None):
 
         # Abstract Node Details
@@ -15,38 +39,56 @@ class ASTNode:
         self.loc      = SourceLocation
 
         # Pretty Printing Details
-        if not init_color:
-            init_color = colors.white
+        self._ansi_color = init_color or None
 
-        self.ansi_color: colors = init_color
+    @property
+    def name(self) -> str:
+        return self._name
 
-    #################################################################################################################
-    def pretty(self):
-        """ Returns a string visualizing the subtree rooted at this node."""
+    @name.setter
+    def name(self, node_name: str):
+        # Interned: display names repeat heavily ('keyword: int', 'identifier: x'), one copy each
+        self._name = sys.intern(node_name) if type(node_name) is str else node_name
+        self.kind  = node_kind(node_name) # Decorator dispatch key, kept in sync with the display name
 
-        text_tree  = self.ansi_color(self.name) + "\n"
-        text_tree += self.walk(self, 1)
+    @property
+    def ansi_color(self) -> colors:
+        return self._ansi_color or self.default_color
 
-        return text_tree
+    @ansi_color.setter
+    def ansi_color(self, color: colors):
+        self._ansi_color = color
 
-    def walk(self, node, curr_indent):
-        text_tree = ""
+    def display_children(self) -> list[ASTNode]:
+        """ Children shown by pretty(). Subclasses append display-only nodes here, built on demand. """
+        return self.children
 
-        if node.children:
-            for child in node.children:
-                text_tree += curr_indent*"  " + child.ansi_color(child.name) + "\n"
-                text_tree += self.walk(child, curr_indent+1)
-        # else:
-            # text_tree = (curr_indent+1)*"  " + "[No children]\n"
+    #################################################################################################################
+    def pretty(self, color: bool = True) -> str:
+        """ Returns a string visualizing the subtree rooted at this node."""
+        buffer = io.StringIO()
+        self.write_pretty(buffer, color)
+        return buffer.getvalue()
+
+    def write_pretty(self, stream: TextIO, color: bool = True):
+        """ Streams pretty() to stream line by line: linear time, no whole-tree string. color=False: no ANSI codes. """
+        write = stream.write
+        for node, depth in iter_preorder(self, display=True):
+            write(depth*"  ")
+            write(node.ansi_color(node.name) if color else str(node.name))
+            write("\n")
 
-        return text_tree
+    def walk(self, node, curr_indent):
+        """ Returns the lines below 'node' (not 'node' itself), 'curr_indent' levels in for its children. """
+        lines = []
+        for child, depth in iter_preorder(node, display=True):
+            if depth:
+                lines.append((curr_indent + depth - 1)*"  " + child.ansi_color(child.name) + "\n")
+
+        return "".join(lines)
 ########################################################################################################################
     def dfs(self, visit):
-
-        visit(self) # Call Visit Function
-
-        # Recursively Walk Children
-        for child in self.children:
-            child.dfs(visit)
+        """ Pre-order walk calling visit(node); visit may return SKIP to prune a node's children. """
+        traverse(self, enter=visit)
 
     ########################################################################################################################
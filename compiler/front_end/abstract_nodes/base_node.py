@@ -16,20 +16,24 @@ MemberT = TypeVar("MemberT", bool, int, str, float)
 
 
 class Statement(ASTNode):
+    __slots__     = ("statement_type",)
+    default_color = colors.red
+
     def __init__(self, statement_type: str = "statement"):
         super().__init__(node_name=statement_type)
         self.statement_type = statement_type
-        self.ansi_color = colors.red
 
 ########################################################################################################################
 
 class Body(ASTNode, Generic[NodeT]):
+    __slots__     = ("member_list",)
+    default_color = colors.purple
+
     # Generic Parameter: Member Type Template
     def __init__(self, body_type:str="body", members:list[NodeT] | None=None):
         super().__init__(node_name=body_type)
 
         self.member_list = members or []  # List of ASTNodes, may be empty
-        self.ansi_color = colors.purple
         self.init_children()
 
     def add_member(self, member:NodeT):
@@ -48,6 +52,8 @@ class Body(ASTNode, Generic[NodeT]):
 # NORMALIZED DECLARATION
 
 class NormalDeclaration(ASTNode):
+    __slots__ = ("decl_kind", "decl_specs", "decl_list", "func_body", "symbol")
+
     def __init__(self,
                  decl_specs:DeclSpec,
                  declarator_list:list["NormalDeclaration"] | None = None,
@@ -83,6 +89,9 @@ class NormalDeclaration(ASTNode):
 # TRANSLATION UNIT
 
 class TranslationUnit(ASTNode):
+    __slots__     = ("declarations",)
+    default_color = colors.blue.bold.underline
+
     def __init__(self, declaration_list: list[ASTNode] | None = None):
         super().__init__(node_name="translation_unit")
 
@@ -90,9 +99,6 @@ class TranslationUnit(ASTNode):
         # List of External Declarations
         self.declarations = declaration_list or []
 
-        # Add Color for Pretty-Printing
-        self.ansi_color = colors.blue.bold.underline
-
         # Add Children for Pretty-Printing
         for member in self.declarations:
             self.children.append(member)
@@ -101,6 +107,9 @@ class TranslationUnit(ASTNode):
 # SIMPLE TYPE
 
 class SimpleType(ASTNode):
+    __slots__     = ("type_name", "size", "signed")
+    default_color = colors.green
+
     def __init__(self,
                  base_type:FundamentalTypes,
                  size:int,
@@ -111,22 +120,19 @@ class SimpleType(ASTNode):
         self.size        = size         # int:  # of bits
         self.signed      = signed       # Bool: can represent negatives
 
-        # Add Color for Pretty-Printing
-        self.ansi_color = colors.green
-
-        # Add Children for Pretty-Printing
-        self.init_children()
-
-    def init_children(self):
-        self.children.append(ASTNode(colors.teal(self.type_name.name.lower())))
-        self.children.append(ASTNode(colors.teal(str(self.size))))
-        self.children.append(ASTNode(colors.teal("is signed" if self.signed
-                                                 else "not signed")))
+    # Children for Pretty-Printing (built on demand)
+    def display_children(self):
+        return self.children + [ASTNode(colors.teal(self.type_name.name.lower())),
+                                ASTNode(colors.teal(str(self.size))),
+                                ASTNode(colors.teal("is signed" if self.signed else "not signed"))]
 
 ########################################################################################################################
 # ELABORATE TYPE
 
 class ElaborateType(ASTNode):
+    __slots__     = ("elaborate_kind", "identifier", "body", "underlying_type", "is_scoped")
+    default_color = colors.green
+
     def __init__(self,
                  elaborate_kind: ElaboratedTypeKind,
                  elaborate_name: str,
@@ -135,7 +141,7 @@ class ElaborateType(ASTNode):
                  is_scoped     : bool                 | None=None):
 
         super().__init__(node_name="elaborate_type")
-        self.kind            = elaborate_kind #
+        self.elaborate_kind  = elaborate_kind # ('kind' is the node's dispatch key)
         self.identifier      = elaborate_name #
         self.body            = elaborate_body # Optional: Defining Body
 
@@ -143,21 +149,22 @@ class ElaborateType(ASTNode):
         self.underlying_type = enum_base      # Optional: Enum base type
         self.is_scoped       = is_scoped      # Optional: Enum is_scoped
 
-        # Add Color for Pretty-Printing
-        self.ansi_color = colors.green
-
-        # Add Children for Pretty-Printing
-        self.init_children()
+        if self.body is not None:
+            self.children.append(self.body)
 
-    def init_children(self):
-        self.children.append(ASTNode(colors.teal(self.kind.name.lower())))
-        self.children.append(ASTNode(colors.teal(self.identifier)))
-        self.children.append(self.body)
+    # Children for Pretty-Printing (built on demand)
+    def display_children(self):
+        return [ASTNode(colors.teal(self.elaborate_kind.name.lower())),
+                ASTNode(colors.teal(self.identifier))] + self.children
 
 ########################################################################################################################
 # DECLARATION SPECIFIER LIST
 
 class DeclSpec(ASTNode):
+    __slots__     = ("type_node", "qualifier_set", "storage_class", "func_specifier_set",
+                     "is_constexpr", "is_consteval", "is_constinit", "is_typedef", "is_using_alias", "is_friend")
+    default_color = colors.dark_green
+
     def __init__(self,
                  type_node: Union[SimpleType, ElaborateType],  # int, float... | class, enum
                  qualifiers:          list[str] | None =None,  # const, volatile...
@@ -166,9 +173,10 @@ class DeclSpec(ASTNode):
 
         super().__init__(node_name="decl_specs")
         self.type_node          = type_node                                            # Required: Type()
-        self.qualifier_set      = set(qualifiers) if qualifiers is not None else set() # Optional: set(str)
-        self.storage_class      = storage_class                                        # Optional: str
-        self.func_specifier_set = set(function_specifiers) if function_specifiers is not None else set() # Optional: set(str)
+        # Ordered sets (dict keys): membership tests as a set, source order for pretty-printing
+        self.qualifier_set      = dict.fromkeys(qualifiers or ())          # Optional: {str: None}
+        self.storage_class      = storage_class                            # Optional: str
+        self.func_specifier_set = dict.fromkeys(function_specifiers or ()) # Optional: {str: None}
 
         # Declaration-Level Misc. Specifiers
         self.is_constexpr:   bool = False
@@ -180,22 +188,21 @@ class DeclSpec(ASTNode):
         # self.alignas_value        = None
         # self.attributes: list[str] | None = None
 
-        # Add Color for Pretty-Printing
-        self.ansi_color = colors.dark_green
-
-        # Add Children For Pretty-Printing
         self.children.append(type_node)
-        for child in qualifiers:
-            self.children.append(ASTNode(child))
-        if storage_class:
-            self.children.append(ASTNode(storage_class))
-        for child in function_specifiers:
-            self.children.append(ASTNode(ASTNode(child)))
+
+    # Children for Pretty-Printing (built on demand)
+    def display_children(self):
+        display = self.children + [ASTNode(qualifier) for qualifier in self.qualifier_set]
+        if self.storage_class:
+            display.append(ASTNode(self.storage_class))
+        return display + [ASTNode(specifier) for specifier in self.func_specifier_set]
 
 ########################################################################################################################
 # POINTER LEVEL
 
 class PtrLevel(ASTNode):
+    __slots__ = ("scope_qualifier_path", "type_qualifier_list")
+
     def __init__(self,
                  scope_qualifiers: list[str] | None = None ,
                  type_qualifiers : list[str] | None = None ):
@@ -210,6 +217,8 @@ class PtrLevel(ASTNode):
 InitElem = Union["Initializer", "Expr"]
 
 class Initializer(ASTNode):
+    __slots__ = ("init_list",)
+
     def __init__(self, elements: list[InitElem] | None = None):
         super().__init__(node_name="initializer")
         self.init_list = elements or []
@@ -223,6 +232,8 @@ class Initializer(ASTNode):
 SuffixElem = Union["FuncSuffix", "ArraySuffix"]
 
 class NormalDeclarator(ASTNode):
+    __slots__ = ("ptr_chain", "reference", "decl_name", "suffixes", "initializer")
+
     def __init__(self,
                  ptr_chain:list[PtrLevel] | None = None,
                  reference_type=None,
@@ -262,6 +273,8 @@ class NormalDeclarator(ASTNode):
 # PARAMETER
 
 class Parameter(ASTNode):
+    __slots__ = ("param_declaration", "default_argument")
+
     def __init__(self, normalized_declaration:NormalDeclaration, default_arg:Initializer=None):
         super().__init__(node_name="parameter")
         # Normalized Parameter Attributes
@@ -276,6 +289,8 @@ class Parameter(ASTNode):
 
 # Inheritor Statements
 class ExprStatement(Statement):
+    __slots__ = ("expr",)
+
     def __init__(self, expression:Expr):
         super().__init__(statement_type="expr_statement")
         self.expr = expression
@@ -284,6 +299,8 @@ class ExprStatement(Statement):
         self.children.append(expression)
 
 class IfStatement(Statement):
+    __slots__ = ("if_condition", "then_branch", "else_branch")
+
     def __init__(self, condition:Expr, then_branch:Statement, else_branch:Statement=None):
         super().__init__(statement_type=colors.red("if_statement"))
 
@@ -298,6 +315,8 @@ class IfStatement(Statement):
             self.children.append(else_branch)
 
 class ReturnStatement(Statement):
+    __slots__ = ("return_value",)
+
     def __init__(self, return_value:Expr=None):
 
         super().__init__(statement_type=f"\x1b[38;2;255;76;76mreturn_statement\x1b[0m")
@@ -310,6 +329,8 @@ class ReturnStatement(Statement):
             self.children.append(return_value)
 
 class DeclarationStatement(Statement):
+    __slots__ = ("declaration",)
+
     def __init__(self, declaration:NormalDeclaration):
 
         super().__init__(statement_type=colors.pink("declaration_statement"))
@@ -327,17 +348,23 @@ class DeclarationStatement(Statement):
 
 # COMPOUND BODY: Function/ If / While
 class CompoundBody(Body[Statement]):
+    __slots__ = ()
+
     def __init__(self, stmt_list:list[Statement] | None = None):
         super().__init__(body_type="compound_body", members=stmt_list)
         # member_list: list[Statement]
 
 # CLASS BODY: Class / Struct / Union
 class ClassBody(Body[Union[NormalDeclaration, "AccessSpecifier"]]):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(body_type="class_body")
 
 # ENUM BODY: Enum (Scoped or Unscoped)
 class EnumBody(Body["Enumerator"]):
+    __slots__ = ()
+
     def __init__(self, scoped:bool=False):
         super().__init__(body_type="enum_body")
 
@@ -346,6 +373,8 @@ class EnumBody(Body["Enumerator"]):
 
 ########################################################################################################################
 class Enumerator(ASTNode):
+    __slots__ = ("identifier", "initial_expr")
+
     def __init__(self, identifier_name: str, initial_expr: ConstantExpr | None=None):
         super().__init__(node_name=colors.pink("self.identifier"))
         self.identifier   = identifier_name
@@ -354,6 +383,8 @@ class Enumerator(ASTNode):
 
 from compiler.utils.enum_types import AccessType
 class AccessSpecifier(ASTNode):
+    __slots__ = ("type",)
+
     def __init__(self, access_type:AccessType):
         super().__init__(node_name="access_specifier")
         self.type = access_type
@@ -365,48 +396,56 @@ class AccessSpecifier(ASTNode):
 # v ISO C++ COMPLIANT v
 ########################################################################################################################
 class Literal(ASTNode):
+    __slots__     = ("literal_kind", "literal_value")
+    default_color = colors.grey
+
     def __init__(self, kind: LiteralKind, value):
         super().__init__(node_name=kind.lower()+"_literal: "+str(value))
         self.literal_kind  = kind
         self.literal_value = value
 
-        # Pretty Printing
-        self.ansi_color = colors.grey
-
 ########################################################################################################################
 class Keyword(ASTNode):
+    __slots__     = ("lexeme",)
+    default_color = colors.grey
+
     def __init__(self, keyword: str):
         super().__init__(node_name="keyword: " + keyword)
         self.lexeme = keyword
-        self.ansi_color = colors.grey
 
 ########################################################################################################################
 class Operator(ASTNode):
+    __slots__     = ("op_string",)
+    default_color = colors.grey
+
     def __init__(self, lexeme: str):
         super().__init__(node_name="operator: " + lexeme)
         self.op_string = lexeme
-        self.ansi_color = colors.grey
 
 ########################################################################################################################
 class Identifier(ASTNode):
+    __slots__     = ("id_name", "symbol_id", "intention")
+    default_color = colors.grey
+
     def __init__(self, id_name: str, intent: IdentifierIntention | None = IdentifierIntention.UNRESOLVED):
         super().__init__(node_name="identifier: " + id_name)
         self.id_name = id_name
         self.symbol_id: int | None = None
-        self.ansi_color = colors.grey
         self.intention = intent
 
-        # Pretty Printing
-        self.children.append(ASTNode(self.intention.name, None, colors.grey))
-
     def update_intent(self, new_intent: IdentifierIntention):
         self.intention = new_intent
-        self.children[0].name = new_intent.name
+
+    # Children for Pretty-Printing (built on demand)
+    def display_children(self):
+        return [ASTNode(self.intention.name, None, colors.grey)] + self.children
 
 ########################################################################################################################
 # AMBIGUOUS IDENTIFIER
 
 class AmbigIdentifer(Identifier):
+    __slots__     = ()
+    default_color = colors.red
 
     """ During semantic analysis this identifier will check for its own resolution condition. If the
         resolution condition is met, then this ambiguous branch will become the true branch, else it
@@ -417,11 +456,11 @@ class AmbigIdentifer(Identifier):
         self.name = "ambig_identifier: " + identifer.id_name
         # INTENT <- Resolution Condition
 
-        self.ansi_color = colors.red # Pretty Printing
-
 ########################################################################################################################
 
 class NormalizedType(ASTNode):
+    __slots__ = ("core", "modifiers", "attrs")
+
     def __init__(self):
         super().__init__(node_name="normalized_type")
 
@@ -436,12 +475,14 @@ class NormalizedType(ASTNode):
 
 class ListNode(ASTNode, Generic[MemberT]):
     """ Generic list templated with any any built-in type. """
+    __slots__     = ("member_list",)
+    default_color = colors.purple
+
     def __init__(self, list_name:str, members:list[MemberT] | None=None):
         super().__init__(node_name=
                          f"{list_name}_list: {', '.join(str(i) for i in members)}")
 
         self.member_list = members or []  # List of members, may be empty
-        self.ansi_color = colors.purple
 
     def add_member(self, new_member:MemberT):
         self.member_list.append(new_member)
@@ -454,6 +495,8 @@ class ListNode(ASTNode, Generic[MemberT]):
 # CORE
 class TypeCore(ASTNode):
     """ Abstract base for NormalizedType cores. These are all abstracted derivations of type_specifier_seq. """
+    __slots__ = ()
+
     def __init__(self, node_name:str):
         super().__init__(node_name=node_name)
         pass
@@ -462,6 +505,9 @@ class TypeCore(ASTNode):
 
 # BuiltInType   # int;                  <- simple_type_specifier
 class BuiltInType(TypeCore):
+    __slots__     = ("base_type", "size", "signed")
+    default_color = colors.green
+
     def __init__(self,
                  base_type:FundamentalTypes,
                  size:int,
@@ -475,9 +521,6 @@ class BuiltInType(TypeCore):
         # Used for upwards synthesize
         # self.type_string: ListNode[str] = ListNode[str]("type_string")
 
-        # Add Color for Pretty-Printing
-        self.ansi_color = colors.green
-
     #     # Add Children for Pretty-Printing
     #     self.init_children()
     #
@@ -501,17 +544,21 @@ class BuiltInType(TypeCore):
 #
 ########################################################################################################################
 class Modifiers(ASTNode):
-    pass
+    __slots__ = ()
 
 class Suffix(ASTNode):
+    __slots__     = ()
+    default_color = colors.purple
+
     def __init__(self, suffix_type:str):
         super().__init__(node_name=suffix_type+"_suffix")
-        self.ansi_color = colors.purple
 
 ########################################################################################################################
 # ARRAY SUFFIX
 
 class ArraySuffix(Suffix, Modifiers):
+    __slots__ = ()
+
     def __init__(self, bound: ConstantExpr | None = None):
         super().__init__(suffix_type="array")
         self.array_bound: bound
@@ -523,11 +570,13 @@ class ArraySuffix(Suffix, Modifiers):
 # FUNCTION SUFFIX
 
 class FunctionSuffix(Suffix, Modifiers):
+    __slots__     = ("parameters", "cv_list")
+    default_color = colors.green
+
     def __init__(self, parameter_list:ASTNode | None = None):
         super().__init__(suffix_type="function")
         self.parameters = parameter_list
         self.cv_list    = None
-        self.ansi_color = colors.green
 
         if parameter_list:
             self.children.append(parameter_list)
@@ -543,14 +592,18 @@ class FunctionSuffix(Suffix, Modifiers):
 # BASE EXPRESSION
 
 class Expr(ASTNode):
+    __slots__     = ("expr_type",)
+    default_color = colors.orange
+
     def __init__(self, expr_type:str):
         super().__init__(node_name=expr_type+"_expression")  # default: orange
         self.expr_type = expr_type
-        self.ansi_color = colors.orange
 ########################################################################################################################
 
 class ConstantExpr(Expr):
     """ MUST BE CONSTANT - will be checked at semantic analysis """
+    __slots__ = ("expr",)
+
     def __init__(self, expression: ASTNode):
         super().__init__(expr_type="constant")
         self.expr = expression
@@ -569,6 +622,8 @@ class ConstantExpr(Expr):
 # POSTFIX Expression
 
 class PostfixExpr(Expr):
+    __slots__ = ("base", "op_list", "op_list_node")
+
     def __init__(self, base: ASTNode, op_list: list[ExprOp] | None = None):
         """ Contains:
                 Postfix Expressions
@@ -593,37 +648,53 @@ class ExprOp(ASTNode):
     """ Unary Operation, to be performed on some base.
         use-case: Postfix Expressions, Prefix/Unary Expressions
     """
+    __slots__     = ()
+    default_color = colors.gold
+
     def __init__(self, op_name:str = "Unresolved"):
         super().__init__(node_name="expr_op: "+op_name)
-        self.ansi_color = colors.gold
 
 class Index(ExprOp):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(op_name="index")
 
 class Member(ExprOp):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(op_name="member")
 
 class Call(ExprOp):
+    __slots__ = ("args",)
+
     def __init__(self, args: list[ASTNode]):
         super().__init__(op_name="call") # [Function Call] or [Function Ptr Call]
         self.args = args
         self.children = self.args
 
 class CallOrConstruct(ExprOp):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(op_name="call_or_construct")
 
 class PsuedoDtor(ExprOp):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(op_name="psuedo_destructor")
 
 class PostInc(ExprOp):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(op_name="post_increment")
 
 class PostDec(ExprOp):
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(op_name="post_decrement")
 
@@ -631,6 +702,8 @@ class PostDec(ExprOp):
 # UNARY
 
 class UnaryExpr(Expr):
+    __slots__ = ("subject", "operation")
+
     def __init__(self, subject: ASTNode, operation: ASTNode):
         """ Contains:
                 Unary Expressions
@@ -648,6 +721,8 @@ class UnaryExpr(Expr):
 # CAST
 
 class CastExpr(Expr):
+    __slots__ = ("cast_type", "subject")
+
     def __init__(self, cast_type: ASTNode, subject: ASTNode):
         """ Contains:
                 C Style Cast   <- ambiguous_cast
@@ -666,6 +741,8 @@ class CastExpr(Expr):
 # MEMBER ACCESS
 
 class MemberAccess(Expr):
+    __slots__ = ("source", "operator", "target")
+
     def __init__(self, source: ASTNode, access_type: Operator, target: ASTNode):
         """ Contains:
                 pm_expression
@@ -689,6 +766,8 @@ class BinaryExpr(Expr):
             Comparative Expressions (relational, equality)
             Bitwise Expressions (shift, relational, equality)
     """
+    __slots__ = ("left_operand", "right_operand", "operator")
+
     def __init__(self, left: ASTNode, operator: Operator , right: ASTNode):
         super().__init__(expr_type="binary")
         self.left_operand  = left
@@ -705,6 +784,8 @@ class BinaryExpr(Expr):
 # LOGICAL EXPRESSION
 
 class LogicExpr(Expr):
+    __slots__ = ("left_operand", "right_operand", "operator")
+
     def __init__(self, left: ASTNode, operator: Operator , right: ASTNode):
         """ Contains:
                 Logical And Expressions (&&)
@@ -725,6 +806,8 @@ class LogicExpr(Expr):
 # CONDITIONAL EXPRESSION
 
 class ConditionalExpr(Expr):
+    __slots__ = ("if_cond", "then_case", "else_case")
+
     def __init__(self, if_cond: ASTNode, then_case: ASTNode , else_case: ASTNode):
         """ Contains:
                 conditional_expressions ( if ? then : else ;)
@@ -743,6 +826,8 @@ class ConditionalExpr(Expr):
 ########################################################################################################################
 # Assignment Expressions
 class AssignExpr(Expr):
+    __slots__ = ("left_operand", "right_operand", "operator")
+
     def __init__(self, left: ASTNode, right: ASTNode, operator: Operator):
         super().__init__(expr_type="assign")
         self.left_operand  = left
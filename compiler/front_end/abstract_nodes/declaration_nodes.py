@@ -32,6 +32,8 @@ from compiler.utils.colors import colors
 ##########################################################################################
 # Base Declaration Type: 1st Generation
 class Declaration(ASTNode):
+    __slots__ = ("decl_specs",)
+
     def __init__(self, declaration_specs: DeclSpec, declaration_type: str = "declaration"):
         super().__init__(node_name=declaration_type)
         self.decl_specs = declaration_specs
@@ -41,6 +43,8 @@ class Declaration(ASTNode):
 # Symbol/Identifier Families: Second Generation
 
 class BoundDeclaration(Declaration):
+    __slots__ = ("identifier", "symbol")
+
     def __init__(self,
                  decl_specs: DeclSpec,
                  identifier_name: str,
@@ -51,14 +55,18 @@ class BoundDeclaration(Declaration):
 
 
 class AnonDeclaration(Declaration):
+    __slots__ = ()
+
     def __init__(self, decl_specs: DeclSpec, decl_type: str = "anonymous_declaration"):
-        super().__init__(declaration_specs=decl_specs, decl_type=)
+        super().__init__(declaration_specs=decl_specs, declaration_type=decl_type)
 
 
 ##########################################################################################
 # Bounded Children: Second Generation
 
 class VariableDeclaration(BoundDeclaration):
+    __slots__ = ("type_specs", "storage_class", "initializer")
+
     def __init__(self, specs: DeclSpec, identifier: str, sub_type: str = "variable_declaration"):
         super().__init__(decl_specs=specs, identifier_name=identifier, decl_type=sub_type)
         self.type_specs = None
@@ -67,6 +75,8 @@ class VariableDeclaration(BoundDeclaration):
 
 
 class FunctionDeclaration(BoundDeclaration):
+    __slots__ = ()
+
     def __init__(self, specs: DeclSpec, identifier: str):
         super().__init__(decl_specs=specs, identifier_name=identifier, decl_type="")
         # return_type
@@ -77,6 +87,8 @@ class FunctionDeclaration(BoundDeclaration):
 
 
 class NamespaceDeclaration(BoundDeclaration):
+    __slots__ = ()
+
     def __init__(self, specs: DeclSpec, identifier: str):
         super().__init__(decl_specs=specs, identifier_name=identifier, decl_type="")
         # name
@@ -90,18 +102,24 @@ class NamespaceDeclaration(BoundDeclaration):
 # Variable Subtypes: Fourth Generation
 
 class ParameterDeclaration(VariableDeclaration):
+    __slots__ = ("is_variadic",)
+
     def __init__(self, specs: DeclSpec, identifier: str):
         super().__init__(specs=specs, identifier=identifier, sub_type="")
         self.is_variadic: bool = False
 
 
 class EnumeratorDeclaration(VariableDeclaration):
+    __slots__ = ("is_variadic",)
+
     def __init__(self, specs: DeclSpec, identifier: str):
         super().__init__(specs=specs, identifier=identifier, sub_type="")
         self.is_variadic: bool = False
 ##########################################################################################
 # 3rd Generation Base
 class TypeDeclaration(BoundDeclaration):
+    __slots__ = ("body", "can_have_body")
+
     def __init__(self, specs: DeclSpec, identifier: str):
         super().__init__(decl_specs=specs, identifier_name=identifier, decl_type="")
         self.body: Body | None = None
@@ -109,17 +127,23 @@ class TypeDeclaration(BoundDeclaration):
 
 # 4th Generation Subtypes
 class TypeDefinition(TypeDeclaration):
+    __slots__ = ("aliased_type",)
+
     def __init__(self):
         super().__init__()
         self.aliased_type: SimpleType | ElaborateType
 
 class ClassDeclaration(TypeDeclaration):
+    __slots__ = ("class_type", "class_body")
+
     def __init__(self, body: ClassBody):
         super().__init__()
         self.class_type = None
         self.class_body = body
 
 class EnumDeclaration(TypeDeclaration):
+    __slots__ = ("enum_body", "is_scoped", "underlying_type")
+
     def __init__(self, body: EnumBody):
         super().__init__()
         self.enum_body = body
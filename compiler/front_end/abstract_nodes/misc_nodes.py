@@ -7,10 +7,12 @@ from compiler.utils.colors import colors
 # ERRORS
 
 class Error(ASTNode):
+    __slots__     = ("message",)
+    default_color = colors.red.underline.bold
+
     def __init__(self, error_type, child_list: list[ASTNode] | None = None):
         super().__init__(node_name="ERROR: " + error_type, children=child_list)
         self.message = ""
-        self.ansi_color = colors.red.underline.bold
 ########################################################################################################################
 #
 
@@ -0,0 +1,68 @@
+# traversal.py
+
+from __future__ import annotations
+
+from typing import Callable, Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from compiler.front_end.abstract_nodes.ast_node import ASTNode
+
+########################################################################################################################
+# Explicit-stack traversals: tree depth is bounded by memory, not by the interpreter's recursion limit.
+# (a + b + c + ... parses into a left-deep chain, one level per term)
+
+class _Skip:
+    def __repr__(self):
+        return "SKIP"
+
+SKIP   = _Skip()  # Returned by an enter / pre-order hook: the node's children are not visited
+_LEAVE = object()  # Stack marker: the node below it is due for leave()
+
+def traverse(root: ASTNode,
+             enter: Callable[[ASTNode], object] | None = None,
+             leave: Callable[[ASTNode], object] | None = None) -> None:
+    """ Depth-first walk, children left to right.
+            enter(node): before the node's children; returning SKIP prunes them.
+            leave(node): after the node's children (also called for pruned nodes).
+        Children are read when their parent is expanded, so enter() may still edit node.children.
+    """
+    stack: list = [root]
+    push, pop, extend = stack.append, stack.pop, stack.extend
+
+    while stack:
+        node = pop()
+
+        # Post-order: '_LEAVE' sits on top of the node it closes
+        if node is _LEAVE:
+            leave(pop())
+            continue
+
+        # Pre-order
+        if enter is not None and enter(node) is SKIP:
+            if leave is not None:
+                leave(node)
+            continue
+
+        children = node.children
+        if not children:
+            if leave is not None:
+                leave(node)
+            continue
+
+        if leave is not None:
+            push(node)
+            push(_LEAVE)
+        extend(reversed(children))
+
+def iter_preorder(root: ASTNode, display: bool = False) -> Iterator[tuple[ASTNode, int]]:
+    """ Yields (node, depth) in pre-order; the root has depth 0.
+        display: follow display_children() (pretty-printing) instead of children.
+    """
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        yield node, depth
+
+        children = node.display_children() if display else node.children
+        for index in range(len(children) - 1, -1, -1):
+            stack.append((children[index], depth + 1))
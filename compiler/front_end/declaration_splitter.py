@@ -0,0 +1,109 @@
+# declaration_splitter.py
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+########################################################################################################################
+# DECLARATION CHUNK
+
+@dataclass
+class DeclarationChunk:
+    text : str  # Source text of one top-level declaration
+    start: int  # Offset of text within the translation unit
+    end  : int
+
+########################################################################################################################
+# SCANNER
+# Only what is needed to track nesting: literals & comments are matched whole so their braces / semicolons don't count.
+
+_SCANNER = re.compile(r"""
+      (?P<skip>    \s+ | //[^\n]* | /\*.*?\*/ )
+    | (?P<literal> "(?:\\.|[^"\\\n])*" | '(?:\\.|[^'\\\n])*' )
+    | (?P<word>    [A-Za-z_][A-Za-z0-9_]* )
+    | (?P<punct>   -> | [(){}\[\];=] )
+    | (?P<other>   . )
+""", re.VERBOSE | re.DOTALL)
+
+_OPENERS  = {"(": ")", "[": "]", "{": "}"}
+_CLOSERS  = {")", "]", "}"}
+_TAG_KEYS = {"class", "struct", "union", "enum"}
+
+# Words that may directly precede a function body: 'int f() const {', 'int f() try {'
+_BODY_KEYS = {"const", "volatile", "noexcept", "override", "final", "try", "namespace"}
+
+########################################################################################################################
+
+def split_declarations(code: str) -> list[DeclarationChunk]:
+    """ Cuts a preprocessed translation unit at top-level declaration boundaries.
+
+        A declaration ends at a ';' outside any bracket, or at the '}' closing a function / namespace / linkage body.
+        Braces of initializers ('= {..}', 'x{1}') and tag bodies ('struct S {..} s') continue until the trailing ';'.
+    """
+    chunks: list[DeclarationChunk] = []
+
+    depth      = 0      # Combined (), [], {} nesting
+    start      = None   # Offset of the current declaration's first token
+    brace_tail = False  # Current top-level brace must be followed by ';'
+    saw_equal  = False  # '=' seen at depth 0 in this declaration
+    saw_tag    = False  # class-key seen at depth 0, not (yet) followed by '('
+    saw_space  = False  # 'namespace' seen at depth 0
+    saw_arrow  = False  # '->' seen at depth 0: trailing return type, 'auto f() -> int {' opens a body
+    prev       = ""     # Previous significant token
+
+    for match in _SCANNER.finditer(code):
+        kind = match.lastgroup
+        if kind == "skip":
+            continue
+
+        token, prev_token = match.group(), prev
+        prev = token
+        if start is None:
+            start = match.start()
+
+        if kind == "word":
+            if depth == 0 and token in _TAG_KEYS:
+                saw_tag = True
+            elif depth == 0 and token == "namespace":
+                saw_space = True
+            continue
+
+        if kind != "punct":
+            continue
+
+        # Top-Level Structure
+        if depth == 0:
+            if token == ";":
+                chunks.append(DeclarationChunk(code[start:match.end()], start, match.end()))
+                start, brace_tail, saw_equal, saw_tag, saw_space, saw_arrow = None, False, False, False, False, False
+                continue
+            if token == "=":
+                saw_equal = True
+            elif token == "->":
+                saw_arrow = True
+            elif token == "(":
+                saw_tag = False # 'struct S f()' declares a function
+            elif token == "{":
+                brace_init = prev_token == "]" or (_is_word(prev_token) and prev_token not in _BODY_KEYS)
+                brace_tail = saw_equal or saw_tag or (brace_init and not saw_space and not saw_arrow)
+
+        # Nesting
+        if token in _OPENERS:
+            depth += 1
+        elif token in _CLOSERS:
+            depth = max(depth - 1, 0)
+
+            # Body Closed: declaration ends here unless a ';' must follow
+            if depth == 0 and token == "}" and not brace_tail:
+                chunks.append(DeclarationChunk(code[start:match.end()], start, match.end()))
+                start, brace_tail, saw_equal, saw_tag, saw_space, saw_arrow = None, False, False, False, False, False
+
+    # Unterminated Tail: handed to the parser as-is so the syntax error surfaces there
+    if start is not None:
+        chunks.append(DeclarationChunk(code[start:], start, len(code)))
+
+    return chunks
+
+def _is_word(token: str) -> bool:
+    return token[:1].isalpha() or token[:1] == "_"
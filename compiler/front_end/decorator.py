@@ -2,11 +2,21 @@
 
 from compiler.front_end.abstract_nodes.ast_node import *
 from compiler.context import CompilerContext
-import re
+from compiler.utils.instrumentation import phase
+import sys
+import time
 
 ########################################################################################################################
 
 class Decorator:
+    # kind -> (pre, visit, post) functions; built once per subclass by __init_subclass__()
+    _dispatch: dict[str, tuple] = {}
+    _default : tuple            = (None, None, None)
+
+    # PassManager Scheduling
+    requires: tuple[type["Decorator"], ...] = () # Passes that must complete a full walk before this one starts
+    fusable : bool                          = True # May share one tree walk with neighbouring passes
+
     def __init__(self, root_node: ASTNode, context: CompilerContext, traversal_order:str="post"):
 
         """ General parent class which mimics Lark transform class.
@@ -17,64 +27,226 @@ class Decorator:
         self.context = context   # ErrorTable, SymbolTable, ScopeStack
         self.order   = traversal_order
 
-    def walk(self) -> None:
-        """ Initiates recursive walk. """
+    def __init_subclass__(cls, **kwargs):
+        """ Builds the dispatch table: 'x', 'x_pre' & 'x_post' methods are grouped under node kind 'x'. """
+        super().__init_subclass__(**kwargs)
 
-        # Traverse List
-        self._dfs(self.root)
+        table: dict[str, list] = {}
+        for attr_name in dir(cls):
+            if attr_name.startswith("_") or attr_name in _DECORATOR_API:
+                continue
+            method = getattr(cls, attr_name)
+            if not callable(method):
+                continue
 
-    def _dfs(self, node: ASTNode):
-        """Traverse the AST with optional pre- or post-order mutation."""
+            if attr_name.endswith("_pre"):
+                table.setdefault(sys.intern(attr_name[:-4]), [None, None, None])[0] = method
+            elif attr_name.endswith("_post"):
+                table.setdefault(sys.intern(attr_name[:-5]), [None, None, None])[2] = method
+            else:
+                table.setdefault(sys.intern(attr_name), [None, None, None])[1] = method
 
-        # String Pre-processing
-        call_sign = re.split(r'[\s:]', node.name, 1)[0] # cuts off ws & ':'
+        cls._dispatch = {kind: tuple(entry) for kind, entry in table.items()}
 
-        # Base Methods
-        method = getattr(self, call_sign, None)
+        # Fall-back to 'Default' Method (only when a kind has none of visit / pre / post)
+        default = getattr(cls, "__default__", None)
+        cls._default = (None, default, None)
 
-        # Pre/Post Specific Methods
-        pre_method = getattr(self, f"{call_sign}_pre", None)
-        post_method = getattr(self, f"{call_sign}_post", None)
+    def walk(self) -> None:
+        """ Initiates recursive walk. """
+        self._prepare()
 
-        # Fall-back to 'Default' Method
-        if method is None and pre_method is None and post_method is None:
-            method = getattr(self, "__default__", None)
+        # Traverse List
+        self._dfs(self.root)
 
-        # Pre-order
-        if self.order in ("pre", "both"):
-            if callable(pre_method):
-                pre_method(node, node.children)
-            if callable(method):
-                method(node, node.children)
+    def _prepare(self):
+        """ Binds the dispatch table to this pass; run once before walking (alone, or fused by PassManager). """
+        self._visitors = {kind: self._bind(entry) for kind, entry in self._dispatch.items()}
+        self._fallback = self._bind(self._default)
+        self._pre      = self.order in ("pre", "both")
+        self._post     = self.order in ("post", "both")
 
-        # Recursive walk
-        for child in node.children:
-            self._dfs(child)
+    def _bind(self, entry: tuple) -> tuple:
+        return tuple(None if function is None else function.__get__(self) for function in entry)
 
-        # Post-order
-        if self.order in ("post", "both"):
-            if callable(method):
+    def _dfs(self, root: ASTNode):
+        """ Traverse the AST with optional pre- or post-order mutation (explicit stack, no recursion limit).
+            A pre-order hook returning SKIP prunes the node's children; its post-order hooks still run.
+        """
+        visitors, fallback = self._visitors, self._fallback
+
+        def enter(node: ASTNode):
+            pre_method, method, _ = visitors.get(node.kind, fallback)
+            skip = None
+            if pre_method is not None:
+                skip = pre_method(node, node.children)
+            if method is not None and method(node, node.children) is SKIP:
+                skip = SKIP
+            return skip
+
+        def leave(node: ASTNode):
+            _, method, post_method = visitors.get(node.kind, fallback)
+            if method is not None:
                 method(node, node.children)
-            if callable(post_method):
+            if post_method is not None:
                 post_method(node, node.children)
 
+        traverse(root, enter=enter if self._pre else None, leave=leave if self._post else None)
+
+# Decorator's own interface: never a visitor
+_DECORATOR_API = {"walk", "requires", "fusable"}
+
+########################################################################################################################
+#  PASS MANAGER  #
+##################
+
+class PassManager:
+    """ Runs decoration passes in dependency order, fusing compatible neighbours into a single tree walk.
+        At each node, the hooks of every pass in a fused group run in pass order (pre-order on the way down,
+        post-order on the way up). A pass starts a new walk if it, or the group so far, is not fusable, or if it
+        requires a pass of the current group: that pass's results are only complete once its walk has finished.
+    """
+
+    def __init__(self, root: ASTNode, context: CompilerContext, passes: list[type[Decorator]]):
+        self.root    = root
+        self.context = context
+        self.passes  = self.schedule(passes)   # Dependency ordered, requirements included
+        self.groups  = self.fuse(self.passes)  # One tree walk per group
+
+        # Timings (seconds): time spent in each pass's hooks, and per walk (hooks + traversal)
+        self.timings     : dict[str, float] = {}
+        self.walk_timings: list[float]      = []
+
+    ####################################################################################################################
+    @staticmethod
+    def schedule(passes: list[type[Decorator]]) -> list[type[Decorator]]:
+        """ Stable topological order; required passes that were not listed are added before their first user. """
+        ordered : list[type[Decorator]] = []
+        visiting: set[type[Decorator]]  = set()
+
+        def visit(pass_type: type[Decorator]):
+            if pass_type in ordered:
+                return
+            if pass_type in visiting:
+                raise ValueError(f"Pass dependency cycle through {pass_type.__name__}")
+            visiting.add(pass_type)
+            for required in pass_type.requires:
+                visit(required)
+            visiting.discard(pass_type)
+            ordered.append(pass_type)
+
+        for pass_type in passes:
+            visit(pass_type)
+        return ordered
+
+    @staticmethod
+    def fuse(passes: list[type[Decorator]]) -> list[list[type[Decorator]]]:
+        groups: list[list[type[Decorator]]] = []
+        for pass_type in passes:
+            group = groups[-1] if groups else None
+            if (group and pass_type.fusable and all(member.fusable for member in group)
+                    and not any(required in group for required in pass_type.requires)):
+                group.append(pass_type)
+            else:
+                groups.append([pass_type])
+        return groups
+
+    ####################################################################################################################
+    def run(self):
+        with phase("decorate", passes=sum(map(len, self.groups)), walks=len(self.groups)):
+            for group in self.groups:
+                passes = [pass_type(self.root, self.context) for pass_type in group]
+
+                start = time.perf_counter()
+                self._fused_walk(passes)
+                self.walk_timings.append(time.perf_counter() - start)
+
+    def report(self) -> str:
+        lines = [f"pass {name}: {seconds * 1000:.2f} ms" for name, seconds in self.timings.items()]
+        lines.append(f"{len(self.walk_timings)} walk(s): {sum(self.walk_timings) * 1000:.2f} ms")
+        return "\n".join(lines)
+
+    def _fused_walk(self, passes: list[Decorator]):
+        for decoration_pass in passes:
+            decoration_pass._prepare()
+
+        clock       = time.perf_counter
+        hook_time   = [0.0] * len(passes)
+        pruned_at   = [None] * len(passes) # Node whose subtree the pass pruned with SKIP (pass idle below it)
+        pre_passes  = [i for i, decoration_pass in enumerate(passes) if decoration_pass._pre]
+        post_passes = [i for i, decoration_pass in enumerate(passes) if decoration_pass._post]
+
+        def enter(node: ASTNode):
+            for i in pre_passes:
+                if pruned_at[i] is not None:
+                    continue
+                decoration_pass = passes[i]
+                pre_method, method, _ = decoration_pass._visitors.get(node.kind, decoration_pass._fallback)
+                if pre_method is None and method is None:
+                    continue
+
+                start, skip = clock(), None
+                if pre_method is not None:
+                    skip = pre_method(node, node.children)
+                if method is not None and method(node, node.children) is SKIP:
+                    skip = SKIP
+                hook_time[i] += clock() - start
+
+                if skip is SKIP:
+                    pruned_at[i] = node
+
+            # Every pass pruned here: skip the subtree outright
+            if None not in pruned_at:
+                return SKIP
+
+        def leave(node: ASTNode):
+            for i in post_passes:
+                if pruned_at[i] is not None and pruned_at[i] is not node:
+                    continue
+                decoration_pass = passes[i]
+                _, method, post_method = decoration_pass._visitors.get(node.kind, decoration_pass._fallback)
+                if method is None and post_method is None:
+                    continue
+
+                start = clock()
+                if method is not None:
+                    method(node, node.children)
+                if post_method is not None:
+                    post_method(node, node.children)
+                hook_time[i] += clock() - start
+
+            # Pruned subtree closed: the pass resumes
+            for i, pruned in enumerate(pruned_at):
+                if pruned is node:
+                    pruned_at[i] = None
+
+        traverse(self.root, enter=enter, leave=leave)
+
+        for decoration_pass, seconds in zip(passes, hook_time):
+            name = type(decoration_pass).__name__
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+
 ##########################################################################################
 
 from compiler.front_end.semantic_analysis import *
 
 class ASTtoDAST:
+    # Decoration / semantic-analysis passes, scheduled & fused by PassManager
+    passes: list[type[Decorator]] = [SymbolCollector]
+
     def __init__(self, ast_root: ASTNode, context: CompilerContext):
         """ Decoration manager class which sequentially performs decoration/semantic-analysis passes. """
 
         self.root    = ast_root  # AST Root
         self.context = context   # ErrorTable, SymbolTable, ScopeStack
 
+        self.pass_manager: PassManager | None = None
+
         # # Initiate Decoration
         # self.decorate()
 
     def decorate(self):
-        # pass_0 =
-        pass_1 = SymbolCollector(self.root, self.context)
-        pass_1.walk()
+        self.pass_manager = PassManager(self.root, self.context, self.passes)
+        self.pass_manager.run()
 
 ##########################################################################################
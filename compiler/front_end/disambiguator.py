@@ -1,73 +1,185 @@
-from compiler.front_end.abstract_nodes.ast_node import ASTNode
-from compiler.front_end import abstract_nodes
-from compiler.front_end.decorator import Decorator
-from lark import Transformer, Token, Tree
-from compiler.utils.colors import colors
-
-class Disambiguator(Transformer):
-
-    def __default_token__(self, token: Token):
-        if token.type == "IDENTIFIER":
-            if token.value in keywords or token.value in operators:
-                dead_node = ASTNode("DeadBranch")
-                dead_node.ansi_color = colors.red
-                return dead_node
-        return token
-
-    def __default__(self, data, children, meta):
-        # Dead Node Travels Up Branch
-        for child in children:
-            if isinstance(child, ASTNode):
-                return child
-        return Tree(data, children)
-
-    def _ambig(self, children):
-        healthy = []
-        # Cut Dead Branches
-        for index, branch in enumerate(children):
-            if not isinstance(branch, ASTNode):
-                healthy.append(children[index])
-
-        # # Ambiguity Resolved
-        # if len(healthy) == 1:
-        #     return healthy[0]
-        # Ambiguity Remains
-        else:
-            return Tree("_ambig", healthy)
-
-keywords = {
-    # Control-flow
-    "if", "else", "switch", "case", "default", "for", "while", "do",
-    "break", "continue", "return", "goto", "try", "catch", "throw",
-
-    # Types & specifiers
-    "int", "float", "double", "char", "wchar_t", "char16_t", "char32_t",
-    "void", "bool", "auto", "signed", "unsigned", "short", "long",
-    "const", "constexpr", "consteval", "volatile", "static", "extern",
-    "mutable", "register", "restrict", "inline", "virtual", "explicit",
-    "noexcept", "final", "override", "thread local", "typename", "new",
-    "const_cast", "static_cast", "dynamic_cast", "reinterpret_cast",
-    "typeid",
-
-    # Declarations
-    "class", "struct", "union", "enum", "namespace", "template", "typedef",
-    "using", "friend", "public", "private", "protected", "static_assert",
-    "asm", "delete", "operator", "decltype", "this",
-
-    # Punctuation
-    "(", ")", "{", "}", "[", "]", ";", ",", ".",
-
-    # Miscellaneous / preprocessing
-    "#", "include", "define", "##",
-    "<:", ":>", "<%", "%>", "%:", "%:%:"
-}
-
-operators = {
-    # Operators (string forms only, not tokens like PLUS)
-    "+", "-", "*", "/", "%", "=", "...", "+=", "-=", "*=", "/=", "%=",
-    "<<=", ">>=", "&=", "|=", "^=",
-    "<", ">", "<=", ">=", "==", "!=", "&&", "||", "!", "&", "|", "~", "^",
-    "<<", ">>", "++", "--", "->", "->*", ".*", "?", "::", ":", "new[]",
-    "delete[]", "()", "[]", "sizeof", "alignof",
-}
+from compiler.front_end.lexer import RESERVED_WORDS, IDENTIFIER, TokenLexer
+from lark import Lark, Tree
+from lark.parse_tree_builder import ParseTreeBuilder
+from lark.parsers.earley_forest import ForestToParseTree, ForestVisitor, ForestSumVisitor, SymbolNode, TokenNode
 
+# Specifier sequences checked against ISO [dcl.spec]/3 (and its [dcl.type] counterpart for type_specifier_seq)
+SPECIFIER_SEQUENCES = ("decl_specifier_seq", "type_specifier_seq")
+
+# Kind of a decl_specifier / type_specifier: a type_name, another (non-cv) type specifier, a cv-qualifier, none of these
+NAMED, OTHER, CV, PLAIN = "named", "other", "cv", "plain"
+
+# Specifier rule -> the symbol whose kind it passes up (simple_type_specifier: NAMED if it expands to a type_name)
+_SPECIFIER_RULES = {"decl_specifier"         : "type_specifier",
+                    "type_specifier"         : "trailing_type_specifier",
+                    "trailing_type_specifier": "simple_type_specifier",
+                    "simple_type_specifier"  : "type_name"}
+
+class ForestDisambiguator:
+    """ Earley SPPF (ambiguity="forest") -> parse tree, materializing surviving derivations only: dead branches are cut
+        on the shared packed forest, so time & memory follow the forest size rather than the number of expanded trees.
+
+        A packed node (one derivation) is dead if it derives
+            - a reserved word as an IDENTIFIER (only the dynamic lexer produces these), or
+            - a specifier sequence with a type_name after another non-cv type specifier: ISO [dcl.spec]/3, the rule
+              the LALR tier's grammar encodes (int a; -> 'a' is the declarator, never a second type specifier);
+        a symbol node is dead if all of its derivations are. Dead derivations are never turned into trees. The trees
+        built match ambiguity="explicit" (same callbacks, _ambig where more than one derivation survives).
+    """
+
+    def __init__(self, parser: Lark, prune: bool = True, specifiers: bool = True):
+        options = parser.options
+        builder = ParseTreeBuilder(parser.rules, options.tree_class or Tree, options.propagate_positions,
+                                   ambiguous=True, maybe_placeholders=options.maybe_placeholders)
+        self.callbacks = builder.create_callback(options.transformer)
+
+        # As Lark's own expansion: priorities are only summed if the grammar sets any
+        self.prioritized = any(rule.options.priority for rule in parser.rules)
+
+        # TokenLexer never emits a reserved IDENTIFIER: only the specifier rule can cut its derivations.
+        # prune=False expands every derivation: the ambiguity a lexer leaves to disambiguation (benchmarks);
+        # specifiers=False: reserved words only, the cut the two-pass Disambiguator made (benchmarks)
+        self.reserved   = prune and not isinstance(getattr(parser.parser, "lexer", None), TokenLexer)
+        self.sequences  = frozenset(rule.expansion[0].name for rule in parser.rules if specifiers and prune
+                                    and rule.origin.name in SPECIFIER_SEQUENCES) # Lark's helper for each '(...)+'
+        self.prune      = self.reserved or bool(self.sequences)
+
+    def transform(self, forest: SymbolNode) -> Tree:
+        dead = _DeadDerivations.mark(forest, self.reserved, self.sequences) if self.prune else set()
+        if id(forest) in dead:
+            dead = set() # Nothing survives: keep every derivation, as parsed
+        return _ForestToTree(self.callbacks, ForestSumVisitor() if self.prioritized else None, dead).transform(forest)
+
+class _DeadDerivations(ForestVisitor):
+    """ One bottom-up walk of the forest, each node visited once: ids of dead symbol, intermediate & packed nodes.
+        On the way, the kind of every specifier node and, for the nodes of a specifier sequence, whether what they
+        derive holds a non-cv type specifier (None: only some of their derivations do, nothing is cut on it).
+    """
+
+    def __init__(self, reserved: bool, sequences: frozenset[str]):
+        super().__init__(single_visit=True)
+        self.dead: set[int] = set()
+        self.reserved  = reserved
+        self.sequences = sequences
+        self.kinds: dict[int, str]         = {} # Specifier symbol node -> NAMED / OTHER / CV / PLAIN (None: mixed)
+        self.typed: dict[int, bool | None] = {} # Sequence node -> holds a non-cv type specifier
+
+    @classmethod
+    def mark(cls, forest: SymbolNode, reserved: bool = True, sequences: frozenset[str] = frozenset()) -> set[int]:
+        visitor = cls(reserved, sequences)
+        visitor.visit(forest)
+        return visitor.dead
+
+    def visit_symbol_node_in(self, node):
+        return node.children
+
+    def visit_packed_node_in(self, node):
+        return node.children
+
+    def visit_symbol_node_out(self, node):
+        # Unvisited children (cycles) count as alive
+        live = [packed for packed in node.children if id(packed) not in self.dead]
+        if not live:
+            self.dead.add(id(node))
+            return
+
+        if self.sequences:
+            name  = node.s[0].origin.name if node.is_intermediate else node.s.name
+            table = self.typed if name in self.sequences else self.kinds if name in _SPECIFIER_RULES else None
+            if table is not None:
+                values = {table.get(id(packed)) for packed in live}
+                table[id(node)] = values.pop() if len(values) == 1 else None
+
+    def visit_packed_node_out(self, node):
+        for child in node.children:
+            if isinstance(child, TokenNode):
+                if self.reserved and child.token.type == IDENTIFIER and child.token.value in RESERVED_WORDS:
+                    self.dead.add(id(node))
+                    return
+            elif id(child) in self.dead:
+                self.dead.add(id(node))
+                return
+
+        if self.sequences:
+            name = node.rule.origin.name
+            if name in self.sequences:
+                self._sequence(node)
+            elif name in _SPECIFIER_RULES:
+                self.kinds[id(node)] = self._specifier_kind(node)
+
+    def _sequence(self, node):
+        """ One step of a left-recursive specifier sequence: [prefix] specifier [attribute_specifier]. """
+        typed = False
+        kind  = None
+        for child in node.children:
+            if isinstance(child, TokenNode):
+                continue
+            if id(child) in self.typed:
+                typed = self.typed[id(child)] # The prefix, or the intermediate node holding it
+            elif id(child) in self.kinds:
+                kind  = self.kinds[id(child)]
+
+        if kind == NAMED and typed is True:
+            self.dead.add(id(node)) # [dcl.spec]/3: a type_name after another type specifier is the declarator's
+            return
+        self.typed[id(node)] = True if kind in (NAMED, OTHER) else typed
+
+    def _specifier_kind(self, node) -> str | None:
+        """ Kind of one specifier derivation. """
+        name     = node.rule.origin.name
+        wraps    = _SPECIFIER_RULES[name]
+        expanded = [symbol.name for symbol in node.rule.expansion]
+        if name == "simple_type_specifier":
+            return NAMED if wraps in expanded else OTHER
+        if expanded == [wraps]:
+            return next((self.kinds.get(id(child)) for child in node.children if not isinstance(child, TokenNode)),
+                        None)
+        if expanded == ["cv_qualifier"]:
+            return CV
+        return PLAIN if name == "decl_specifier" else OTHER
+
+class _ForestToTree(ForestToParseTree):
+    """ Lark's explicit-ambiguity expansion, entering live derivations only. """
+
+    def __init__(self, callbacks: dict, prioritizer: ForestSumVisitor | None, dead: set[int]):
+        super().__init__(Tree, callbacks, prioritizer, resolve_ambiguity=False, use_cache=True)
+        self.dead = dead
+
+    def visit_symbol_node_in(self, node):
+        children = super().visit_symbol_node_in(node)
+        if children is None or not self.dead:
+            return children
+        return [packed for packed in children if id(packed) not in self.dead]
+
+########################################################################################################################
+# TREE SCANS (explicit stacks: CSTs nest deeper than the recursion limit)
+
+def count_ambiguities(tree: Tree) -> tuple[int, int]:
+    """ -> (_ambig nodes, alternatives under them): the size of what disambiguation has to settle. """
+    nodes = alternatives = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if node.data == "_ambig":
+            nodes        += 1
+            alternatives += len(node.children)
+        stack.extend(child for child in node.children if isinstance(child, Tree))
+    return nodes, alternatives
+
+def shared_subtrees(tree: Tree) -> set[int]:
+    """ -> ids of the subtrees reached from more than one parent. Earley expansions share them, always under an _ambig:
+        a derivation used by several alternatives is built once, and alternatives reuse the siblings they have in
+        common.
+    """
+    seen  : set[int] = set()
+    shared: set[int] = set()
+    stack = [tree]
+    while stack:
+        for child in stack.pop().children:
+            if isinstance(child, Tree):
+                if id(child) in seen:
+                    shared.add(id(child))
+                else:
+                    seen.add(id(child))
+                    stack.append(child)
+    return shared
@@ -0,0 +1,151 @@
+# grammar_cache.py
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import lark
+from lark import Lark
+
+########################################################################################################################
+# LOAD STATISTICS
+
+@dataclass
+class GrammarLoadStats:
+    source    : str          # "cache" | "build"
+    elapsed   : float        # Seconds spent producing the parser
+    cache_file: Path | None  # Pickle backing this parser (None if caching failed)
+
+    def __str__(self):
+        return f"grammar {self.source}: {self.elapsed * 1000:.1f} ms"
+
+########################################################################################################################
+# CACHE KEY
+
+def grammar_key(grammar: str, **options) -> str:
+    """ Content hash of the grammar text, the installed lark version and the Lark() options.
+        Any change to one of the three produces a new key, which invalidates the old pickle.
+    """
+    digest = hashlib.sha256()
+    digest.update(grammar.encode("utf-8"))
+    digest.update(lark.__version__.encode("utf-8"))
+    digest.update(repr(sorted(options.items())).encode("utf-8"))
+    return digest.hexdigest()
+
+########################################################################################################################
+# PARSER LOADING
+
+def load_parser(grammar_path: Path,
+                cache_dir: Path | None,
+                override_path: Path | None = None,
+                **options) -> tuple[Lark, GrammarLoadStats]:
+    """ Returns a Lark parser for grammar_path, loading the analysed grammar from cache_dir when possible.
+        LALR parsers go through Lark's own save() / load(); Earley has no serialised form, so the whole Lark object is
+        pickled instead.
+        override_path: optional grammar appended to grammar_path (e.g. %override rules).
+    """
+    start = time.perf_counter()
+
+    # Load Grammar File(s)
+    with open(grammar_path, "r", encoding="utf-8", errors="replace") as f:
+        grammar = f.read()
+    if override_path is not None:
+        with open(override_path, "r", encoding="utf-8", errors="replace") as f:
+            grammar += "\n" + f.read()
+
+    # No Cache Requested
+    if cache_dir is None:
+        parser = Lark(grammar, **options)
+        return parser, GrammarLoadStats("build", time.perf_counter() - start, None)
+
+    prefix     = f"{Path(grammar_path).stem}-{options.get('parser', 'earley')}-"
+    cache_file = Path(cache_dir) / f"{prefix}{grammar_key(grammar, **options)[:16]}.pickle"
+
+    # Cache Hit
+    native = options.get("parser") == "lalr"
+    parser = _read_cache(cache_file, native)
+    if parser is not None:
+        return parser, GrammarLoadStats("cache", time.perf_counter() - start, cache_file)
+
+    # Cache Miss: build, then persist for the next run
+    parser = Lark(grammar, **options)
+    if not _write_cache(parser, cache_file, native):
+        cache_file = None
+    else:
+        _prune_stale(cache_file, prefix)
+
+    return parser, GrammarLoadStats("build", time.perf_counter() - start, cache_file)
+
+########################################################################################################################
+# PICKLE HELPERS
+
+def _read_cache(cache_file: Path, native: bool) -> Lark | None:
+    try:
+        with open(cache_file, "rb") as f:
+            parser = Lark.load(f) if native else pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Corrupt / incompatible pickle: fall back to a rebuild
+        return None
+
+    if not isinstance(parser, Lark):
+        return None
+    if native:
+        return parser
+
+    # Re-attach the regex module detached in _write_cache()
+    for holder, attr in _regex_holders(parser):
+        setattr(holder, attr, re)
+    return parser
+
+def _write_cache(parser: Lark, cache_file: Path, native: bool) -> bool:
+    # Module objects cannot be pickled: detach every reference to the regex module while dumping
+    holders  = [] if native else _regex_holders(parser)
+    detached = [(holder, attr, getattr(holder, attr)) for holder, attr in holders]
+    for holder, attr, _ in detached:
+        setattr(holder, attr, None)
+    tmp_name = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            if native:
+                parser.save(f) # Plain pickling breaks LALR tables: actions are compared by identity (action is Shift)
+            else:
+                pickle.dump(parser, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_file) # Atomic: concurrent compiles never see a partial file
+        return True
+    except (OSError, TypeError, pickle.PicklingError):
+        if tmp_name and os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        return False
+    finally:
+        for holder, attr, module in detached:
+            setattr(holder, attr, module)
+
+def _regex_holders(parser: Lark) -> list[tuple[object, str]]:
+    """ (object, attribute) pairs referencing the regex module.
+        lexer_conf is shared by every parser component; the standalone lexer (lexer="basic") keeps its own copy.
+    """
+    holders = [(parser.lexer_conf, "re_module")]
+    lexer   = getattr(parser.parser, "lexer", None)
+    if lexer is not None and hasattr(lexer, "re"):
+        holders.append((lexer, "re"))
+    return holders
+
+def _prune_stale(cache_file: Path, prefix: str):
+    """ Removes pickles of previous grammar versions. """
+    for stale in cache_file.parent.glob(f"{prefix}*.pickle"):
+        if stale != cache_file:
+            try:
+                stale.unlink()
+            except OSError:
+                pass
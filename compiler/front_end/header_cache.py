@@ -0,0 +1,227 @@
+# header_cache.py
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+from lark import Tree
+
+from compiler import source_digest
+from compiler.front_end.abstract_nodes import ASTNode
+from compiler.front_end.declaration_splitter import split_declarations, DeclarationChunk
+from compiler.front_end.disambiguator import count_ambiguities
+from compiler.front_end.preprocessor import HeaderSegment
+from compiler.front_end.tiered_parser import TieredParser
+from compiler.front_end.transformer import CSTtoAST
+from compiler.front_end.abstract_nodes.traversal import iter_preorder
+from compiler.utils import instrumentation
+from compiler.utils.instrumentation import phase
+
+########################################################################################################################
+@dataclass
+class HeaderEntry:
+    """ A header's declarations, pickled: every load is a fresh AST copy (much cheaper than deepcopy). """
+    cst_blob: bytes # list[Tree]
+    ast_blob: bytes # list[ASTNode]
+
+@dataclass
+class HeaderCacheStats:
+    hits  : int = 0 # Headers spliced in from the cache
+    misses: int = 0 # Headers parsed this build
+    loaded: int = 0 # ... of the hits, read from disk
+
+    def __str__(self):
+        return f"header cache: {self.hits} hit(s) ({self.loaded} from disk), {self.misses} miss(es)"
+
+########################################################################################################################
+class HeaderCache:
+    """ Precompiled-header style front end: the declarations of each #include'd header are parsed & transformed once
+        per HeaderSegment.key (header contents + macro state), then spliced into every unit that includes it.
+        Entries live in memory and, given a cache_dir, on disk across runs.
+        Only the AST is cached per declaration; symbols are collected from it by the decoration passes as usual.
+    """
+
+    def __init__(self, parser: TieredParser, transformer: CSTtoAST | None = None,
+                 cache_dir: Path | None = None, grammar_paths: list[Path] = ()):
+        self.parser      = parser
+        self.transformer = transformer or CSTtoAST()
+        self.cache_dir   = Path(cache_dir) if cache_dir is not None else None
+
+        # Salt: a grammar or compiler source change invalidates the on-disk entries
+        digest = hashlib.sha256(source_digest().encode("utf-8"))
+        for path in grammar_paths:
+            digest.update(Path(path).read_bytes())
+        self.salt = digest.hexdigest()[:16]
+
+        self.entries: dict[str, HeaderEntry] = {}
+        self.csts   : dict[str, list[Tree]]  = {} # Decoded CSTs, shared: later passes only touch the AST
+        self.stats = HeaderCacheStats()
+
+    ####################################################################################################################
+    def build(self, code: str, segments: list[HeaderSegment]) -> tuple[Tree, ASTNode]:
+        """ Preprocessed unit + its header segments -> (CST, AST), as parser.parse() + transform(). """
+        csts, ast = self._build(code, segments, with_cst=True)
+        return self.parser.stitch(csts), ast
+
+    def build_ast(self, code: str, segments: list[HeaderSegment]) -> ASTNode:
+        """ build() without the CST: cached headers' CSTs are never decoded. """
+        return self._build(code, segments, with_cst=False)[1]
+
+    def _build(self, code: str, segments: list[HeaderSegment], with_cst: bool) -> tuple[list[Tree], ASTNode]:
+        self.stats = HeaderCacheStats()
+        chunks     = split_declarations(code)
+
+        # Group: chunks covered by a cacheable header segment, everything else parsed as usual
+        groups = self._group(chunks, segments)
+
+        entries: list[HeaderEntry | None] = []
+        pending: list[DeclarationChunk] = []   # Chunks to parse, in one parse_chunks() call
+        keep   : list[bool] = []               # Per pending chunk: its CSTs are returned or stored with a header entry
+        for segment, group_chunks in groups:
+            entry = self._lookup(segment.key) if segment is not None else None
+            if entry is None:
+                pending.extend(group_chunks)
+                keep.extend([with_cst or segment is not None] * len(group_chunks))
+            entries.append(entry)
+
+        # Parse, Transform: each stage over every pending chunk at once
+        with phase("parse", declarations=len(pending)) as record:
+            tiers     = dict(self.parser.tier_counts)
+            per_chunk = self.parser.parse_chunks(pending)
+            sizes     = [len(trees) for trees in per_chunk] # CSTs per pending chunk
+            kept      = [flag for flag, size in zip(keep, sizes) for _ in range(size)]
+            parsed    = [cst for trees in per_chunk for cst in trees]
+            del per_chunk # 'parsed' holds the only reference to each CST
+            for tier, count in self.parser.tier_counts.items():
+                record.counters[tier] = count - tiers[tier]
+        if instrumentation.enabled(): # Counted outside the timed phase
+            counts = [count_ambiguities(cst) for cst in parsed]
+            record.counters.update(ambiguities =sum(nodes for nodes, _ in counts),
+                                   alternatives=sum(alternatives for _, alternatives in counts))
+        with phase("transform") as record:
+            transformed = []
+            for index, cst in enumerate(parsed):
+                if not kept[index]:
+                    parsed[index] = None # Handed over: freed node by node while its AST is built
+                transformed.append(self.transformer.transform(cst, consume=not kept[index]))
+            if instrumentation.enabled():
+                record.counters["ast_nodes"] = sum(1 for ast in transformed for _ in iter_preorder(ast))
+
+        # Splice: cached headers & freshly parsed groups, in source order
+        csts: list[Tree]    = []
+        asts: list[ASTNode] = []
+        position = 0 # Into parsed / transformed
+        chunk    = 0 # Into sizes
+        for (segment, group_chunks), entry in zip(groups, entries):
+
+            # Hit: splice in a fresh copy
+            if entry is not None:
+                self.stats.hits += 1
+                if with_cst:
+                    csts.extend(self._decode_csts(segment.key, entry))
+                asts.extend(pickle.loads(entry.ast_blob))
+                continue
+
+            # Miss / not a header
+            count      = sum(sizes[chunk:chunk + len(group_chunks)])
+            chunk     += len(group_chunks)
+            group_csts = parsed[position:position + count]
+            group_asts = transformed[position:position + count]
+            position  += count
+            if segment is not None:
+                self.stats.misses += 1
+                self._store(segment.key, group_csts, group_asts) # Before later passes mutate group_asts
+
+            if with_cst:
+                csts.extend(group_csts)
+            asts.extend(group_asts)
+
+        ast = self.transformer.translation_unit([self.transformer.declaration_seq(asts)] if asts else [])
+        return csts, ast
+
+    ####################################################################################################################
+    @staticmethod
+    def _group(chunks: list[DeclarationChunk], segments: list[HeaderSegment]) \
+            -> list[tuple[HeaderSegment | None, list[DeclarationChunk]]]:
+        """ Consecutive runs of chunks: (segment, its chunks) for headers, (None, chunks) for the rest.
+            A header whose text does not begin & end on declaration boundaries is not cacheable: parsed as usual.
+        """
+        groups: list[tuple[HeaderSegment | None, list[DeclarationChunk]]] = []
+        index = 0
+        for segment in sorted(segments, key=lambda s: s.start):
+            first = index
+            while first < len(chunks) and chunks[first].end <= segment.start:
+                first += 1
+            last = first
+            while last < len(chunks) and chunks[last].start < segment.end:
+                last += 1
+
+            inside = chunks[first:last]
+            if not inside or inside[0].start < segment.start or inside[-1].end > segment.end:
+                continue # Empty header, or a declaration straddling its boundary
+
+            if first > index:
+                groups.append((None, chunks[index:first]))
+            groups.append((segment, inside))
+            index = last
+
+        if index < len(chunks):
+            groups.append((None, chunks[index:]))
+        return groups
+
+    def _lookup(self, key: str) -> HeaderEntry | None:
+        entry = self.entries.get(key)
+        if entry is not None or self.cache_dir is None:
+            return entry
+
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if not isinstance(entry, HeaderEntry):
+            return None
+
+        self.entries[key] = entry
+        self.stats.loaded += 1
+        return entry
+
+    def _decode_csts(self, key: str, entry: HeaderEntry) -> list[Tree]:
+        csts = self.csts.get(key)
+        if csts is None:
+            csts = self.csts[key] = pickle.loads(entry.cst_blob)
+        return csts
+
+    def _store(self, key: str, csts: list[Tree], asts: list[ASTNode]):
+        try:
+            entry = HeaderEntry(pickle.dumps(csts, protocol=pickle.HIGHEST_PROTOCOL),
+                                pickle.dumps(asts, protocol=pickle.HIGHEST_PROTOCOL))
+        except (RecursionError, pickle.PicklingError, TypeError):
+            return # Too deep to pickle (e.g. 10k-term expressions): parsed again next time
+
+        self.entries[key] = entry
+        self.csts[key]    = csts
+        if self.cache_dir is None:
+            return
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_name, path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except OSError:
+            pass # Cache is an optimisation only
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{self.salt}-{key[:32]}.pickle"
@@ -0,0 +1,99 @@
+# incremental.py
+
+from __future__ import annotations
+
+import copy
+import hashlib
+from dataclasses import dataclass
+
+from lark import Lark, Tree
+from lark.exceptions import UnexpectedInput
+
+from compiler.front_end.abstract_nodes import ASTNode
+from compiler.front_end.declaration_splitter import split_declarations, DeclarationChunk
+from compiler.front_end.tiered_parser import TieredParser
+from compiler.front_end.transformer import CSTtoAST
+
+########################################################################################################################
+# CACHE ENTRIES
+
+@dataclass
+class CachedDeclaration:
+    csts: list[Tree]     # Parser output for the declaration (token positions are those of the first parse)
+    asts: list[ASTNode]  # Disambiguated + transformed; never handed out directly, see IncrementalFrontEnd.build()
+
+@dataclass
+class IncrementalStats:
+    reused  : int = 0 # Declarations served from the cache
+    reparsed: int = 0 # Declarations parsed & transformed this run
+
+    def __str__(self):
+        return f"incremental: {self.reused} reused, {self.reparsed} reparsed"
+
+def declaration_key(text: str, parser: Lark) -> str:
+    """ Hash of a declaration's token stream (type & value, as the parser's lexer produces it): whitespace & comments
+        never change the key, token boundaries always do ('i+ ++j' vs. 'i++ +j').
+    """
+    digest = hashlib.sha256()
+    try:
+        for token in parser.lex(text):
+            digest.update(f"{token.type}\0{token.value}\0".encode("utf-8"))
+    except UnexpectedInput:
+        # Unlexable (the parse fails as well): key on the raw text
+        digest = hashlib.sha256(b"\1" + text.encode("utf-8"))
+    return digest.hexdigest()
+
+def copy_asts(entry: CachedDeclaration, transformer: CSTtoAST) -> list[ASTNode]:
+    """ Later passes decorate / mutate the AST: each build gets its own copy. """
+    try:
+        return copy.deepcopy(entry.asts)
+    except RecursionError:
+        # Too deep for deepcopy: re-transform the cached CST (the parse is still skipped)
+        return [transformer.transform(cst) for cst in entry.csts]
+
+########################################################################################################################
+class IncrementalFrontEnd:
+    """ Preprocessed source -> (CST, AST), re-parsing & re-transforming only the top-level declarations whose tokens
+        changed since the previous build. The AST is identical to a full parser.parse() + transform().
+        One instance per source file: the cache holds the declarations of the latest build only.
+    """
+
+    def __init__(self, parser: TieredParser, transformer: CSTtoAST | None = None):
+        self.parser      = parser
+        self.transformer = transformer or CSTtoAST()
+
+        self.cache: dict[str, CachedDeclaration] = {}
+        self.stats = IncrementalStats()
+
+    ####################################################################################################################
+    def build(self, code: str) -> tuple[Tree, ASTNode]:
+        cache, self.cache = self.cache, {}
+        self.stats        = IncrementalStats()
+
+        csts: list[Tree]    = []
+        asts: list[ASTNode] = []
+        for chunk in split_declarations(code):
+            key   = declaration_key(chunk.text, self.parser.lalr)
+            entry = cache.get(key) or self.cache.get(key) # Duplicates within one build count as reuse
+
+            if entry is None:
+                entry = self._parse_declaration(chunk)
+                self.stats.reparsed += 1
+            else:
+                self.stats.reused += 1
+            self.cache[key] = entry
+
+            csts.extend(entry.csts)
+            asts.extend(self._copy_asts(entry))
+
+        cst = self.parser.stitch(csts)
+        ast = self.transformer.translation_unit([self.transformer.declaration_seq(asts)] if asts else [])
+        return cst, ast
+
+    def _copy_asts(self, entry: CachedDeclaration) -> list[ASTNode]:
+        return copy_asts(entry, self.transformer)
+
+    def _parse_declaration(self, chunk: DeclarationChunk) -> CachedDeclaration:
+        csts = self.parser.parse_declaration(chunk)
+        asts = [self.transformer.transform(cst) for cst in csts]
+        return CachedDeclaration(csts, asts)
@@ -0,0 +1,229 @@
+# lexer.py
+
+from __future__ import annotations
+
+import re
+from typing import Iterator
+
+from lark import Token
+from lark.common import LexerConf
+from lark.exceptions import UnexpectedCharacters
+from lark.lexer import Lexer, LexerState
+
+########################################################################################################################
+# RESERVED SPELLINGS (single source of truth: the lexer reserves the words, CSTtoAST classifies tokens with both sets)
+
+KEYWORDS = frozenset({
+    # Control-flow
+    "if", "else", "switch", "case", "default", "for", "while", "do",
+    "break", "continue", "return", "goto", "try", "catch", "throw",
+
+    # Types & specifiers
+    "int", "float", "double", "char", "wchar_t", "char16_t", "char32_t",
+    "void", "bool", "auto", "signed", "unsigned", "short", "long",
+    "const", "constexpr", "consteval", "volatile", "static", "extern",
+    "mutable", "register", "restrict", "inline", "virtual", "explicit",
+    "noexcept", "final", "override", "thread local", "typename", "new",
+    "const_cast", "static_cast", "dynamic_cast", "reinterpret_cast",
+    "typeid",
+
+    # Declarations
+    "class", "struct", "union", "enum", "namespace", "template", "typedef",
+    "using", "friend", "public", "private", "protected", "static_assert",
+    "asm", "delete", "operator", "decltype", "this",
+
+    # Punctuation
+    "(", ")", "{", "}", "[", "]", ";", ",", ".",
+
+    # Miscellaneous / preprocessing
+    "#", "include", "define", "##",
+    "<:", ":>", "<%", "%>", "%:", "%:%:"
+})
+
+OPERATORS = frozenset({
+    # Operators (string forms only, not tokens like PLUS)
+    "+", "-", "*", "/", "%", "=", "...", "+=", "-=", "*=", "/=", "%=",
+    "<<=", ">>=", "&=", "|=", "^=",
+    "<", ">", "<=", ">=", "==", "!=", "&&", "||", "!", "&", "|", "~", "^",
+    "<<", ">>", "++", "--", "->", "->*", ".*", "?", "::", ":", "new[]",
+    "delete[]", "()", "[]", "sizeof", "alignof",
+})
+
+# Special meaning in one position only (virt-specifiers): ordinary identifiers everywhere else ('int final = 1;')
+CONTEXTUAL_KEYWORDS = frozenset({"final", "override"})
+
+IDENTIFIER  = "IDENTIFIER"
+RESERVED    = "RESERVED"    # Type of a reserved word the grammar has no terminal for: no rule accepts it
+GT_ADJACENT = "GT_ADJACENT" # First half of a split '>>'
+
+# Characters that never continue a C++ punctuator: a string terminal containing one of them next to something else
+# ('()', '[]', 'new[]') spans several tokens
+_BRACKETS = set("()[]{}")
+_WORD     = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+RESERVED_WORDS = frozenset(spelling for spelling in KEYWORDS | OPERATORS
+                           if _WORD.fullmatch(spelling) and spelling not in CONTEXTUAL_KEYWORDS)
+
+########################################################################################################################
+class TokenLexer(Lexer):
+    """ Standalone lexer for both parser tiers (Lark(..., lexer=TokenLexer)): the text is scanned once, by one master
+        regex, and Earley matches token types instead of re-running terminal regexes at every position it predicts
+        (lexer="dynamic").
+
+        Built from the grammar's own terminals:
+            - string terminals -> keyword & punctuator dictionaries (punctuators: longest match)
+            - regex terminals  -> master regex alternatives, in Lark's basic-lexer order
+            - words            -> keyword, else the first regex terminal matching the whole word (BOOL_LITERAL before
+                                  IDENTIFIER); resolved once per distinct spelling
+
+        RESERVED_WORDS are never an IDENTIFIER, so no parse in which a keyword names something enters the forest; those
+        without a grammar terminal lex as RESERVED. CONTEXTUAL_KEYWORDS always lex as IDENTIFIER (the grammar's
+        virt_specifier takes an IDENTIFIER, CSTtoAST checks its spelling). '>>' lexes as GT_ADJACENT + GT, which the
+        grammar reads as a shift or as two closing '>' ('A<B<int>>'), except right after 'operator'. Terminals spanning
+        several tokens ('()', '[]', 'new[]', 'delete[]') are formed only right after 'operator'.
+    """
+    __future_interface__ = True # lex(lexer_state, parser_state): no wrapper class, so the Lark object stays picklable
+
+    def __init__(self, lexer_conf: LexerConf):
+        self.lexer_conf = lexer_conf
+        self._build()
+
+    def _build(self):
+        conf   = self.lexer_conf
+        ignore = set(conf.ignore)
+
+        self.keywords  : dict[str, str] = {} # 'int'  -> INT
+        self.operators : dict[str, str] = {} # '->*'  -> ARROW_STAR
+        self.composites: dict[str, str] = {} # '()'   -> CALL
+        regex_terminals = []
+        for terminal in conf.terminals:
+            pattern = terminal.pattern
+            if pattern.type == "re":
+                regex_terminals.append(terminal)
+            elif _WORD.fullmatch(pattern.value):
+                if pattern.value not in CONTEXTUAL_KEYWORDS:
+                    self.keywords[pattern.value] = terminal.name
+            elif _is_composite(pattern.value):
+                self.composites[pattern.value] = terminal.name
+            else:
+                self.operators[pattern.value] = terminal.name
+
+        # Words: regex terminals tried in order of priority, most specific first
+        word_terminals = sorted((terminal for terminal in regex_terminals if terminal.name not in ignore),
+                                key=lambda terminal: (-terminal.priority, terminal.pattern.max_width, terminal.name))
+        self._word_patterns = [(terminal.name, re.compile(terminal.pattern.to_regexp(), conf.g_regex_flags))
+                               for terminal in word_terminals]
+
+        # Reserved words the grammar spells with a regex terminal (or not at all)
+        for word in RESERVED_WORDS - self.keywords.keys():
+            self.keywords[word] = next((name for name, pattern in self._word_patterns
+                                        if name != IDENTIFIER and pattern.fullmatch(word)), RESERVED)
+        self.words: dict[str, str] = dict(self.keywords) # Spelling -> terminal, grows with every new identifier
+
+        # Master Regex: ignored text, words, other regex terminals (Lark's order), punctuators (longest first)
+        others = sorted((terminal for terminal in regex_terminals if terminal.name not in ignore),
+                        key=lambda terminal: (-terminal.priority, -terminal.pattern.max_width,
+                                              -len(terminal.pattern.value), terminal.name))
+        alternatives = [f"(?P<_ignore>{'|'.join(self._regexp(name) for name in conf.ignore)})",
+                        f"(?P<_word>{_WORD.pattern})"]
+        self._group_types: dict[str, str] = {}
+        for i, terminal in enumerate(others):
+            self._group_types[f"_t{i}"] = terminal.name
+            alternatives.append(f"(?P<_t{i}>{terminal.pattern.to_regexp()})")
+        punctuators = sorted(self.operators, key=len, reverse=True)
+        alternatives.append(f"(?P<_punct>{'|'.join(map(re.escape, punctuators))})")
+
+        self.master = re.compile("|".join(alternatives), conf.g_regex_flags)
+
+        # '>>' -> GT_ADJACENT + GT, given a grammar that has both
+        self._split_shift = (GT_ADJACENT in {terminal.name for terminal in conf.terminals}
+                             and ">>" in self.operators and ">" in self.operators)
+
+        # 'operator' followed by a multi-token terminal
+        self._operator_type = self.keywords.get("operator")
+        self._composite_pattern = (re.compile("|".join(map(re.escape, sorted(self.composites, key=len, reverse=True))))
+                                   if self.composites else None)
+
+    def _regexp(self, name: str) -> str:
+        terminal = next(terminal for terminal in self.lexer_conf.terminals if terminal.name == name)
+        return terminal.pattern.to_regexp()
+
+    ####################################################################################################################
+    # PICKLING (grammar cache): compiled state is rebuilt from the terminals, so a lexer edit never loads stale tables
+
+    def __getstate__(self):
+        return {"lexer_conf": self.lexer_conf}
+
+    def __setstate__(self, state):
+        self.lexer_conf = state["lexer_conf"]
+        self._build()
+
+    ####################################################################################################################
+    def lex(self, lexer_state: LexerState, parser_state=None) -> Iterator[Token]:
+        return self.tokenize(lexer_state.text)
+
+    def tokenize(self, text: str) -> Iterator[Token]:
+        match, words, operators, group_types = self.master.match, self.words, self.operators, self._group_types
+        composite, operator_type = self._composite_pattern, self._operator_type
+
+        pos, end       = 0, len(text)
+        line, line_pos = 1, 0 # Current line & offset of its first character
+        last_type      = None
+        while pos < end:
+            column = pos - line_pos + 1
+
+            # Multi-Token Terminal: 'operator()' ...
+            if last_type == operator_type and composite is not None:
+                found = composite.match(text, pos)
+                if found is not None:
+                    value     = found.group()
+                    last_type = self.composites[value]
+                    pos       = found.end()
+                    yield Token(last_type, value, found.start(), line, column, line, column + len(value), pos)
+                    continue
+
+            found = match(text, pos)
+            if found is None:
+                raise UnexpectedCharacters(text, pos, line, column, allowed=set(operators.values()),
+                                           terminals_by_name={terminal.name: terminal
+                                                              for terminal in self.lexer_conf.terminals})
+            group, value, start, pos = found.lastgroup, found.group(), pos, found.end()
+
+            if group == "_word":
+                token_type = words.get(value) or self._resolve_word(value, text, start, line, column)
+            elif group == "_punct":
+                token_type = operators[value]
+                if value == ">>" and self._split_shift and last_type != operator_type:
+                    yield Token(GT_ADJACENT, ">", start, line, column, line, column + 1, start + 1)
+                    token_type, value, start, column = operators[">"], ">", start + 1, column + 1
+            elif group == "_ignore":
+                token_type = None
+            else:
+                token_type = group_types[group]
+
+            # Line Tracking (comments, whitespace)
+            newlines = value.count("\n")
+            if newlines:
+                end_line, line_pos = line + newlines, start + value.rindex("\n") + 1
+                end_column = pos - line_pos + 1
+            else:
+                end_line, end_column = line, column + len(value)
+
+            if token_type is not None:
+                last_type = token_type
+                yield Token(token_type, value, start, line, column, end_line, end_column, pos)
+            line = end_line
+
+    def _resolve_word(self, word: str, text: str, pos: int, line: int, column: int) -> str:
+        for name, pattern in self._word_patterns:
+            if pattern.fullmatch(word):
+                self.words[word] = name
+                return name
+        raise UnexpectedCharacters(text, pos, line, column, allowed=set(self.keywords.values()))
+
+def _is_composite(value: str) -> bool:
+    """ More than one C++ token: contains whitespace, mixes word & punctuation, or a bracket with anything else. """
+    if any(char.isspace() for char in value):
+        return True
+    has_word = any(char.isalnum() or char == "_" for char in value)
+    return has_word or (len(value) > 1 and any(char in _BRACKETS for char in value))
@@ -1,9 +1,12 @@
 # llvm_generator.py
 
+from dataclasses import dataclass
 from llvmlite import ir, binding as llvm
 from compiler.context import CompilerContext
 from compiler.front_end.abstract_nodes.ast_node import ASTNode
 from compiler.front_end import abstract_nodes
+from compiler.utils import log
+from compiler.utils.instrumentation import phase
 
 # LLVM Setup
 llvm.initialize()
@@ -13,6 +16,21 @@ llvm.initialize_native_asmprinter()
 # Target Machine Setup
 TARGET_MACHINE = llvm.Target.from_default_triple().create_target_machine()
 
+# External Function Types
+I8_PTR      = ir.IntType(8).as_pointer()
+PRINTF_TYPE = ir.FunctionType(ir.IntType(32), [I8_PTR], var_arg=True)
+
+########################################################################################################################
+@dataclass
+class LoweringStats:
+    function_declarations: int = 0 # External functions declared in the module
+    string_globals       : int = 0 # String constants emitted
+    string_reuses        : int = 0 # Literal uses served by an existing constant
+
+    def __str__(self):
+        return (f"lowering: {self.function_declarations} declaration(s), "
+                f"{self.string_globals} string global(s), {self.string_reuses} reused")
+
 ########################################################################################################################
 class LLVMGenerator:
     def __init__(self, dast_root: ASTNode, context: CompilerContext):
@@ -20,13 +38,17 @@ class LLVMGenerator:
         self.context  = context  # Compiler context
         self.dast = dast_root    # DAST root
         self.module : ir.Module    | None = None # IR root
+        self.stats  : LoweringStats | None = None
 
     ####################################################################################################################
     def generate(self):
         """ Starts the LLVM IR generation process. it goes."""
-        lowering_pass = LoweringPass(self.dast, self.context, self.module)
-        lowering_pass.walk()
-        self.module = lowering_pass.module
+        with phase("lower") as record:
+            lowering_pass = LoweringPass(self.dast, self.context, self.module)
+            lowering_pass.walk()
+            self.module = lowering_pass.module
+            self.stats  = lowering_pass.stats
+            record.counters.update(vars(self.stats))
 
 
 
@@ -43,6 +65,11 @@ class LoweringPass(Decorator):
         self.module : ir.Module = ir_root        # IR root
         self.builder: ir.IRBuilder | None = None # Current IR builder
 
+        # Module-Wide Pools: one declaration per external function, one global per distinct string
+        self.functions: dict[str, ir.Function] = {}  # name  -> declaration
+        self.strings  : dict[str, ir.Constant] = {}  # value -> i8* to its global
+        self.stats = LoweringStats()
+
     ####################################################################################################################
     #  VISITOR METHODS  #
     #####################
@@ -67,31 +94,56 @@ class LoweringPass(Decorator):
     ##################
 
     def emit_expr_op(self, base: ASTNode, op:abstract_nodes.ExprOp):
-        # IR: Declare Printf
-        printf_ty = ir.FunctionType(ir.IntType(32), [ir.IntType(8).as_pointer()], var_arg=True)
-        printf = ir.Function(self.module, printf_ty, name="printf")
-
-        def str_to_ir(input:str):
-            c_msg = ir.Constant(ir.ArrayType(ir.IntType(8), len(input)),
-                                bytearray(input.encode("utf8")))
-            gvar = ir.GlobalVariable(self.module, c_msg.type, name="str")
-            gvar.global_constant = True
-            gvar.linkage = "internal"
-            gvar.initializer = c_msg
-            msg_ptr = self.builder.bitcast(gvar, ir.IntType(8).as_pointer())
-            return msg_ptr
-
         if isinstance(op, abstract_nodes.Call):
+            # IR: Declare Printf (once per module, on its first call: every call is lowered as printf)
+            printf = self.declare_function("printf", PRINTF_TYPE)
+
             # Emit Call
             if op.args:
-                arg1 = str_to_ir(op.args[0].literal_value+"\00")
+                arg1 = self.intern_string(op.args[0].literal_value+"\00")
             else:
-                arg1 = str_to_ir("NULL"+"\00")
+                arg1 = self.intern_string("NULL"+"\00")
             result = self.builder.call(printf, [arg1])
 
+    ####################################################################################################################
+    #  MODULE POOLS  #
+    ##################
+
+    def declare_function(self, name: str, function_type: ir.FunctionType) -> ir.Function:
+        """ Returns the module's declaration of an external function, creating it on first use. """
+        function = self.functions.get(name)
+        if function is None:
+            function = self.module.globals.get(name) # Already defined by the unit itself
+            if function is None:
+                function = ir.Function(self.module, function_type, name=name)
+                self.stats.function_declarations += 1
+            self.functions[name] = function
+        return function
+
+    def intern_string(self, value: str) -> ir.Constant:
+        """ i8* to an internal constant holding value; identical strings share one global. """
+        pointer = self.strings.get(value)
+        if pointer is not None:
+            self.stats.string_reuses += 1
+            return pointer
+
+        c_msg = ir.Constant(ir.ArrayType(ir.IntType(8), len(value.encode("utf8"))),
+                            bytearray(value.encode("utf8")))
+        gvar = ir.GlobalVariable(self.module, c_msg.type, name=self.module.get_unique_name("str"))
+        gvar.global_constant = True
+        gvar.linkage         = "internal"
+        gvar.unnamed_addr    = True # Address never compared: lets LLVM merge it further
+        gvar.initializer     = c_msg
+
+        # Constant expression: no per-call-site bitcast instruction
+        pointer = gvar.bitcast(I8_PTR)
+        self.strings[value] = pointer
+        self.stats.string_globals += 1
+        return pointer
+
     def emit_module(self, curr_node: ASTNode):
         if self.module is not None:
-            print("Error: more than one translation unit found.") # Error
+            log.error("Error: more than one translation unit found.") # Error
         else:
             self.module             = ir.Module(name=curr_node.name)  # Create: IR Module
             self.module.triple      = llvm.get_default_triple()
@@ -0,0 +1,109 @@
+# parallel_parser.py
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from lark import Lark, Tree
+
+from compiler.front_end.declaration_splitter import DeclarationChunk
+from compiler.front_end.grammar_cache import load_parser, GrammarLoadStats
+from compiler.front_end.tiered_parser import TieredParser
+from compiler.utils.instrumentation import phase
+
+########################################################################################################################
+# PARSER SPEC
+
+@dataclass
+class ParserSpec:
+    """ Picklable recipe for a parser: Lark objects are not sent to workers, each one loads its own from the cache. """
+    grammar_path : Path
+    cache_dir    : Path | None
+    override_path: Path | None = None
+    options      : dict = field(default_factory=dict) # Lark() options
+
+    def load(self) -> tuple[Lark, GrammarLoadStats]:
+        with phase("grammar_load", parser=self.options.get("parser", "earley")) as record:
+            parser, stats = load_parser(self.grammar_path, self.cache_dir, self.override_path, **self.options)
+            record.counters["source"] = stats.source
+        return parser, stats
+
+########################################################################################################################
+# WORKER PROCESS
+
+_worker_parser: TieredParser | None = None # One per worker, built by _init_worker()
+
+def _init_worker(lalr_spec: ParserSpec, earley_spec: ParserSpec):
+    global _worker_parser
+    lalr_parser,   _ = lalr_spec.load()
+    earley_parser, _ = earley_spec.load()
+    _worker_parser = TieredParser(lalr_parser, earley_parser)
+
+def _parse_batch(texts: list[str]) -> list[tuple[list[Tree], str]]:
+    return [_worker_parser.parse_text(text) for text in texts]
+
+########################################################################################################################
+class ParallelParser(TieredParser):
+    """ TieredParser that parses top-level declarations concurrently in a process pool.
+        Units with fewer than min_chunks declarations are parsed in-process: pool start-up would dominate.
+    """
+
+    def __init__(self, lalr_spec: ParserSpec, earley_spec: ParserSpec,
+                 workers: int | None = None, min_chunks: int = 16):
+        lalr_parser,   self.lalr_stats   = lalr_spec.load()
+        earley_parser, self.earley_stats = earley_spec.load()
+        super().__init__(lalr_parser, earley_parser)
+
+        self.lalr_spec   = lalr_spec
+        self.earley_spec = earley_spec
+        self.workers     = workers or os.cpu_count() or 1
+        self.min_chunks  = min_chunks
+
+        self._pool: ProcessPoolExecutor | None = None # Started on first large unit, reused after
+
+    ####################################################################################################################
+    def parse_chunks(self, chunks: list[DeclarationChunk]) -> list[list[Tree]]:
+        # Serial: small unit or single core
+        if self.workers < 2 or len(chunks) < self.min_chunks:
+            return super().parse_chunks(chunks)
+
+        # Parallel: batching amortises the per-task IPC
+        size    = max(1, len(chunks) // (self.workers * 4))
+        batches = [[chunk.text for chunk in chunks[i:i + size]] for i in range(0, len(chunks), size)]
+        futures = [self.pool.submit(_parse_batch, batch) for batch in batches]
+
+        parsed = []
+        for batch, future in zip(batches, futures):
+            try:
+                results = future.result()
+            except RecursionError:
+                # Trees too deep to pickle back (e.g. 10k-term expressions): parse the batch here instead
+                results = [self.parse_text(text) for text in batch]
+
+            for trees, tier in results:
+                self.tier_counts[tier] += 1
+                parsed.append(trees)
+
+        return parsed
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=_init_worker,
+                                             initargs=(self.lalr_spec, self.earley_spec))
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,744 @@
+# preprocessor.py
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+from compiler.utils.data_classes import SourceLocation
+from compiler.utils.instrumentation import phase
+
+########################################################################################################################
+# LEXING
+
+# Phase 2-3: line splices, then comments -> one space (newlines inside block comments are kept)
+_SPLICE  = re.compile(r"\\[ \t]*\n")
+_COMMENT = re.compile(r"""
+      (?P<literal> (?:u8|u|U|L)?"(?:\\.|[^"\\\n])*" | (?:u8|u|U|L)?'(?:\\.|[^'\\\n])*' )
+    | (?P<line>    //[^\n]* )
+    | (?P<block>   /\*.*?\*/ )
+""", re.VERBOSE | re.DOTALL)
+
+_PUNCTUATOR = r"""%:%: | \.\.\. | <<= | >>= | ->\* | <=> | \#\# | %: | :: | -> | \+\+ | -- | << | >> | <= | >= | == | !=
+                | && | \|\| | \+= | -= | \*= | /= | %= | &= | \|= | \^= | \.\* | ."""
+
+# Phase 3: preprocessing tokens
+_TOKEN = re.compile(rf"""
+      (?P<space>  [ \t\f\v\r]+ )
+    | (?P<string> (?:u8|u|U|L)?"(?:\\.|[^"\\\n])*" )
+    | (?P<char>   (?:u8|u|U|L)?'(?:\\.|[^'\\\n])*' )
+    | (?P<number> \.?[0-9](?:[eEpP][+-]|[A-Za-z0-9_.'])* )
+    | (?P<ident>  [A-Za-z_][A-Za-z0-9_]* )
+    | (?P<punct>  {_PUNCTUATOR} )
+""", re.VERBOSE)
+
+_PUNCT_ONLY = re.compile(_PUNCTUATOR, re.VERBOSE)
+_WORD_KINDS = frozenset(("ident", "number", "string", "char"))
+
+class Token:
+    """ One preprocessing token. hide: names of the macros whose expansion produced it (not re-expanded inside). """
+    __slots__ = ("text", "kind", "space", "line", "hide")
+
+    def __init__(self, text: str, kind: str, space: bool = False, line: int = 0, hide: frozenset = frozenset()):
+        self.text  = text
+        self.kind  = kind
+        self.space = space # Preceded by whitespace
+        self.line  = line
+        self.hide  = hide
+
+    def copy(self, space: bool | None = None, hide: frozenset | None = None) -> Token:
+        return Token(self.text, self.kind, self.space if space is None else space, self.line,
+                     self.hide if hide is None else hide)
+
+    def __repr__(self):
+        return f"Token({self.text!r}, {self.kind})"
+
+def tokenize(text: str, line: int = 0) -> list[Token]:
+    tokens: list[Token] = []
+    space = False
+    for match in _TOKEN.finditer(text):
+        kind = match.lastgroup
+        if kind == "space":
+            space = True
+            continue
+        tokens.append(Token(match.group(), kind, space, line))
+        space = False
+    return tokens
+
+########################################################################################################################
+# ERRORS & MACROS
+
+class PreprocessorError(Exception):
+    def __init__(self, message: str, loc: SourceLocation | None = None):
+        self.loc = loc
+        super().__init__(f"{loc.filename}:{loc.line}: {message}" if loc else message)
+
+@dataclass
+class Macro:
+    name    : str
+    body    : list[Token]
+    params  : list[str] | None = None # None: object-like
+    variadic: bool = False            # Last parameter is __VA_ARGS__
+
+########################################################################################################################
+# SOURCE FILES
+
+@dataclass
+class _Line:
+    number   : int           # 1-based, in the original file
+    directive: str | None    # Directive name, "" for a null directive, None for a text line
+    tokens   : list[Token]   # Directive: the tokens after its name
+
+@dataclass
+class SourceFile:
+    """ A file after splicing, comment removal & tokenization: macro independent, so shared by every includer. """
+    path       : Path
+    lines      : list[_Line]
+    pragma_once: bool
+    digest     : str                      # sha256 of the file's text
+    stamp      : tuple[int, int] = (0, 0) # (mtime_ns, size) at load time
+
+@dataclass
+class HeaderSegment:
+    """ Output span produced by one #include of the main file (nested includes are part of it). """
+    start: int
+    end  : int
+    key  : str  # Hash of every file read for the span + the macro state on entry: equal keys -> equal text
+    path : Path
+
+def _load_source(text: str, path: Path) -> SourceFile:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    text   = text.replace("\r\n", "\n")
+
+    # Splices (line numbers after one shift up by a line), then comments, keeping a block comment's newlines
+    text = _SPLICE.sub("", text)
+    def _strip(match: re.Match) -> str:
+        if match.lastgroup == "literal":
+            return match.group()
+        return " " + "\n" * match.group().count("\n")
+    text = _COMMENT.sub(_strip, text)
+
+    lines: list[_Line] = []
+    pragma_once = False
+    for number, raw in enumerate(text.split("\n"), start=1):
+        stripped = raw.lstrip()
+        if stripped.startswith("#") or stripped.startswith("%:"):
+            tokens = tokenize(stripped[1 if stripped[0] == "#" else 2:], number)
+            if not tokens:
+                lines.append(_Line(number, "", []))
+                continue
+            name = tokens[0].text if tokens[0].kind == "ident" else "?" + tokens[0].text
+            lines.append(_Line(number, name, tokens[1:]))
+            if name == "pragma" and len(tokens) == 2 and tokens[1].text == "once":
+                pragma_once = True
+        else:
+            lines.append(_Line(number, None, tokenize(raw, number)))
+
+    return SourceFile(path, lines, pragma_once, digest)
+
+########################################################################################################################
+class Preprocessor:
+    """ In-process replacement for `clang -E -P`: #include (quote / angle search paths), #pragma once, object- and
+        function-like #define (# and ##, variadic), #undef, #if / #ifdef / #ifndef / #elif / #else / #endif, #error.
+        Loaded files are cached (keyed by path, checked against mtime & size), so headers shared by many units are
+        read and tokenized once per Preprocessor. Unknown #pragmas are dropped: the grammar has no use for them.
+    """
+
+    MAX_INCLUDE_DEPTH = 200
+
+    def __init__(self, include_paths: list[Path] = (), defines: dict[str, str] | None = None):
+        self.include_paths = [Path(path) for path in include_paths]
+        self.defines       = {"__cplusplus": "201703L", "__STDC_HOSTED__": "1", **(defines or {})}
+
+        self.files   : dict[Path, SourceFile] = {} # Loaded file cache, kept across preprocess() calls
+        self.warnings: list[str] = []
+        self.segments: list[HeaderSegment] = [] # Of the latest preprocess() call
+
+        # Per-unit state, reset by preprocess()
+        self.macros: dict[str, Macro] = {}
+        self._once : set[Path] = set()
+        self._depth = 0
+        self._read : list[str] | None = None # Digests of the files read by the current top-level #include
+        self._size  = 0                      # Characters emitted so far
+
+    ####################################################################################################################
+    def preprocess(self, source: str, path: Path | str = "<stdin>") -> str:
+        """ Preprocesses one translation unit; macro & #pragma once state does not leak into the next one. """
+        self.macros   = {name: Macro(name, tokenize(value)) for name, value in self.defines.items()}
+        self._once    = set()
+        self._depth   = 0
+        self._read    = None
+        self._size    = 0
+        self.warnings = []
+        self.segments = []
+
+        path = Path(path)
+        out: list[str] = []
+        with phase("preprocess") as record:
+            self._process(_load_source(source, path), out)
+            record.counters.update(headers=len(self.segments), output_chars=self._size)
+        return "".join(out)
+
+    def load(self, path: Path) -> SourceFile:
+        stat  = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self.files.get(path)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            source_file = _load_source(f.read(), path)
+        source_file.stamp = stamp
+        self.files[path] = source_file
+        return source_file
+
+    ####################################################################################################################
+    #  FILE PROCESSING  #
+    #####################
+
+    def _process(self, source_file: SourceFile, out: list[str]):
+        # Conditional Stack: [enclosing group active, a branch was taken, current branch active, #else seen]
+        conditions: list[list[bool]] = []
+        active  = True
+        pending: list[Token] = [] # Text lines since the last directive: macro arguments may span lines
+
+        for line in source_file.lines:
+            directive = line.directive
+
+            if directive is None:
+                if active:
+                    if line.tokens:
+                        pending.extend(line.tokens)
+                    pending.append(Token("\n", "newline", line=line.number))
+                continue
+
+            # Flush text before any directive: a #define must not affect earlier lines
+            if pending:
+                self._emit(self._expand(pending, source_file), out)
+                pending = []
+
+            loc = SourceLocation(str(source_file.path), line.number, 0)
+
+            # Conditionals: always tracked, even inside skipped groups
+            if directive in ("if", "ifdef", "ifndef"):
+                taken = active and self._condition(directive, line.tokens, source_file, loc)
+                conditions.append([active, taken, taken, False])
+                active = taken
+                continue
+            if directive in ("elif", "else", "endif"):
+                if not conditions:
+                    raise PreprocessorError(f"#{directive} without #if", loc)
+                group = conditions[-1]
+                if directive == "endif":
+                    conditions.pop()
+                    active = group[0]
+                    continue
+                if group[3]:
+                    raise PreprocessorError(f"#{directive} after #else", loc)
+                if directive == "else":
+                    group[3] = True
+                    group[2] = group[0] and not group[1]
+                else:
+                    group[2] = group[0] and not group[1] and self._condition("if", line.tokens, source_file, loc)
+                group[1] = group[1] or group[2]
+                active   = group[2]
+                continue
+
+            if not active:
+                continue
+
+            # Active Directives
+            if directive == "define":
+                self._define(line.tokens, loc)
+            elif directive == "undef":
+                if not line.tokens or line.tokens[0].kind != "ident":
+                    raise PreprocessorError("macro name missing in #undef", loc)
+                self.macros.pop(line.tokens[0].text, None)
+            elif directive == "include":
+                self._include(line.tokens, source_file, loc, out)
+            elif directive == "pragma":
+                if line.tokens and line.tokens[0].text == "once":
+                    self._once.add(source_file.path)
+            elif directive == "error":
+                raise PreprocessorError("#error " + self._spell(line.tokens), loc)
+            elif directive == "warning":
+                self.warnings.append(f"{loc.filename}:{loc.line}: #warning {self._spell(line.tokens)}")
+            elif directive in ("", "line", "ident"):
+                pass
+            else:
+                raise PreprocessorError(f"invalid preprocessing directive #{directive}", loc)
+
+        if pending:
+            self._emit(self._expand(pending, source_file), out)
+        if conditions:
+            raise PreprocessorError("unterminated conditional directive",
+                                    SourceLocation(str(source_file.path), len(source_file.lines), 0))
+
+    def _include(self, tokens: list[Token], source_file: SourceFile, loc: SourceLocation, out: list[str]):
+        # #include MACRO -> expand first
+        if tokens and tokens[0].kind == "ident":
+            tokens = self._expand(tokens, source_file)
+        if not tokens:
+            raise PreprocessorError("#include expects \"FILENAME\" or <FILENAME>", loc)
+
+        if tokens[0].kind == "string" and tokens[0].text.startswith('"'):
+            name, quoted = tokens[0].text[1:-1], True
+        elif tokens[0].text == "<" and tokens[-1].text == ">":
+            name, quoted = "".join((" " if t.space else "") + t.text for t in tokens[1:-1]).strip(), False
+        else:
+            raise PreprocessorError("#include expects \"FILENAME\" or <FILENAME>", loc)
+
+        # Search: the including file's directory (quoted form only), then the include paths
+        search = ([source_file.path.parent] if quoted else []) + self.include_paths
+        for directory in search:
+            candidate = directory / name
+            if candidate.is_file():
+                path = Path(os.path.normpath(candidate.resolve()))
+                break
+        else:
+            raise PreprocessorError(f"'{name}' file not found", loc)
+
+        if path in self._once:
+            return
+        if self._depth >= self.MAX_INCLUDE_DEPTH:
+            raise PreprocessorError("#include nested too deeply", loc)
+
+        included = self.load(path)
+        if included.pragma_once:
+            self._once.add(path)
+
+        # Top-level #include: record its span for HeaderCache
+        top_level = self._depth == 0
+        if top_level:
+            entry_state = self._macro_state()
+            start       = self._size
+            self._read  = []
+
+        self._depth += 1
+        try:
+            if self._read is not None:
+                self._read.append(included.digest)
+            self._process(included, out)
+        finally:
+            self._depth -= 1
+
+        if top_level:
+            key = hashlib.sha256((entry_state + "\0" + "\0".join(self._read)).encode("utf-8")).hexdigest()
+            self.segments.append(HeaderSegment(start, self._size, key, path))
+            self._read = None
+
+    def _macro_state(self) -> str:
+        """ Everything outside a header that can change its expansion: the macro table & #pragma once'd files. """
+        digest = hashlib.sha256()
+        for name in sorted(self.macros):
+            macro = self.macros[name]
+            digest.update(repr((name, macro.params, macro.variadic, [t.text for t in macro.body])).encode("utf-8"))
+        for path in sorted(self._once):
+            digest.update(str(path).encode("utf-8"))
+        return digest.hexdigest()
+
+    ####################################################################################################################
+    #  MACROS  #
+    ############
+
+    def _define(self, tokens: list[Token], loc: SourceLocation):
+        if not tokens or tokens[0].kind != "ident":
+            raise PreprocessorError("macro name missing in #define", loc)
+        name = tokens[0].text
+
+        # Function-like: '(' directly after the name
+        if len(tokens) > 1 and tokens[1].text == "(" and not tokens[1].space:
+            params: list[str] = []
+            variadic = False
+            index    = 2
+            while True:
+                if index >= len(tokens):
+                    raise PreprocessorError(f"missing ')' in parameter list of macro '{name}'", loc)
+                token = tokens[index]
+                if token.text == ")" and not params and not variadic:
+                    index += 1
+                    break
+                if token.text == "...":
+                    params.append("__VA_ARGS__")
+                    variadic = True
+                elif token.kind == "ident":
+                    params.append(token.text)
+                else:
+                    raise PreprocessorError(f"invalid parameter list of macro '{name}'", loc)
+                index += 1
+                if index < len(tokens) and tokens[index].text == ")":
+                    index += 1
+                    break
+                if variadic or index >= len(tokens) or tokens[index].text != ",":
+                    raise PreprocessorError(f"invalid parameter list of macro '{name}'", loc)
+                index += 1
+            self.macros[name] = Macro(name, tokens[index:], params, variadic)
+        else:
+            self.macros[name] = Macro(name, tokens[1:])
+
+    def _expand(self, tokens: list[Token], source_file: SourceFile) -> list[Token]:
+        """ Full macro expansion with rescanning; each token's hide set stops recursive expansion. """
+        out  : list[Token] = []
+        stack: list[Token] = tokens[::-1] # Next token on top
+        macros = self.macros
+
+        while stack:
+            token = stack.pop()
+            if token.kind != "ident":
+                out.append(token)
+                continue
+
+            name = token.text
+            if name in token.hide:
+                out.append(token)
+                continue
+
+            # Builtins
+            if name == "__LINE__":
+                out.append(Token(str(token.line), "number", token.space, token.line))
+                continue
+            if name == "__FILE__":
+                out.append(Token('"' + str(source_file.path).replace("\\", "\\\\") + '"', "string",
+                                 token.space, token.line))
+                continue
+
+            macro = macros.get(name)
+            if macro is None:
+                out.append(token)
+                continue
+
+            # Object-like
+            if macro.params is None:
+                body = self._substitute(macro, {}, token.hide | {name})
+                if body:
+                    body[0] = body[0].copy(space=token.space)
+                stack.extend(reversed(body))
+                continue
+
+            # Function-like: only when followed by '(' (newlines in between allowed)
+            look = len(stack) - 1
+            while look >= 0 and stack[look].kind == "newline":
+                look -= 1
+            if look < 0 or stack[look].text != "(":
+                out.append(token)
+                continue
+            del stack[look:]
+
+            args, close = self._collect_arguments(stack, macro, token, source_file)
+            hide = (token.hide & close.hide) | {name}
+            body = self._substitute(macro, args, hide)
+            if body:
+                body[0] = body[0].copy(space=token.space)
+            stack.extend(reversed(body))
+
+        return out
+
+    def _collect_arguments(self, stack: list[Token], macro: Macro, token: Token,
+                           source_file: SourceFile) -> tuple[dict, Token]:
+        """ Pops the arguments of a function-like invocation ('(' already consumed). Returns ({param: tokens}, ')'). """
+        args : list[list[Token]] = [[]]
+        depth = 0
+        while True:
+            if not stack:
+                raise PreprocessorError(f"unterminated argument list invoking macro '{macro.name}'",
+                                        SourceLocation(str(source_file.path), token.line, 0))
+            arg_token = stack.pop()
+            if arg_token.kind == "newline":
+                continue
+            text = arg_token.text
+            if text == "(":
+                depth += 1
+            elif text == ")":
+                if depth == 0:
+                    close = arg_token
+                    break
+                depth -= 1
+            elif text == "," and depth == 0 and not (macro.variadic and len(args) == len(macro.params)):
+                args.append([])
+                continue
+            args[-1].append(arg_token)
+
+        params = macro.params
+        if len(args) == 1 and not args[0] and len(params) <= 1:
+            args = [[]] * len(params)          # f() -> zero arguments, or one empty one
+        elif macro.variadic and len(args) == len(params) - 1:
+            args.append([])                    # f(a) for f(a, ...) -> empty __VA_ARGS__
+        if len(args) != len(params):
+            raise PreprocessorError(f"macro '{macro.name}' expects {len(params)} argument(s), got {len(args)}",
+                                    SourceLocation(str(source_file.path), token.line, 0))
+        return dict(zip(params, args)), close
+
+    def _substitute(self, macro: Macro, args: dict[str, list[Token]], hide: frozenset) -> list[Token]:
+        """ Body with parameters replaced (# stringifies, ## pastes), tagged with the invocation's hide set. """
+        body   = macro.body
+        result: list[Token] = []
+        expanded: dict[str, list[Token]] = {}
+
+        index = 0
+        while index < len(body):
+            token = body[index]
+
+            # '#param'
+            if token.text in ("#", "%:") and macro.params is not None and index + 1 < len(body) \
+                    and body[index + 1].text in args:
+                result.append(Token(self._stringify(args[body[index + 1].text]), "string", token.space, token.line))
+                index += 2
+                continue
+
+            # 'lhs ## rhs': an empty argument is a placemarker [cpp.concat], pasting to the other operand unchanged
+            if token.text in ("##", "%:%:") and result and index + 1 < len(body):
+                rhs = body[index + 1]
+                rhs_tokens = list(args[rhs.text]) if rhs.text in args else [rhs]
+                if not rhs_tokens:
+                    rhs_tokens = [Token("", _PLACEMARKER, rhs.space, rhs.line)]
+                lhs = result.pop()
+                if lhs.kind == _PLACEMARKER:
+                    pasted = [rhs_tokens[0].copy(space=lhs.space)]
+                elif rhs_tokens[0].kind == _PLACEMARKER:
+                    pasted = [lhs]
+                else:
+                    pasted = tokenize(lhs.text + rhs_tokens[0].text, lhs.line)
+                    if pasted:
+                        pasted[0].space = lhs.space
+                result.extend(pasted)
+                result.extend(rhs_tokens[1:])
+                index += 2
+                continue
+
+            if token.kind == "ident" and token.text in args:
+                # Operand of '##': unexpanded; otherwise fully expanded on its own first
+                next_is_paste = index + 1 < len(body) and body[index + 1].text in ("##", "%:%:")
+                if next_is_paste:
+                    arg_tokens = args[token.text] or [Token("", _PLACEMARKER)]
+                else:
+                    if token.text not in expanded:
+                        expanded[token.text] = self._expand(args[token.text], _NO_FILE)
+                    arg_tokens = expanded[token.text]
+                if arg_tokens:
+                    result.append(arg_tokens[0].copy(space=token.space))
+                    result.extend(arg_tokens[1:])
+                index += 1
+                continue
+
+            result.append(token)
+            index += 1
+
+        return [token.copy(hide=token.hide | hide) for token in result if token.kind != _PLACEMARKER]
+
+    @staticmethod
+    def _stringify(tokens: list[Token]) -> str:
+        # Escape '"' and '\' inside string & character literals only
+        parts = []
+        for i, token in enumerate(tokens):
+            spelled = token.text
+            if token.kind in ("string", "char"):
+                spelled = spelled.replace("\\", "\\\\").replace('"', '\\"')
+            parts.append((" " if token.space and i else "") + spelled)
+        return '"' + "".join(parts) + '"'
+
+    ####################################################################################################################
+    #  #if EXPRESSIONS  #
+    #####################
+
+    def _condition(self, directive: str, tokens: list[Token], source_file: SourceFile, loc: SourceLocation) -> bool:
+        if directive in ("ifdef", "ifndef"):
+            if not tokens or tokens[0].kind != "ident":
+                raise PreprocessorError(f"macro name missing in #{directive}", loc)
+            return (tokens[0].text in self.macros) == (directive == "ifdef")
+
+        # 'defined X' / 'defined(X)' before expansion
+        resolved: list[Token] = []
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            if token.text == "defined":
+                if index + 1 < len(tokens) and tokens[index + 1].text == "(":
+                    if index + 3 >= len(tokens) or tokens[index + 3].text != ")":
+                        raise PreprocessorError("missing ')' after 'defined'", loc)
+                    name, index = tokens[index + 2].text, index + 4
+                elif index + 1 < len(tokens):
+                    name, index = tokens[index + 1].text, index + 2
+                else:
+                    raise PreprocessorError("macro name missing after 'defined'", loc)
+                resolved.append(Token("1" if name in self.macros else "0", "number"))
+                continue
+            resolved.append(token)
+            index += 1
+
+        expression = _Expression(self._expand(resolved, source_file), loc)
+        return expression.evaluate() != 0
+
+    ####################################################################################################################
+    #  OUTPUT  #
+    ############
+
+    def _emit(self, tokens: list[Token], out: list[str]):
+        """ Spells tokens back out, one space wherever the source had whitespace or re-lexing would merge two. """
+        parts: list[str] = []
+        previous: Token | None = None
+        for token in tokens:
+            if token.kind == "newline":
+                parts.append("\n")
+                previous = None
+                continue
+            if previous is not None:
+                if token.space:
+                    parts.append(" ")
+                elif previous.kind in _WORD_KINDS and token.kind in _WORD_KINDS:
+                    parts.append(" ")
+                elif previous.kind == "punct" and token.kind == "punct" \
+                        and _PUNCT_ONLY.match(previous.text + token.text).end() > len(previous.text):
+                    parts.append(" ")
+            parts.append(token.text)
+            previous = token
+
+        text = "".join(parts)
+        out.append(text)
+        self._size += len(text)
+
+    @staticmethod
+    def _spell(tokens: list[Token]) -> str:
+        return "".join((" " if token.space and i else "") + token.text for i, token in enumerate(tokens))
+
+_NO_FILE     = SourceFile(Path("<macro argument>"), [], False, "")
+_PLACEMARKER = "placemarker" # Kind of the stand-in for an empty '##' operand, dropped once the body is substituted
+
+########################################################################################################################
+# #if EXPRESSION EVALUATION
+
+_BINARY_PRECEDENCE = {
+    "||": 1, "&&": 2, "|": 3, "^": 4, "&": 5,
+    "==": 6, "!=": 6, "<": 7, ">": 7, "<=": 7, ">=": 7,
+    "<<": 8, ">>": 8, "+": 9, "-": 9, "*": 10, "/": 10, "%": 10,
+}
+_CHAR_ESCAPES = {"n": 10, "t": 9, "r": 13, "0": 0, "a": 7, "b": 8, "f": 12, "v": 11,
+                 "\\": 92, "'": 39, '"': 34, "?": 63}
+
+class _Expression:
+    """ Precedence-climbing evaluator for macro-expanded #if / #elif lines (identifiers left over are 0). """
+
+    def __init__(self, tokens: list[Token], loc: SourceLocation):
+        self.tokens = [token for token in tokens if token.kind != "newline"]
+        self.index  = 0
+        self.loc    = loc
+        self.skip   = 0 # > 0: in an operand that '&&', '||' or '?:' discards; parsed, but its errors are not raised
+
+    def evaluate(self) -> int:
+        if not self.tokens:
+            raise PreprocessorError("#if with no expression", self.loc)
+        value = self._conditional()
+        if self.index != len(self.tokens):
+            raise PreprocessorError(f"unexpected '{self.tokens[self.index].text}' in #if expression", self.loc)
+        return value
+
+    def _peek(self) -> str | None:
+        return self.tokens[self.index].text if self.index < len(self.tokens) else None
+
+    def _conditional(self) -> int:
+        condition = self._binary(1)
+        if self._peek() != "?":
+            return condition
+        self.index += 1
+        if_true = self._operand(self._conditional, skip=not condition)
+        if self._peek() != ":":
+            raise PreprocessorError("expected ':' in #if expression", self.loc)
+        self.index += 1
+        if_false = self._operand(self._conditional, skip=bool(condition))
+        return if_true if condition else if_false
+
+    def _binary(self, min_precedence: int) -> int:
+        lhs = self._unary()
+        while True:
+            op = self._peek()
+            precedence = _BINARY_PRECEDENCE.get(op)
+            if precedence is None or precedence < min_precedence:
+                return lhs
+            self.index += 1
+            decided = (op == "&&" and not lhs) or (op == "||" and lhs)
+            rhs = self._operand(lambda: self._binary(precedence + 1), skip=decided)
+            lhs = self._apply(op, lhs, rhs)
+
+    def _operand(self, parse, skip: bool) -> int:
+        self.skip += skip
+        try:
+            return parse()
+        finally:
+            self.skip -= skip
+
+    def _apply(self, op: str, lhs: int, rhs: int) -> int:
+        if op in ("/", "%") and rhs == 0:
+            if self.skip:
+                return 0
+            raise PreprocessorError("division by zero in #if expression", self.loc)
+        if op in ("<<", ">>") and rhs < 0:
+            if self.skip:
+                return 0
+            raise PreprocessorError("negative shift count in #if expression", self.loc)
+        if op == "/":
+            return abs(lhs) // abs(rhs) * (1 if (lhs < 0) == (rhs < 0) else -1) # C truncates toward zero
+        if op == "%":
+            return lhs - rhs * self._apply("/", lhs, rhs)
+        return {
+            "||": lambda: int(bool(lhs) or bool(rhs)), "&&": lambda: int(bool(lhs) and bool(rhs)),
+            "|" : lambda: lhs | rhs,  "^" : lambda: lhs ^ rhs,  "&" : lambda: lhs & rhs,
+            "==": lambda: int(lhs == rhs), "!=": lambda: int(lhs != rhs),
+            "<" : lambda: int(lhs <  rhs), ">" : lambda: int(lhs >  rhs),
+            "<=": lambda: int(lhs <= rhs), ">=": lambda: int(lhs >= rhs),
+            "<<": lambda: lhs << rhs, ">>": lambda: lhs >> rhs,
+            "+" : lambda: lhs + rhs,  "-" : lambda: lhs - rhs,  "*" : lambda: lhs * rhs,
+        }[op]()
+
+    def _unary(self) -> int:
+        if self.index >= len(self.tokens):
+            raise PreprocessorError("unexpected end of #if expression", self.loc)
+        token = self.tokens[self.index]
+        self.index += 1
+
+        if token.text == "(":
+            value = self._conditional()
+            if self._peek() != ")":
+                raise PreprocessorError("expected ')' in #if expression", self.loc)
+            self.index += 1
+            return value
+        if token.text == "!":
+            return int(not self._unary())
+        if token.text == "~":
+            return ~self._unary()
+        if token.text == "-":
+            return -self._unary()
+        if token.text == "+":
+            return self._unary()
+        if token.kind == "number":
+            return self._integer(token.text)
+        if token.kind == "char":
+            return self._character(token.text)
+        if token.kind == "ident":
+            return 1 if token.text == "true" else 0
+        raise PreprocessorError(f"unexpected '{token.text}' in #if expression", self.loc)
+
+    def _integer(self, text: str) -> int:
+        digits = text.replace("'", "").rstrip("uUlLzZ")
+        try:
+            if digits[:2] in ("0x", "0X"):
+                return int(digits[2:], 16)
+            if digits[:2] in ("0b", "0B"):
+                return int(digits[2:], 2)
+            if len(digits) > 1 and digits[0] == "0":
+                return int(digits[1:], 8)
+            return int(digits)
+        except ValueError:
+            raise PreprocessorError(f"invalid integer '{text}' in #if expression", self.loc) from None
+
+    def _character(self, text: str) -> int:
+        body = text[text.index("'") + 1:-1]
+        if body.startswith("\\"):
+            escape = body[1:]
+            if escape[:1] == "x":
+                return int(escape[1:], 16)
+            if escape[:1].isdigit() and escape != "0":
+                return int(escape, 8)
+            return _CHAR_ESCAPES.get(escape, ord(escape[:1] or "\0"))
+        return ord(body) if body else 0
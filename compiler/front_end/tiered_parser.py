@@ -0,0 +1,133 @@
+# tiered_parser.py
+
+from __future__ import annotations
+
+import re
+
+from lark import Lark, Tree, Token
+from lark.exceptions import UnexpectedInput
+
+from compiler.front_end.declaration_splitter import split_declarations, DeclarationChunk
+from compiler.front_end.disambiguator import ForestDisambiguator
+
+# Statement starts with a (qualified) name followed by '<': possibly a template-id type, which the LALR subset lacks.
+_TEMPLATE_LEAD = re.compile(r"\s*(?:[A-Za-z_]\w*\s*::\s*)*[A-Za-z_]\w*\s*<(?![<=])")
+
+########################################################################################################################
+class TieredParser:
+    """ Two-tier front end, applied per top-level declaration:
+            1. LALR(1) over the deterministic subset (grammar.lark + lalr_overrides.lark) -> linear time.
+            2. Earley for declarations the subset rejects or that are genuinely ambiguous. With ambiguity="forest" its
+               SPPF is disambiguated before expansion (ForestDisambiguator); ambiguity="explicit" trees pass through.
+        Both tiers emit trees with the same rule names, so CSTtoAST consumes either, and both read decl_specifier_seq
+        by ISO [dcl.spec]/3 (the LALR grammar encodes it, ForestDisambiguator cuts the rest): a declaration parses to
+        the same tree on either tier.
+    """
+
+    def __init__(self, lalr_parser: Lark, earley_parser: Lark):
+        self.lalr   = lalr_parser   # start=["declaration", "probe_declaration"]
+        self.earley = earley_parser # start="start", ambiguity="forest"
+        self.forest = ForestDisambiguator(earley_parser) if earley_parser.options.ambiguity == "forest" else None
+
+        # Number of top-level declarations handled by each tier
+        self.tier_counts = {"lalr": 0, "earley": 0}
+
+    ####################################################################################################################
+    def parse(self, code: str) -> Tree:
+        """ Parses a preprocessed translation unit into a single 'translation_unit' CST. """
+        declarations = []
+        for trees in self.parse_chunks(split_declarations(code)):
+            declarations.extend(trees)
+
+        return self.stitch(declarations)
+
+    def parse_chunks(self, chunks: list[DeclarationChunk]) -> list[list[Tree]]:
+        """ CST(s) of each chunk, in order. """
+        return [self.parse_declaration(chunk) for chunk in chunks]
+
+    def parse_declaration(self, chunk: DeclarationChunk) -> list[Tree]:
+        """ Returns the CST(s) of one top-level declaration. """
+        trees, tier = self.parse_text(chunk.text)
+        self.tier_counts[tier] += 1
+        return trees
+
+    def parse_text(self, text: str) -> tuple[list[Tree], str]:
+        """ Parses one top-level declaration, trying the LALR tier first. Returns (trees, tier used). """
+
+        # Tier 1: LALR
+        tree = self._parse_lalr(text)
+        if tree is not None:
+            return [tree], "lalr"
+
+        # Tier 2: Earley
+        return self._parse_earley(text), "earley"
+
+    @staticmethod
+    def stitch(declarations: list[Tree]) -> Tree:
+        """ Rebuilds the tree Earley would produce for the whole unit: translation_unit -> declaration_seq -> ... """
+        if not declarations:
+            return Tree("translation_unit", [])
+        return Tree("translation_unit", [Tree("declaration_seq", declarations)])
+
+    ####################################################################################################################
+    # TIERS
+
+    def _parse_lalr(self, text: str) -> Tree | None:
+        try:
+            tree = self.lalr.parse(text, start="declaration")
+        except UnexpectedInput:
+            return None
+
+        # Reject: expression statements that are also declarations (T(x); T * x;)
+        for statement in tree.find_data("expression_statement"):
+            if self._is_ambiguous(statement, text):
+                return None
+
+        return tree
+
+    def _parse_earley(self, text: str) -> list[Tree]:
+        tree = self.earley.parse(text)
+        if self.forest is not None:
+            tree = self.forest.transform(tree)
+
+        # Unwrap: translation_unit -> declaration_seq -> declaration+
+        if tree.data == "translation_unit" and tree.children:
+            declaration_seq = tree.children[0]
+            if isinstance(declaration_seq, Tree) and declaration_seq.data == "declaration_seq":
+                return list(declaration_seq.children)
+        return [tree]
+
+    ####################################################################################################################
+    # AMBIGUITY PROBE
+
+    def _is_ambiguous(self, statement: Tree, text: str) -> bool:
+        """ An identifier-led expression statement is ambiguous if it also parses as a declaration. """
+
+        # Leftmost Token
+        first = statement
+        while isinstance(first, Tree) and first.children:
+            first = first.children[0]
+        if not isinstance(first, Token) or first.type != "IDENTIFIER":
+            return False
+
+        # Rightmost Token: the statement runs on to its ';' (filtered out of the tree). Token positions, rather than
+        # propagate_positions: a Meta on every CST node would more than double the tree's size
+        stack = [statement]
+        last  = first
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Token):
+                last = node
+                break
+            stack.extend(node.children)
+        statement_text = text[first.start_pos:text.index(";", last.end_pos) + 1]
+
+        # Template-id types are outside the probe grammar: assume the worst
+        if _TEMPLATE_LEAD.match(statement_text):
+            return True
+
+        try:
+            self.lalr.parse(statement_text, start="probe_declaration")
+        except UnexpectedInput:
+            return False
+        return True
@@ -1,10 +1,12 @@
 # transformer.py
+
 import lark
-from lark import Transformer
+from lark import Transformer_NonRecursive, Tree, Token, Discard
 
 from compiler.context import CompilerContext
 from compiler.front_end import abstract_nodes
 from compiler.front_end.abstract_nodes import ASTNode
+from compiler.front_end.lexer import KEYWORDS, OPERATORS, CONTEXTUAL_KEYWORDS
 
 from compiler.utils.enum_types import *
 
@@ -14,18 +16,55 @@ from compiler.utils.resolve_simple_type import resolve_simple_type
 from compiler.utils.colors import colors
 from compiler.utils.valid_sets import IdentifierIntention
 
-
 ########################################################################################################################
-class CSTtoAST(Transformer):
+class CSTtoAST(Transformer_NonRecursive): # Non-recursive: expression chains nest one level per term
     """
     A Transformer that converts a CST to an AST.
     """
-    # PASS 1
-    def disambiguate(self, cst_root):
-        from compiler.front_end.disambiguator import Disambiguator
-        disambiguator = Disambiguator()
-        new_root = disambiguator.transform(cst_root)
-        return new_root
+    # PASS 1 (disambiguation): dead branches are cut on the Earley forest, before any tree exists (ForestDisambiguator)
+
+    def transform(self, tree, consume: bool = False):
+        """ CST -> AST on an explicit stack: depth is bounded by memory, not by the interpreter's recursion limit.
+            consume: the caller hands the CST over. Each node's children are detached as it is expanded, so every
+            subtree is freed once transformed and the CST shrinks while the AST grows. Ambiguities are left intact:
+            only there do parents share subtrees (Earley expansions build a derivation used by several alternatives
+            once), and a tree with no _ambig is a plain tree (every LALR tree).
+        """
+        if not isinstance(tree, Tree):
+            return self._call_userfunc_token(tree) if isinstance(tree, Token) else tree
+
+        results: list = [] # Transformed children, awaiting their parent
+        stack  : list = [tree]
+        kept   : set  = set() # Ids of the nodes under an _ambig, as they are reached (consume)
+        push, pop, extend = stack.append, stack.pop, stack.extend
+        call, call_token  = self._call_userfunc, self._call_userfunc_token
+        while stack:
+            node = pop()
+
+            # Post-order: (node, size of 'results' at its expansion) is pushed below its children
+            if type(node) is tuple:
+                node, mark = node
+                children   = results[mark:]
+                del results[mark:]
+                result = call(node, children)
+            elif isinstance(node, Tree):
+                push((node, len(results)))
+                extend(reversed(node.children))
+                if consume:
+                    if node.data == "_ambig" or (kept and id(node) in kept):
+                        kept.update(id(child) for child in node.children if isinstance(child, Tree))
+                    else:
+                        node.children = []
+                continue
+            elif isinstance(node, Token):
+                result = call_token(node)
+            else:
+                result = node
+
+            if result is not Discard:
+                results.append(result)
+
+        return results[0] if results else Discard
 
     # PASS 3
     # def secondary_transform(self, ast_root: ASTNode, context: CompilerContext) -> ASTNode:
@@ -42,12 +81,11 @@ class CSTtoAST(Transformer):
 
     ####################################################################################################################
     def __default_token__(self, token):
-        from compiler.front_end.disambiguator import keywords, operators
         if token.type == "IDENTIFIER":
             return abstract_nodes.Identifier(token.value)
-        elif token.value in keywords:
+        elif token.value in KEYWORDS:
             return abstract_nodes.Keyword(token.value)
-        elif token.value in operators:
+        elif token.value in OPERATORS:
             return abstract_nodes.Operator(token.value)
         else:
             return ASTNode(token.type, [ASTNode(token.value)])
@@ -78,6 +116,9 @@ class CSTtoAST(Transformer):
 
     ####################################################################################################################
     def translation_unit(self, children):
+        # Splice: one child per top-level declaration
+        if len(children) == 1 and isinstance(children[0], ASTNode) and children[0].name == "declaration_seq":
+            children = children[0].children
         return ASTNode("translation_unit", children, colors.blue.underline)
 
     ####################################################################################################################
@@ -121,7 +162,8 @@ class CSTtoAST(Transformer):
 
     def declaration(self, children):
         if children[0] and isinstance(children[0], ASTNode):
-            return ASTNode(children[0].name, children[0].children, colors.cyan)
+            children[0].ansi_color = colors.cyan # Recolored in place: subclass & slots kept
+            return children[0]
         else:
             return abstract_nodes.Error("declaration")
 
@@ -129,7 +171,7 @@ class CSTtoAST(Transformer):
     # DECLARATOR
 
     def declaration_seq(self, children):
-        return children[0]
+        return ASTNode("declaration_seq", children)
 
     def decl_specifier_seq(self, children):
         return ASTNode("decl_specifier_seq", children, colors.teal)
@@ -247,6 +289,17 @@ class CSTtoAST(Transformer):
 
         return abstract_nodes.Error("parameter_declaration_clause")
 
+    # Contextual keywords: the grammar accepts any IDENTIFIER here, the spelling decides
+    def virt_specifier(self, children):
+        if isinstance(children[0], abstract_nodes.Identifier) and children[0].id_name in CONTEXTUAL_KEYWORDS:
+            return abstract_nodes.Keyword(children[0].id_name)
+        return abstract_nodes.Error("virt_specifier", children)
+
+    def class_virt_specifier(self, children):
+        if isinstance(children[0], abstract_nodes.Identifier) and children[0].id_name == "final":
+            return abstract_nodes.Keyword("final")
+        return abstract_nodes.Error("class_virt_specifier", children)
+
     #####################################################################################################################
     # BODIES
     def function_body(self, children):
@@ -272,7 +325,8 @@ class CSTtoAST(Transformer):
 
     def statement(self, children):
         # Fully Collapse
-        return ASTNode(children[0].name, children[0].children, colors.pink)
+        children[0].ansi_color = colors.pink
+        return children[0]
 
     #####################################################################################################################
     #
@@ -398,9 +452,12 @@ class CSTtoAST(Transformer):
     # shift_expression: additive_expression
     #                 | shift_expression SHL additive_expression
     #                 | shift_expression SHR additive_expression
+    #                 | shift_expression GT_ADJACENT GT additive_expression
     def shift_expression(self, children):
         if len(children) == 3:
             return abstract_nodes.BinaryExpr(children[0], children[1], children[2])
+        elif len(children) == 4: # '>>' lexed as two '>'
+            return abstract_nodes.BinaryExpr(children[0], abstract_nodes.Operator(">>"), children[3])
         elif len(children) == 1:
             return children[0]
         else:
@@ -0,0 +1,72 @@
+# optimizer.py
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from llvmlite import ir, binding as llvm
+
+from compiler.front_end.llvm_generator import TARGET_MACHINE # Also performs the one-time llvm.initialize*()
+from compiler.utils.instrumentation import phase
+
+OPT_LEVELS = (0, 1, 2, 3)
+
+########################################################################################################################
+@dataclass
+class OptimizationStats:
+    level              : int
+    instructions_before: int   = 0
+    instructions_after : int   = 0
+    elapsed            : float = 0.0 # Seconds spent in the pipeline
+
+    def __str__(self):
+        return (f"-O{self.level}: {self.instructions_before} -> {self.instructions_after} instruction(s) "
+                f"in {self.elapsed * 1000:.2f} ms")
+
+def count_instructions(module_ref: llvm.ModuleRef) -> int:
+    return sum(1 for function in module_ref.functions
+                 for block    in function.blocks
+                 for _        in block.instructions)
+
+########################################################################################################################
+class Optimizer:
+    """ Middle end: runs LLVM's default -O<level> module pipeline (new pass manager) over a generated module.
+        The pass builder is set up once; each module gets its own pass manager (a reused one keeps analysis state
+        from the previous module and crashes inside LLVM).
+    """
+
+    def __init__(self, level: int = 2, size_level: int = 0, target_machine: llvm.TargetMachine | None = None):
+        if level not in OPT_LEVELS:
+            raise ValueError(f"unknown optimization level -O{level}, expected one of {OPT_LEVELS}")
+
+        self.level      = level
+        self.size_level = size_level # 0: none, 1: -Os, 2: -Oz
+
+        # Pipeline
+        tuning            = llvm.create_pipeline_tuning_options(speed_level=level, size_level=size_level)
+        self.pass_builder = llvm.create_pass_builder(target_machine or TARGET_MACHINE, tuning)
+
+        self.stats: OptimizationStats | None = None # Of the latest optimize() call
+
+    ####################################################################################################################
+    def optimize(self, module: ir.Module | llvm.ModuleRef) -> llvm.ModuleRef:
+        """ Optimizes a module in place (a parsed copy, for ir.Module) and returns it. """
+        with phase("verify"):
+            if isinstance(module, llvm.ModuleRef):
+                module_ref = module
+            else:
+                module_ref = llvm.parse_assembly(str(module))
+            module_ref.verify()
+
+        with phase("optimize", level=self.level) as record:
+            stats = OptimizationStats(self.level, instructions_before=count_instructions(module_ref))
+            start = time.perf_counter()
+            self.pass_builder.getModulePassManager().run(module_ref, self.pass_builder)
+            stats.elapsed            = time.perf_counter() - start
+            stats.instructions_after = count_instructions(module_ref)
+            record.counters.update(instructions_before=stats.instructions_before,
+                                   instructions_after=stats.instructions_after)
+
+        self.stats = stats
+        return module_ref
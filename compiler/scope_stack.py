@@ -1,7 +1,9 @@
 # scopy_stack.py
 
 from __future__ import annotations
-from compiler.utils.enum_types import ScopeKind
+from typing import Iterable
+from compiler.utils.enum_types import ScopeKind, SymbolKind
+from compiler.utils import log
 
 #############################################################################################################3##########
 # SCOPE
@@ -12,6 +14,7 @@ class Scope:
         self.id      = scope_id
         self.parent  = parent  or None # Scope which contains this scope (Outer Scope)
         self.symbols = {}              # Dict of {symbol_name: symbol_id}
+        self.declared: list[tuple[str, SymbolKind | None]] = [] # (name, kind) bound here, in order (unwound on exit)
 
 #############################################################################################################3##########
 # SCOPE STACK
@@ -22,6 +25,13 @@ class ScopeStack:
         self.next_id = 0  # Unique identifier for symbols
         self.curr_scope: Scope | None = None
 
+        # Shadow Stacks, innermost binding last: pushed by declare(), popped by exit_scope(), so the visible binding
+        # is always bindings[-1] -> O(1) lookup. One per name, and one per (name, kind) for kind-filtered lookups;
+        # the latter hold (declaration number, symbol_id): across several kinds, the latest declared is innermost
+        self.visible      : dict[str, list[int]]                                = {}
+        self.visible_kinds: dict[tuple[str, SymbolKind], list[tuple[int, int]]] = {}
+        self.declarations = 0 # Declarations so far: orders bindings of different kinds
+
     def enter_scope(self, kind:ScopeKind):
 
         # Create New Scope
@@ -29,14 +39,59 @@ class ScopeStack:
         self.scopes.append(new_scope)  # Push to Scope Stack
         self.curr_scope = new_scope    # Update Current Scope
         self.next_id += 1              # Increment ID
-        print("Entered Scope:", new_scope.kind.name)
+        log.trace("Entered Scope: %s", new_scope.kind.name)
 
     def exit_scope(self):
-        print("Exited Scope:", self.curr_scope.kind.name)
+        log.trace("Exited Scope: %s", self.curr_scope.kind.name)
+
+        # Unwind: names declared here stop shadowing outer ones
+        for name, kind in reversed(self.curr_scope.declared):
+            _pop(self.visible, name)
+            if kind is not None:
+                _pop(self.visible_kinds, (name, kind))
+
         if len(self.scopes) > 1:
             self.curr_scope = self.curr_scope.parent
         self.scopes.pop()
 
+    ####################################################################################################################
+    # NAME BINDING
+
+    def declare(self, name: str, symbol_id: int, kind: SymbolKind | None = None):
+        """ Binds name in the current scope, shadowing any outer binding until the scope exits. """
+        self.curr_scope.symbols[name] = symbol_id
+        self.curr_scope.declared.append((name, kind))
+        self.visible.setdefault(name, []).append(symbol_id)
+        if kind is not None:
+            self.visible_kinds.setdefault((name, kind), []).append((self.declarations, symbol_id))
+        self.declarations += 1
+
+    def lookup(self, name: str, kinds: SymbolKind | Iterable[SymbolKind] | None = None) -> int | None:
+        """ Returns the symbol_id of the innermost visible binding of name (restricted to kinds), or None.
+            O(1) per kind asked for: e.g. a struct tag hidden by a variable of the same name is found directly.
+        """
+        if kinds is None:
+            bindings = self.visible.get(name)
+            return bindings[-1] if bindings else None
+
+        # Kind Filter: the innermost of each kind's innermost binding
+        if isinstance(kinds, SymbolKind):
+            bindings = self.visible_kinds.get((name, kinds))
+            return bindings[-1][1] if bindings else None
+        innermost = None
+        for kind in kinds:
+            bindings = self.visible_kinds.get((name, kind))
+            if bindings and (innermost is None or bindings[-1] > innermost):
+                innermost = bindings[-1]
+        return None if innermost is None else innermost[1]
 
     # def resolve_scope(self):
+
+def _pop(stacks: dict, key):
+    """ Pops key's innermost binding, dropping its shadow stack once empty. """
+    bindings = stacks[key]
+    bindings.pop()
+    if not bindings:
+        del stacks[key]
+
 #############################################################################################################3##########
@@ -1,9 +1,10 @@
 # symbol_table.py
 
+from typing import Iterable
 from compiler.front_end.abstract_nodes.base_node import DeclSpec
 from compiler.front_end.abstract_nodes.ast_node import ASTNode
 from compiler.utils.enum_types import *
-from compiler.scope_stack import *
+from compiler.scope_stack import Scope, ScopeStack
 
 #############################################################################################################3##########
 
@@ -50,4 +51,16 @@ class SymbolTable:
         # Return Unique ID
         return symbol.id
 
+    def declare_symbol(self, symbol: Symbol, scopes: ScopeStack):
+        """ Inserts symbol and binds its name in the current scope of 'scopes'. """
+        symbol_id = self.insert_symbol(symbol)
+        scopes.declare(symbol.name, symbol_id, symbol.kind)
+        return symbol_id
+
+    def lookup(self, name: str, scopes: ScopeStack,
+               kinds: SymbolKind | Iterable[SymbolKind] | None = None) -> Symbol | None:
+        """ Innermost Symbol named 'name' visible from the current scope of 'scopes' (restricted to kinds). """
+        symbol_id = scopes.lookup(name, kinds)
+        return None if symbol_id is None else self.symbols[symbol_id]
+
 #############################################################################################################3##########
\ No newline at end of file
@@ -0,0 +1,149 @@
+# instrumentation.py
+# Per-phase wall / CPU time, memory & counters. Library code marks its phases with phase(); nothing is measured unless
+# an Instrumentation is active (see collecting()).
+
+from __future__ import annotations
+
+import json
+import os
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Iterator
+
+########################################################################################################################
+@dataclass
+class PhaseRecord:
+    name        : str
+    depth       : int                # 0: top-level phase
+    start       : float              # time.perf_counter() at entry (CLOCK_MONOTONIC: comparable across processes)
+    wall        : float = 0.0        # Seconds
+    cpu         : float = 0.0        # Process CPU seconds
+    peak_rss_kib: int   = 0          # Process peak resident set size at exit
+    alloc_delta : int | None = None  # tracemalloc: bytes still allocated at exit minus at entry
+    alloc_peak  : int | None = None  # tracemalloc: peak bytes above the entry level
+    counters    : dict = field(default_factory=dict) # Node / instruction / declaration counts, ...
+    pid         : int  = 0
+
+class _NullRecord:
+    """ Stands in for a PhaseRecord while nothing is collecting: counters written to it are dropped. """
+    __slots__ = ()
+
+    @property
+    def counters(self) -> dict:
+        return {}
+
+_NULL_PHASE = nullcontext(_NullRecord())
+
+########################################################################################################################
+class Instrumentation:
+    """ Collects the PhaseRecords of one compile (or one worker set-up). memory: also trace Python allocations with
+        tracemalloc, which slows everything down several-fold.
+    """
+
+    def __init__(self, memory: bool = False, label: str = ""):
+        self.memory  = memory
+        self.label   = label # e.g. the source file
+        self.records: list[PhaseRecord] = []
+
+        self._open : list[PhaseRecord] = []
+        self._peaks: list[int]         = [] # Running tracemalloc peak of each open phase
+
+    @contextmanager
+    def phase(self, name: str, **counters) -> Iterator[PhaseRecord]:
+        record = PhaseRecord(name, len(self._open), time.perf_counter(), counters=counters, pid=os.getpid())
+        self.records.append(record)
+
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak) # Reset below: fold the parent's peak so far
+            tracemalloc.reset_peak()
+            self._peaks.append(current)
+            alloc_start = current
+
+        self._open.append(record)
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record.cpu  = time.process_time() - cpu_start
+            record.wall = time.perf_counter() - record.start
+            record.peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss # KiB on Linux
+            self._open.pop()
+
+            if self.memory:
+                current, peak = tracemalloc.get_traced_memory()
+                peak = max(self._peaks.pop(), peak)
+                record.alloc_delta = current - alloc_start
+                record.alloc_peak  = peak - alloc_start
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                tracemalloc.reset_peak()
+
+    def top_level(self) -> dict[str, float]:
+        """ Wall time of each top-level phase (summed when a name repeats). """
+        phases: dict[str, float] = {}
+        for record in self.records:
+            if record.depth == 0:
+                phases[record.name] = phases.get(record.name, 0.0) + record.wall
+        return phases
+
+    ####################################################################################################################
+    def to_dict(self) -> dict:
+        return {"label": self.label, "phases": [asdict(record) for record in self.records]}
+
+    def chrome_events(self) -> list[dict]:
+        """ Trace Event Format 'complete' events (chrome://tracing, Perfetto). """
+        events = []
+        for record in self.records:
+            args = {"cpu_ms": round(record.cpu * 1000, 3), "peak_rss_kib": record.peak_rss_kib, **record.counters}
+            if record.alloc_delta is not None:
+                args.update(alloc_delta=record.alloc_delta, alloc_peak=record.alloc_peak)
+            if self.label:
+                args["unit"] = self.label
+            events.append({"name": record.name, "cat": "compiler", "ph": "X", "pid": record.pid, "tid": record.pid,
+                           "ts": round(record.start * 1e6, 3), "dur": round(record.wall * 1e6, 3), "args": args})
+        return events
+
+########################################################################################################################
+# ACTIVE INSTRUMENTATION
+
+_active: Instrumentation | None = None
+
+@contextmanager
+def collecting(instrumentation: Instrumentation) -> Iterator[Instrumentation]:
+    """ with collecting(Instrumentation()): ... -> phase() calls below record into it. """
+    global _active
+    previous, _active = _active, instrumentation
+    try:
+        yield instrumentation
+    finally:
+        _active = previous
+
+def phase(name: str, **counters):
+    """ with phase("lower") as record: ...; record.counters["functions"] = n """
+    if _active is None:
+        return _NULL_PHASE
+    return _active.phase(name, **counters)
+
+def enabled() -> bool:
+    """ Whether counters that cost something to compute (node counts, ...) are worth computing. """
+    return _active is not None
+
+########################################################################################################################
+# OUTPUT
+
+def write_json(path: Path, runs: list[Instrumentation]):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"runs": [run.to_dict() for run in runs]}, f, indent=1)
+
+def write_chrome_trace(path: Path, runs: list[Instrumentation]):
+    events = [event for run in runs for event in run.chrome_events()]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
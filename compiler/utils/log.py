@@ -0,0 +1,157 @@
+# log.py
+# Verbosity layer over the 'compiler' logger: nothing below the active level is formatted, boxed, colored or dumped.
+
+from __future__ import annotations
+
+import logging
+import sys
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Callable, Iterator, TextIO
+
+from compiler.utils.colors import AnsiColor
+
+LOGGER = logging.getLogger("compiler")
+
+class Verbosity(IntEnum):
+    QUIET   = 0 # Errors & results only
+    NORMAL  = 1 # + one-line stage statistics
+    VERBOSE = 2 # + stage banners & tree / IR dumps
+    TRACE   = 3 # + per-event traces (scope enter / exit, ...)
+
+_RESULT = logging.WARNING + 5 # Program output: never filtered
+
+# Verbosity -> logging level
+_LEVELS = {
+    Verbosity.QUIET  : logging.WARNING,
+    Verbosity.NORMAL : logging.INFO,
+    Verbosity.VERBOSE: logging.INFO - 1,
+    Verbosity.TRACE  : logging.DEBUG,
+}
+
+class _State:
+    verbosity: Verbosity      = Verbosity.NORMAL
+    color    : bool           = False
+    dumps    : frozenset[str] = frozenset() # Dumps requested regardless of verbosity ("ast", "ir", ...)
+    dump_to  : TextIO | None  = None        # Dump stream; None: stdout
+
+_state   = _State()
+_handler: logging.Handler | None = None
+
+########################################################################################################################
+def configure(verbosity: Verbosity = Verbosity.NORMAL, color: bool | None = None,
+              dumps: set[str] = frozenset(), dump_to: TextIO | None = None, stream: TextIO | None = None):
+    """ color None: only when stream is a terminal. """
+    global _handler
+    stream = stream or sys.stdout
+
+    _state.verbosity = Verbosity(verbosity)
+    _state.color     = stream.isatty() if color is None else color
+    _state.dumps     = frozenset(dumps)
+    _state.dump_to   = dump_to
+
+    if _handler is not None:
+        LOGGER.removeHandler(_handler)
+    _handler = logging.StreamHandler(stream)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    LOGGER.addHandler(_handler)
+    LOGGER.setLevel(_LEVELS[_state.verbosity])
+    LOGGER.propagate = False
+
+def settings() -> dict:
+    """ The active configuration, as configure() arguments (picklable: sent to worker processes). """
+    return dict(verbosity=_state.verbosity, color=_state.color, dumps=_state.dumps)
+
+def enabled(verbosity: Verbosity) -> bool:
+    return _state.verbosity >= verbosity
+
+def color_enabled() -> bool:
+    return _state.color
+
+def paint(color: AnsiColor, text: str) -> str:
+    return color(text) if _state.color else text
+
+########################################################################################################################
+# MESSAGES (%-style arguments: formatted only when emitted)
+
+def error(message: str, *args):
+    LOGGER.error(message, *args)
+
+def warning(message: str, *args):
+    LOGGER.warning(message, *args)
+
+def result(message: str, *args):
+    """ Shown even when quiet: the program's actual output (e.g. 'main returned: 0'). """
+    LOGGER.log(_RESULT, message, *args)
+
+def info(message: str, *args, color: AnsiColor | None = None):
+    if not LOGGER.isEnabledFor(logging.INFO):
+        return
+    text = message % args if args else message
+    LOGGER.info(paint(color, text) if color is not None else text)
+
+def trace(message: str, *args):
+    LOGGER.debug(message, *args)
+
+def banner(color: AnsiColor, text: str):
+    """ Boxed stage heading, verbose only. """
+    if enabled(Verbosity.VERBOSE):
+        LOGGER.log(_LEVELS[Verbosity.VERBOSE], color.boxed(text) if _state.color else text)
+
+########################################################################################################################
+# DUMPS
+
+def dump_enabled(kind: str) -> bool:
+    return kind in _state.dumps or enabled(Verbosity.VERBOSE)
+
+def dump(kind: str, write: Callable[[TextIO], object]):
+    """ write(stream) streams the dump out; it is not called at all unless the dump is wanted. """
+    if not dump_enabled(kind):
+        return
+    stream = _state.dump_to or sys.stdout
+    if _handler is not None:
+        _handler.flush()
+    write(stream)
+    stream.flush()
+
+########################################################################################################################
+# CAPTURE (worker processes: their output is replayed by the parent, one file at a time)
+
+class _Recorder:
+    """ Stand-in stream: keeps what is written, tagged with its channel ("log" or "dump"), in order. """
+
+    def __init__(self, records: list[tuple[str, str]], channel: str):
+        self.records = records
+        self.channel = channel
+
+    def write(self, text: str):
+        self.records.append((self.channel, text))
+
+    def flush(self):
+        pass
+
+@contextmanager
+def capturing() -> Iterator[list[tuple[str, str]]]:
+    """ Messages & dumps emitted inside go to the returned list instead of their streams (see replay()). """
+    records: list[tuple[str, str]] = []
+    previous = _handler.setStream(_Recorder(records, "log")) if _handler is not None else None
+    dump_to, _state.dump_to = _state.dump_to, _Recorder(records, "dump")
+    try:
+        yield records
+    finally:
+        _state.dump_to = dump_to
+        if _handler is not None:
+            _handler.setStream(previous)
+
+def replay(records: list[tuple[str, str]]):
+    """ Writes captured output to this process's log & dump streams. """
+    for channel, text in records:
+        if channel == "dump":
+            stream = _state.dump_to or sys.stdout
+        else:
+            stream = _handler.stream if _handler is not None else sys.stdout
+        stream.write(text)
+    if records:
+        (_state.dump_to or sys.stdout).flush()
+        if _handler is not None:
+            _handler.flush()
@@ -1,142 +1,173 @@
 # main.py
 
-from lark import Lark
+import argparse
+import sys
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from compiler.front_end.transformer import CSTtoAST
-from compiler.front_end.decorator import ASTtoDAST
-from compiler.front_end.llvm_generator import LLVMGenerator
-from compiler.context import CompilerContext
+from compiler.front_end.parallel_parser import ParserSpec
+from compiler.front_end.lexer import TokenLexer
 from compiler.utils.colors import colors
+from compiler.middle_end.optimizer import OPT_LEVELS
+from compiler.back_end.jit import JitSession
+from compiler.driver import Driver, DriverOptions, EMIT_KINDS, expand_inputs, summary_table, watch
+from compiler.utils import log
+from compiler.utils.log import Verbosity
+from compiler.utils.instrumentation import Instrumentation, write_json, write_chrome_trace
 from llvmlite import binding as llvm
-import ctypes
 
 ####################
 # GlOBAL CONSTANTS #
 ####################
 
-GRAMMAR_PATH      = Path(__file__).parent / "compiler" / "front_end" / "grammar.lark"
-SOURCE_CODE_PATH  = Path(__file__).parent / "tests" / "test_3.cpp"
-INCLUDE_FILE_PATH = Path(__file__).parent / "include"
-OUTPUT_PATH       = Path(__file__).parent / "output"
-
-
-import subprocess
-def preprocess_source(source: str) -> str:
-    try:
-        result = subprocess.run(
-            ["clang", "-E", "-P", "-I", str(INCLUDE_FILE_PATH), "-"],
-            input=source,
-            text=True,
-            capture_output=True,
-            check=True
-        )
-        return result.stdout
-    except subprocess.CalledProcessError as e:
-        print("=== clang STDOUT ===")
-        print(e.stdout)
-        print("=== clang STDERR ===")
-        print(e.stderr)
-        raise
-
-########################################################################################################################
-def main():
-
-    print("\nhullo world ^w^\n")
-
-    # INITIALIZE COMPILER CONTEXT
-    context = CompilerContext()
+GRAMMAR_PATH       = Path(__file__).parent / "compiler" / "front_end" / "grammar.lark"
+LALR_PATH          = Path(__file__).parent / "compiler" / "front_end" / "lalr_overrides.lark"
+LEXER_PATH         = Path(__file__).parent / "compiler" / "front_end" / "lexer.py"
+DISAMBIGUATOR_PATH = Path(__file__).parent / "compiler" / "front_end" / "disambiguator.py"
+SOURCE_CODE_PATH   = Path(__file__).parent / "tests" / "test_3.cpp"
+INCLUDE_FILE_PATH  = Path(__file__).parent / "include"
+OUTPUT_PATH        = Path(__file__).parent / "output"
+CACHE_PATH         = Path(__file__).parent / ".cache"
 
+# Dumps selectable with --dump (all of them at -v)
+DUMP_KINDS = ("source", "ast", "ir")
 
-    ########################################################################################################################
-
-    # Load Grammar File
-    with open(GRAMMAR_PATH, "r", encoding="utf-8", errors="replace") as f:
-        grammar = f.read()
-
-    ####################################################################################################################
-    print(colors.cyan.boxed("Path: "+ str(SOURCE_CODE_PATH) +"\n[Printing Source Code]"))
-    # Load Source Code File
-    with open(SOURCE_CODE_PATH, "r") as f:
-        code = f.read()
-    code = preprocess_source(code)
-    print(code)    #
-    ####################################################################################################################
-    # Parse -> CST
-    print(colors.green.boxed("[Parsing...]\n[Displaying CST]"))
-    print("\n...\n")
-    # parser = Lark(grammar, start='start', parser='lalr', lexer='contextual', debug=True, strict=True)
-    parser = Lark(grammar, start="start", parser="earley", ambiguity="explicit")
-    cst = parser.parse(code)
-    # print(cst.pretty())
-
-    ####################################################################################################################
-    # Transform -> AST
-
-    print(colors.red.boxed("[Transforming...]\n[Displaying AST]"))
-    transformer = CSTtoAST()
-    cst = transformer.disambiguate(cst)
-    ast = transformer.transform(cst)
-    print(ast.pretty())
-
-    ####################################################################################################################
-    # Decorate -> D-AST
+# Middle End: -O0 .. -O3 (compile time vs. run time)
+OPT_LEVEL = 2
 
-    print(colors.pink.boxed("[Decorating...]\n[Displaying Decorated-AST]"))
-    print("\n...\n")
-    # decorator = ASTtoDAST(ast, context)
-    # decorator.decorate()
-    # print(ast.pretty())
+# Everything the front end's output depends on: part of every compile / header cache key
+GRAMMAR_INPUTS = [GRAMMAR_PATH, LALR_PATH, LEXER_PATH, DISAMBIGUATOR_PATH]
 
+# Parsers (loaded from CACHE_PATH by the main process & every parse worker); both tiers run over TokenLexer's tokens
+EARLEY_SPEC = ParserSpec(GRAMMAR_PATH, CACHE_PATH,
+                         options=dict(start="start", parser="earley", ambiguity="forest", lexer=TokenLexer))
+LALR_SPEC   = ParserSpec(GRAMMAR_PATH, CACHE_PATH, override_path=LALR_PATH,
+                         options=dict(start=["declaration", "probe_declaration"], parser="lalr", lexer=TokenLexer))
 
-
-    ####################################################################################################################
-    # Generate -> LLVM IR
-    print(colors.blue.boxed("[Generating...]\n[Displaying LLVM IR]"))
-    ir_generator = LLVMGenerator(ast, context)
-    ir_generator.generate()
-    llvm_ir = ir_generator.module
-    print(llvm_ir)
-
-    ####################################################################################################################
-    # ASSEMBLE & LINK WITH CLANG
+########################################################################################################################
+def driver_options(args: argparse.Namespace) -> DriverOptions:
+    """ Batch & demo alike: outputs, include paths, caches & instrumentation from the command line. """
+    return DriverOptions(LALR_SPEC, EARLEY_SPEC,
+                         output_dir    = args.output_dir,
+                         include_paths = [*args.include_paths, INCLUDE_FILE_PATH],
+                         cache_dir     = None if args.no_cache else CACHE_PATH,
+                         grammar_paths = GRAMMAR_INPUTS,
+                         opt_level     = args.opt_level,
+                         emit          = args.emit,
+                         trace_memory  = args.trace_memory,
+                         log_settings  = log.settings())
+
+def main(args: argparse.Namespace) -> tuple[int, list[Instrumentation]]:
+    """ Demo: compiles SOURCE_CODE_PATH as a batch of one (same options, caches & --emit outputs), then runs it
+        with the JIT. Exit status 1 if it failed to compile.
+    """
+    [result] = Driver(driver_options(args), workers=args.jobs).compile([SOURCE_CODE_PATH])
+    runs     = [run for run in (result.setup, result.instrumentation) if run is not None]
+    if not result.ok:
+        log.error("%s: %s", result.source, result.error)
+        return 1, runs
+    log.info("outputs: %s", ", ".join(map(str, result.outputs)), color=colors.grey)
 
     ####################################################################################################################
     # LLVM JIT EXECUTION
 
-    # print( colors.yellow.boxed("[Interpreting]\n[Executing With MCJIT Engine\n"))
-
-    llvm.initialize()
-    llvm.initialize_native_target()
-    llvm.initialize_native_asmprinter()
+    log.banner(colors.yellow, "[Interpreting]\n[Executing With MCJIT Engine]")
 
-    llvm_ir = str(llvm_ir)   # your IR string
+    with JitSession() as jit:
+        res = jit.run_main(llvm.parse_assembly(result.unit.ir))
+    log.result("main returned: %s", res)
+    return 0, runs
 
-    # Parse IR
-    mod = llvm.parse_assembly(llvm_ir)
-    mod.verify()
-
-    # Create engine
-    target = llvm.Target.from_default_triple()
-    target_machine = target.create_target_machine()
-    backing_mod = llvm.parse_assembly("")
-    engine = llvm.create_mcjit_compiler(backing_mod, target_machine)
-
-    engine.add_module(mod)
-    engine.finalize_object()
-
-    # Run main
-    func_ptr = engine.get_function_address("main")
-    cfunc = ctypes.CFUNCTYPE(ctypes.c_int)(func_ptr)
-    res = cfunc()
-    print("main returned:", res)
-
-    # print("\n\n\n")
+########################################################################################################################
+def compile_batch(args: argparse.Namespace) -> tuple[int, list[Instrumentation]]:
+    """ CLI batch mode: compiles every input, prints a summary table. Exit status 1 if any file failed. """
+    options = driver_options(args)
+
+    if args.watch:
+        try:
+            watch(options, expand_inputs(args.inputs), lambda results: log.result(summary_table(results)))
+        except KeyboardInterrupt:
+            return 0, []
+
+    results = Driver(options, workers=args.jobs).compile(expand_inputs(args.inputs))
+    log.result(summary_table(results))
+
+    runs = [run for result in results for run in (result.setup, result.instrumentation) if run is not None]
+    return (0 if all(result.ok for result in results) else 1), runs
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="cpp-lite compiler")
+    parser.add_argument("inputs", nargs="*",
+                        help="source files, directories or glob patterns (none: compile & run the demo unit)")
+    parser.add_argument("-o", "--output-dir", type=Path, default=OUTPUT_PATH, help="where .ll / .o / executables go")
+    parser.add_argument("-O", dest="opt_level", type=int, choices=OPT_LEVELS, default=OPT_LEVEL)
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("-I", dest="include_paths", type=Path, action="append", default=[],
+                        help="extra include directory, searched before include/")
+    parser.add_argument("--emit", type=_emit_kinds, default=("ir", "obj"),
+                        help=f"comma-separated outputs: {', '.join(EMIT_KINDS)} (default: ir,obj)")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the compile & header caches")
+    parser.add_argument("--watch", action="store_true",
+                        help="recompile inputs as they change (incremental front end), until interrupted")
+
+    # Output
+    parser.add_argument("-q", "--quiet", action="store_true", help="errors & results only")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="-v: stage banners & source / AST / IR dumps, -vv: also traces")
+    parser.add_argument("--dump", type=_dump_kinds, default=frozenset(),
+                        help=f"comma-separated dumps at any verbosity: {', '.join(DUMP_KINDS)}")
+    parser.add_argument("--dump-file", type=Path, default=None, help="write dumps here instead of stdout")
+    parser.add_argument("--color", action=argparse.BooleanOptionalAction, default=None,
+                        help="ANSI colors (default: only on a terminal)")
+
+    # Instrumentation
+    parser.add_argument("--stats-json", type=Path, default=None,
+                        help="write per-phase wall / CPU time, memory & counters here (JSON)")
+    parser.add_argument("--trace", type=Path, default=None,
+                        help="write the phases as a Chrome trace (chrome://tracing, ui.perfetto.dev)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also record tracemalloc deltas / peaks per phase (slow)")
+
+    args = parser.parse_args(argv)
+    if args.watch and not args.inputs:
+        parser.error("--watch needs inputs") # The demo compiles & runs once
+    return args
+
+def _dump_kinds(text: str) -> frozenset[str]:
+    kinds = frozenset(kind.strip() for kind in text.split(",") if kind.strip())
+    unknown = sorted(kinds - set(DUMP_KINDS))
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown dump kind(s): {', '.join(unknown)}")
+    return kinds
+
+@contextmanager
+def configured_output(args: argparse.Namespace):
+    """ Log verbosity, colors & dumps for the whole run; the --dump-file is closed on the way out. """
+    verbosity = Verbosity.QUIET if args.quiet else Verbosity(min(Verbosity.NORMAL + args.verbose, Verbosity.TRACE))
+    with open(args.dump_file, "w", encoding="utf-8") if args.dump_file else nullcontext() as dump_to:
+        log.configure(verbosity, color=args.color, dumps=args.dump, dump_to=dump_to)
+        yield
+
+def write_instrumentation(args: argparse.Namespace, runs: list[Instrumentation]):
+    if args.stats_json:
+        write_json(args.stats_json, runs)
+    if args.trace:
+        write_chrome_trace(args.trace, runs)
+
+def _emit_kinds(text: str) -> tuple[str, ...]:
+    kinds = tuple(kind.strip() for kind in text.split(",") if kind.strip())
+    unknown = [kind for kind in kinds if kind not in EMIT_KINDS]
+    if unknown or not kinds:
+        raise argparse.ArgumentTypeError(f"unknown output kind(s): {', '.join(unknown) or text!r}")
+    return kinds
 
 ########################################################################################################################
 
 if __name__ == '__main__':
-    main()
-
-    from compiler.utils.colors import colors
-    print()
-    print( colors.yellow.boxed("[Interpreting]\n[Executing With MCJIT Engine\n"))
\ No newline at end of file
+    args = parse_args()
+    with configured_output(args):
+        if args.inputs:
+            status, runs = compile_batch(args)
+        else:
+            status, runs = main(args)
+        write_instrumentation(args, runs)
+    sys.exit(status)